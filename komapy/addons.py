@@ -1,7 +1,7 @@
 import copy
 
-from .constants import get_phase_dates
 from .exceptions import ChartError
+from .phases import get_phase_registry
 from .utils import compute_middletime, time_to_offset, to_pydatetime
 
 addon_registers = {
@@ -133,8 +133,7 @@ def plot_activity_phases(axis, **options):
     starttime = to_pydatetime(options.pop('starttime')).replace(tzinfo=None)
     endtime = to_pydatetime(options.pop('endtime')).replace(tzinfo=None)
 
-    PHASE_DATES = get_phase_dates()
-    phase_dates = filter_date_in_range(PHASE_DATES, starttime, endtime)
+    phase_dates = get_phase_registry().get_phases(starttime, endtime)
     middle_time = calculate_middle_date(phase_dates)
 
     offsets = [
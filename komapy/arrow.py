@@ -0,0 +1,181 @@
+"""
+KomaPy Arrow export.
+
+Resolved chart data can be exported as Apache Arrow record batches, one batch
+per series, and serialized to Arrow IPC stream format for web frontends.
+Numeric and timestamp columns reuse NumPy buffers of the resolved data without
+copying, and timestamps are kept as native ``datetime64`` values. Series
+index, name, type, and fields are attached as schema metadata.
+
+This module requires pyarrow package.
+
+Example:
+
+.. code-block:: python
+
+    from komapy import Chart
+    from komapy.arrow import to_ipc_stream
+
+    chart = Chart(config)
+    content = to_ipc_stream(chart.resolve())
+
+Each series is written as its own IPC stream, and the streams are
+concatenated, because series usually have different lengths and fields. Read
+them back using :func:`read_ipc_stream`, or ``RecordBatchReader.readAll()`` in
+Arrow JavaScript library.
+"""
+
+import json
+
+from .exceptions import ChartError
+
+METADATA_PREFIX = 'komapy.'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ChartError('pyarrow package is required to export Arrow data')
+    return pyarrow
+
+
+def to_arrow_array(data):
+    """
+    Convert resolved field data into Arrow array. Pandas series and NumPy
+    arrays of numbers or timestamps are converted without copying.
+
+    :param data: Resolved field data, e.g. :class:`pandas.Series`.
+    :rtype: :class:`pyarrow.Array`
+    """
+    import numpy as np
+    import pandas as pd
+
+    pa = _import_pyarrow()
+
+    if isinstance(data, (pd.Series, pd.Index)):
+        return pa.Array.from_pandas(data)
+    if isinstance(data, np.ndarray):
+        return pa.array(data)
+    return pa.array(np.asarray(data))
+
+
+def get_field_names(series, plot_data):
+    """
+    Get column names of resolved plot data. Named data, e.g.
+    :class:`pandas.Series`, keep their name. Other columns are named after the
+    series field at the same position if it is a string, or ``field_<i>``
+    otherwise. Transforms may add, drop, or reorder plot data, so names are
+    not taken from series fields alone.
+
+    :param series: KomaPy series config instance.
+    :type series: :class:`komapy.series.Series`
+    :param plot_data: Resolved plot data of the series.
+    :type plot_data: list
+    :rtype: list
+    """
+    fields = series.fields if isinstance(series.fields, (list, tuple)) else []
+    names = []
+    for i, item in enumerate(plot_data):
+        name = getattr(item, 'name', None)
+        if not isinstance(name, str):
+            field = fields[i] if i < len(fields) else None
+            name = field if isinstance(field, str) else 'field_{}'.format(i)
+        names.append(name)
+    return names
+
+
+def get_series_metadata(series, position):
+    """
+    Get schema metadata of series.
+
+    :param series: KomaPy series config instance.
+    :type series: :class:`komapy.series.Series`
+    :param position: Series position in the chart.
+    :type position: int
+    :rtype: dict
+    """
+    metadata = {
+        'position': position,
+        'index': series.index,
+        'name': series.name,
+        'type': series.type,
+        'fields': series.fields,
+        'title': series.title,
+    }
+    return dict(
+        (METADATA_PREFIX + key, json.dumps(value, default=str))
+        for key, value in metadata.items()
+    )
+
+
+def to_record_batches(series_and_data):
+    """
+    Convert resolved chart data into Arrow record batches, one batch per
+    series. Series without data, e.g. series with callable fields, are
+    skipped.
+
+    :param series_and_data: List of series and data pair, e.g. returned by
+                            :meth:`komapy.chart.Chart.resolve` or
+                            :meth:`komapy.chart.Chart.get_series_and_data`.
+    :type series_and_data: list
+    :rtype: list of :class:`pyarrow.RecordBatch`
+    """
+    pa = _import_pyarrow()
+
+    batches = []
+    for position, (series, plot_data) in enumerate(series_and_data):
+        if plot_data is None:
+            continue
+
+        arrays = [to_arrow_array(item) for item in plot_data]
+        if len(set(len(array) for array in arrays)) > 1:
+            raise ChartError(
+                'Fields of series {} have different lengths'.format(position))
+
+        batches.append(pa.RecordBatch.from_arrays(
+            arrays, names=get_field_names(series, plot_data),
+            metadata=get_series_metadata(series, position)))
+    return batches
+
+
+def to_ipc_stream(series_and_data, sink=None):
+    """
+    Serialize resolved chart data into concatenated Arrow IPC streams.
+
+    :param series_and_data: List of series and data pair.
+    :type series_and_data: list
+    :param sink: Writable file-like object or Arrow output stream. If not
+                 set, serialized bytes are returned.
+    :return: Serialized bytes if sink is not set.
+    :rtype: bytes
+    """
+    pa = _import_pyarrow()
+
+    output = pa.BufferOutputStream() if sink is None else sink
+    for batch in to_record_batches(series_and_data):
+        with pa.ipc.new_stream(output, batch.schema) as writer:
+            writer.write_batch(batch)
+
+    if sink is None:
+        return output.getvalue().to_pybytes()
+    return None
+
+
+def read_ipc_stream(source):
+    """
+    Read record batches of concatenated Arrow IPC streams.
+
+    :param source: Serialized bytes.
+    :type source: bytes
+    :rtype: list of :class:`pyarrow.RecordBatch`
+    """
+    pa = _import_pyarrow()
+
+    reader = pa.BufferReader(source)
+    size = reader.size()
+    batches = []
+    while reader.tell() < size:
+        with pa.ipc.open_stream(reader) as stream:
+            batches.extend(stream)
+    return batches
@@ -202,7 +202,7 @@ def set_axis_legend(axis, params=None, **kwargs):
     :param params: Axis legend parameters.
     :type params: dict, optional
     """
-    config = params or {}
+    config = dict(params or {})
 
     if config.pop('show', False):
         axis.legend(**config)
@@ -292,6 +292,7 @@ def customize_axis(axis, params, **kwargs):
         if name in SUPPORTED_CUSTOMIZERS:
             modifier = config[name]
             if isinstance(modifier, dict):
+                modifier = dict(modifier)
                 value = modifier.pop('value', None)
                 if isinstance(value, list):
                     args = [value]
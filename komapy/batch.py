@@ -0,0 +1,308 @@
+"""
+KomaPy batch renderer.
+
+Batch renderer renders many chart config files in parallel and writes the
+outputs to a target directory. Configs can be JSON or YAML files. YAML support
+requires PyYAML package. Fetched resources are shared between all charts in
+the batch. Charts with different theme or ``rc_params`` take turns while they
+are built and saved, see :mod:`komapy.style`.
+
+A manifest of config fingerprints is kept in the output directory. Config
+whose data sources are all local files, e.g. CSV or Excel, is skipped if
+neither the config nor its input files have changed since the last run.
+Configs with remote sources, e.g. BMA API name, URL, or extension plots, are
+fetched first and skipped if the fetched data have not changed either.
+
+Output file is named after the config file name. Config files of the same
+name in different directories would overwrite each other's output, so they
+fail instead.
+
+Run batch renderer using ``komapy render`` command or programmatically:
+
+.. code-block:: python
+
+    from komapy.batch import BatchRenderer
+
+    renderer = BatchRenderer('reports/', jobs=4)
+    results = renderer.run(['configs/'])
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import ExpiringCache, create_digest
+from .chart import Chart
+from .exceptions import ChartError
+from .governor import priority
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+MANIFEST_FILENAME = '.komapy-manifest.json'
+
+# Series data sources that are read from local files.
+LOCAL_SOURCES = ('csv', 'json', 'excel')
+
+# Series data sources that are fetched from remote services.
+REMOTE_SOURCES = ('sql', 'url', 'name')
+
+
+def load_config(path):
+    """
+    Load chart config from JSON or YAML file.
+
+    :param path: Config file path.
+    :type path: str
+    :rtype: dict
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path) as fp:
+        if extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ChartError(
+                    'PyYAML package is required to load YAML config')
+            config = yaml.safe_load(fp)
+        else:
+            config = json.load(fp)
+
+    if not isinstance(config, dict):
+        raise ChartError('Chart config {} must be a mapping'.format(path))
+    return config
+
+
+def find_config_files(paths):
+    """
+    Find config files from list of file or directory paths. Directories are
+    searched non-recursively for JSON and YAML files.
+
+    :param paths: List of config file or directory paths.
+    :type paths: list
+    :rtype: list
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                filename = os.path.join(path, name)
+                extension = os.path.splitext(name)[1].lower()
+                if (os.path.isfile(filename) and
+                        extension in SUPPORTED_EXTENSIONS):
+                    files.append(filename)
+        else:
+            files.append(path)
+    return files
+
+
+def get_local_inputs(config):
+    """
+    Get local input file paths of chart config. Return None if the config has
+    remote data sources.
+
+    :param config: KomaPy chart config.
+    :type config: dict
+    :rtype: list
+    """
+    if config.get('extensions', {}).get('plot'):
+        return None
+
+    def get_source_path(source_config):
+        for name in REMOTE_SOURCES:
+            if source_config.get(name):
+                raise LookupError(name)
+        for name in LOCAL_SOURCES:
+            source = source_config.get(name)
+            if source:
+                path = source[0] if isinstance(source, list) else source
+                if not isinstance(path, str) or not os.path.isfile(path):
+                    raise LookupError(name)
+                return path
+        return None
+
+    inputs = []
+    for layout in config.get('layout', {}).get('data', []):
+        entries = layout.get('series') or []
+        if isinstance(entries, dict):
+            entries = [entries]
+
+        for params in entries:
+            for source_config in [params] + list(params.get('partial', [])):
+                try:
+                    path = get_source_path(source_config)
+                except LookupError:
+                    return None
+                if path is not None:
+                    inputs.append(path)
+    return sorted(set(inputs))
+
+
+def create_fingerprint(config, inputs, output_format):
+    """
+    Create fingerprint of chart config, its local input files, and output
+    format.
+    """
+    files = []
+    for path in inputs:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(65536), b''):
+                digest.update(chunk)
+        files.append([path, digest.hexdigest()])
+    return create_digest([config, output_format, files])
+
+
+class BatchRenderer(object):
+    """
+    A batch renderer object.
+
+    :param output_dir: Directory to write the outputs to.
+    :type output_dir: str
+    :param jobs: Number of charts rendered in parallel.
+    :type jobs: int
+    :param output_format: Output format, e.g. ``png`` or ``pdf``. Default to
+                          chart ``save_options`` format or ``png``.
+    :type output_format: str
+    :param force: Render all configs even if their inputs have not changed.
+    :type force: bool
+    :param chart_class: Chart class to instantiate.
+    :type chart_class: :class:`komapy.chart.Chart`
+    :param output_cache: Output cache of rendered charts.
+    :type output_cache: :class:`komapy.output.OutputCache`
+    """
+
+    def __init__(self, output_dir, jobs=1, output_format=None, force=False,
+                 chart_class=Chart, output_cache=None):
+        self.output_dir = output_dir
+        self.jobs = jobs
+        self.output_format = output_format
+        self.force = force
+        self.chart_class = chart_class
+        self.output_cache = output_cache
+        self.cache = ExpiringCache()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.output_dir, MANIFEST_FILENAME)
+
+    def load_manifest(self):
+        """Load config fingerprints of the previous run."""
+        try:
+            with open(self.manifest_path) as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        """Save config fingerprints atomically."""
+        fd, temp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(manifest, fp, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def get_output_path(self, path, output_format):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.output_dir,
+                            '{}.{}'.format(name, output_format))
+
+    def is_unchanged(self, output_path, manifest, fingerprint):
+        """Check if output of the same fingerprint was written last run."""
+        filename = os.path.basename(output_path)
+        return (not self.force and fingerprint is not None and
+                os.path.exists(output_path) and
+                manifest.get(filename) == fingerprint)
+
+    def render_file(self, path, manifest):
+        """
+        Render a single config file.
+
+        :return: Tuple of render status, i.e. ``rendered``, ``skipped``, or
+                 ``failed``, output file name, and config fingerprint.
+        :rtype: tuple
+        """
+        filename = None
+        try:
+            config = load_config(path)
+            output_format = (self.output_format or
+                             config.get('save_options', {}).get('format') or
+                             'png')
+            output_path = self.get_output_path(path, output_format)
+            filename = os.path.basename(output_path)
+
+            inputs = get_local_inputs(config)
+            fingerprint = None
+            if inputs is not None:
+                fingerprint = create_fingerprint(config, inputs, output_format)
+                if self.is_unchanged(output_path, manifest, fingerprint):
+                    return 'skipped', filename, fingerprint
+
+            config = dict(config)
+            config.setdefault('use_cache', True)
+            chart = self.chart_class(config, cache=self.cache,
+                                     output_cache=self.output_cache)
+            with priority('batch'):
+                if inputs is None:
+                    fingerprint = chart.get_output_key(output_format)
+                    if self.is_unchanged(output_path, manifest, fingerprint):
+                        return 'skipped', filename, fingerprint
+                chart.save(output_path, format=output_format)
+            chart.clear()
+            # Do not keep fingerprint of sources that missed their deadline.
+            if chart.timed_out:
+                fingerprint = None
+        except Exception:
+            logger.exception('Failed to render %s', path)
+            return 'failed', filename, None
+        return 'rendered', filename, fingerprint
+
+    def run(self, paths):
+        """
+        Render all config files.
+
+        :param paths: List of config file or directory paths.
+        :type paths: list
+        :return: List of tuple of config path and render status.
+        :rtype: list
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        files = find_config_files(paths)
+        manifest = self.load_manifest()
+
+        names = collections.defaultdict(list)
+        for path in files:
+            names[os.path.splitext(os.path.basename(path))[0]].append(path)
+
+        def render(path):
+            others = names[os.path.splitext(os.path.basename(path))[0]]
+            if len(others) > 1:
+                logger.error('Output file name of %s collides with %s', path,
+                             ', '.join(other for other in others
+                                       if other != path))
+                return 'failed', None, None
+            return self.render_file(path, manifest)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as executor:
+            outcomes = list(executor.map(render, files))
+
+        results = []
+        for path, (status, filename, fingerprint) in zip(files, outcomes):
+            results.append((path, status))
+            if filename is None:
+                continue
+            if fingerprint is None:
+                manifest.pop(filename, None)
+            else:
+                manifest[filename] = fingerprint
+
+        self.save_manifest(manifest)
+        return results
@@ -1,4 +1,81 @@
+import datetime
+import functools
+import hashlib
+import json
+import threading
+import time
 from collections import OrderedDict
+from collections.abc import Mapping
+
+
+def canonicalize(value):
+    """
+    Convert value into canonical JSON serializable structure. Values of
+    different types are tagged, so they never serialize the same, e.g. ``1``
+    and ``'1'``. Mappings are sorted by key, and dates are converted to ISO
+    8601 format, in UTC if they are timezone aware. Functions and classes are
+    identified by their module and qualified name, not by memory address.
+
+    :param value: Value to convert, e.g. data source config.
+    :rtype: list
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return [type(value).__name__, value]
+    if isinstance(value, bytes):
+        return ['bytes', value.hex()]
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return ['datetime', value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ['date', value.isoformat()]
+    if isinstance(value, Mapping):
+        items = [
+            [canonicalize(key), canonicalize(item)]
+            for key, item in value.items()
+        ]
+        items.sort(key=lambda item: json.dumps(item[0]))
+        return ['dict', items]
+    if isinstance(value, (list, tuple)):
+        return ['list', [canonicalize(item) for item in value]]
+    if isinstance(value, (set, frozenset)):
+        items = [canonicalize(item) for item in value]
+        return ['set', sorted(items, key=json.dumps)]
+
+    # Numpy scalars and pandas timestamps.
+    if hasattr(value, 'to_pydatetime'):
+        return canonicalize(value.to_pydatetime())
+    if hasattr(value, 'item') and hasattr(value, 'dtype'):
+        return canonicalize(value.item())
+
+    if isinstance(value, functools.partial):
+        return ['partial', [canonicalize(value.func),
+                            canonicalize(value.args),
+                            canonicalize(value.keywords)]]
+    if callable(value) and hasattr(value, '__qualname__'):
+        return ['callable', '{}.{}'.format(
+            getattr(value, '__module__', None), value.__qualname__)]
+
+    # Database engines and connections, e.g. SQLAlchemy, are identified by
+    # their URL, so equal connections opened in different processes match.
+    url = getattr(value, 'url', None)
+    if url is None:
+        url = getattr(getattr(value, 'engine', None), 'url', None)
+    name = '{}.{}'.format(type(value).__module__, type(value).__qualname__)
+    if url is not None:
+        return [name, str(url)]
+    return [name, repr(value)]
+
+
+def create_digest(value):
+    """
+    Create SHA-256 hex digest of canonical value serialization. Digest is
+    identical across processes and machines.
+
+    :rtype: str
+    """
+    content = json.dumps(canonicalize(value), separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
 class ResolverCache(object):
@@ -35,7 +112,7 @@ class ResolverCache(object):
         def cached_resolver(series):
             config = ResolverCache.get_resolver_cache_config(series)
             resolver = ResolverCache(config)
-            key = hash(resolver)
+            key = resolver.digest()
 
             if key in cache:
                 return cache[key]
@@ -53,9 +130,17 @@ class ResolverCache(object):
         return False
 
     def __hash__(self):
-        casted_config = dict([(str(key), str(value))
-                              for key, value in self.config.items()])
-        return hash(frozenset(casted_config.items()))
+        return int(self.digest()[:16], 16)
+
+    def digest(self):
+        """
+        Get SHA-256 hex digest of canonical resolver cache config. Unlike
+        built-in string hash, it is not salted per process, so it can be used
+        as persistent or shared cache key.
+
+        :rtype: str
+        """
+        return create_digest(self.config)
 
     @staticmethod
     def get_resolver_cache_config(series):
@@ -63,13 +148,21 @@ class ResolverCache(object):
         Get resolver cache config from KomaPy series instance. It's simply
         takes data resolver key and optional query or csv parameters.
 
-        :param series: KomaPy series config instance.
-        :type series: :class:`komapy.series.Series`
+        :param series: KomaPy series config instance or data source config
+                       dictionary, e.g. ``{'name': 'bulletin',
+                       'query_params': {...}}``.
+        :type series: :class:`komapy.series.Series` or dict
         :return: Dictionary of :class:`komapy.cache.ResolverCache` config.
         :rtype: dict
         """
         config = {}
 
+        if isinstance(series, dict):
+            getter = series.get
+        else:
+            def getter(name, default=None):
+                return getattr(series, name, default)
+
         sources = OrderedDict([
             ('csv', 'csv_params'),
             ('json', 'json_params'),
@@ -80,10 +173,10 @@ class ResolverCache(object):
         ])
 
         for name in sources:
-            source = getattr(series, name, None)
+            source = getter(name, None)
             if source:
                 config[name] = source
-                options = getattr(series, sources[name], {})
+                options = getter(sources[name], {})
                 if options:
                     config.update(options)
                 break
@@ -114,3 +207,127 @@ class ResolverCache(object):
         :rtype: int
         """
         return hash(cls.create_instance_from_series(series))
+
+    @classmethod
+    def create_key_from_source(cls, source):
+        """
+        Create resolver cache key from data source config dictionary.
+
+        :param source: Data source config, e.g. ``{'name': 'bulletin',
+                       'query_params': {...}}``.
+        :type source: dict
+        :return: KomaPy resolver cache key.
+        :rtype: int
+        """
+        return hash(cls(cls.get_resolver_cache_config(source)))
+
+
+class ExpiringCache(object):
+    """
+    Thread-safe dictionary-like cache whose entries expire after ``ttl``
+    seconds. It can be passed to multiple chart instances, e.g. in a
+    long-running render server, to share fetched resources.
+
+    :param ttl: Entry lifetime in seconds. If None, entries never expire.
+    :type ttl: float
+    :param maxsize: Maximum number of entries. Least recently set entries are
+                    removed first. If None, cache size is unbounded.
+    :type maxsize: int
+    """
+
+    def __init__(self, ttl=None, maxsize=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _is_expired(self, timestamp):
+        return self.ttl is not None and time.monotonic() - timestamp > self.ttl
+
+    def _lookup(self, key):
+        # Must be called with the cache lock held.
+        entry = self._data.get(key)
+        if entry is not None and self._is_expired(entry[0]):
+            del self._data[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry[1]
+
+    def __contains__(self, key):
+        with self._lock:
+            found, _ = self._lookup(key)
+            return found
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key][1]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def get_or_create(self, key, create):
+        """
+        Get entry of key, or create it using ``create`` callable if the entry
+        does not exist or has expired. Concurrent calls with the same key wait
+        for a single ``create`` call, so a resource is fetched once even if
+        many charts request it at the same time.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            lock, waiters = self._pending.get(key, (threading.Lock(), 0))
+            self._pending[key] = (lock, waiters + 1)
+
+        try:
+            with lock:
+                with self._lock:
+                    entry = self._data.get(key)
+                if entry is not None and not self._is_expired(entry[0]):
+                    return entry[1]
+
+                value = create()
+                self[key] = value
+                return value
+        finally:
+            with self._lock:
+                lock, waiters = self._pending[key]
+                if waiters > 1:
+                    self._pending[key] = (lock, waiters - 1)
+                else:
+                    del self._pending[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+def get_or_create(cache, key, create):
+    """
+    Get entry of key from dictionary-like cache, or create it using ``create``
+    callable. Creation is coalesced if the cache supports it, e.g.
+    :class:`komapy.cache.ExpiringCache`.
+    """
+    if isinstance(cache, ExpiringCache):
+        return cache.get_or_create(key, create)
+
+    if key not in cache:
+        cache[key] = create()
+    return cache[key]
@@ -0,0 +1,132 @@
+"""
+KomaPy reusable Agg canvas pool.
+
+Rendering a figure with the Agg backend allocates a pixel buffer whose size
+depends on figure size and dpi. Canvas pool keeps the Agg renderers of
+previous exports and hands them out again to figures of the same size and dpi,
+so repeated exports, e.g. in a web service, do not allocate a new buffer for
+every request.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.canvas import canvas_pool
+
+    with canvas_pool.canvas(figure):
+        figure.savefig(buffer, format='png')
+"""
+
+import threading
+from contextlib import contextmanager
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+
+from .settings import app_settings
+
+
+class PooledCanvasAgg(FigureCanvasAgg):
+    """
+    Agg canvas that borrows its renderer from a canvas pool.
+    """
+
+    def __init__(self, figure, pool):
+        super(PooledCanvasAgg, self).__init__(figure)
+        self.pool = pool
+        self.renderer = None
+        self._lastKey = None
+
+    def get_renderer(self, cleared=False):
+        w, h = self.figure.bbox.size
+        key = (w, h, self.figure.dpi)
+        if self._lastKey != key:
+            self.release_renderer()
+            self.renderer = self.pool.acquire(key)
+            self._lastKey = key
+        if cleared:
+            # Matplotlib < 3.6 relies on the canvas to clear the renderer.
+            self.renderer.clear()
+        return self.renderer
+
+    def release_renderer(self):
+        """Return borrowed renderer to the pool."""
+        renderer = getattr(self, 'renderer', None)
+        if renderer is not None and self._lastKey is not None:
+            self.pool.release(self._lastKey, renderer)
+        self.renderer = None
+        self._lastKey = None
+
+
+class CanvasPool(object):
+    """
+    Pool of reusable Agg renderers keyed by width, height, and dpi.
+
+    :param maxsize: Maximum number of idle renderers kept in the pool. Default
+                    to ``CANVAS_POOL_MAXSIZE`` setting.
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """
+        Get idle renderer of size key or create a new one.
+
+        :param key: Tuple of width, height, and dpi.
+        :type key: tuple
+        :rtype: :class:`matplotlib.backends.backend_agg.RendererAgg`
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.hits += 1
+                return idle.pop()
+            self.misses += 1
+        return RendererAgg(*key)
+
+    def release(self, key, renderer):
+        """Return renderer to the pool."""
+        maxsize = self.maxsize
+        if maxsize is None:
+            maxsize = app_settings.CANVAS_POOL_MAXSIZE
+
+        with self._lock:
+            if sum(map(len, self._idle.values())) >= maxsize:
+                return
+            self._idle.setdefault(key, []).append(renderer)
+
+    def clear(self):
+        """Remove all idle renderers."""
+        with self._lock:
+            self._idle.clear()
+
+    @property
+    def size(self):
+        """Number of idle renderers in the pool."""
+        with self._lock:
+            return sum(map(len, self._idle.values()))
+
+    @contextmanager
+    def canvas(self, figure):
+        """
+        Attach pooled Agg canvas to the figure within the context. Original
+        figure canvas is restored on exit.
+
+        :param figure: Matplotlib figure instance.
+        :type figure: :class:`matplotlib.figure.Figure`
+        """
+        original = figure.canvas
+        canvas = PooledCanvasAgg(figure, self)
+        try:
+            yield canvas
+        finally:
+            canvas.release_renderer()
+            figure.set_canvas(original)
+
+
+canvas_pool = CanvasPool()
@@ -38,38 +38,58 @@ Example:
     chart.save('RB2.png')
 """
 
+import contextlib
 import copy
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import partial
 
-import matplotlib.pyplot as plt
-
-from . import addons, extensions, utils
-from .axis import (build_secondary_axis, build_tertiary_axis, customize_axis,
-                   set_axis_formatter, set_axis_label, set_axis_legend,
-                   set_axis_locator)
-from .cache import ResolverCache
-from .constants import SUPPORTED_TYPES
+from . import addons, utils
+from .cache import ResolverCache, get_or_create
+from .constants import (PYPLOT_FIGURE_OPTIONS, SUPPORTED_TYPES,
+                        SWAPPABLE_TYPES, VECTOR_FORMATS)
 from .exceptions import ChartError
 from .layout import Layout
+from .plan import Placeholder
+from .resilience import call_with_deadline
 from .series import Series, addon_registers
 from .settings import app_settings
+from .style import style_context
+
+# Matplotlib, pandas, and data fetchers are imported on first use, so
+# importing komapy and validating chart configs stay fast.
 
-if utils.get_matplotlib_version() < (3, 3):
-    from pandas.plotting import register_matplotlib_converters
-    register_matplotlib_converters()
+logger = logging.getLogger(__name__)
 
 
 def apply_theme(name):
-    """Apply matplotlib plot theme."""
+    """
+    Apply matplotlib plot theme globally. Chart theme is applied per chart
+    using :func:`komapy.style.style_context` instead.
+    """
+    import matplotlib.pyplot as plt
+
     if name in plt.style.available:
         plt.style.use(name)
 
 
 class Chart(object):
-    """A chart object."""
-
-    def __init__(self, config):
+    """
+    A chart object.
+
+    :param config: KomaPy chart config.
+    :type config: dict
+    :param cache: Dictionary-like resource cache used if ``use_cache`` is set.
+                  It can be shared between chart instances, e.g.
+                  :class:`komapy.cache.ExpiringCache`. Default to a new
+                  dictionary.
+    """
+
+    def __init__(self, config, cache=None, output_cache=None):
         self.config = config
 
         self.title = config.get('title')
@@ -86,15 +106,33 @@ class Chart(object):
         self.tight_layout = config.get('tight_layout', {})
         self.rc_params = config.get('rc_params', {})
         self.use_cache = config.get('use_cache', False)
+        self.interactive = config.get('interactive', False)
+        self.rasterize = config.get('rasterize', {})
+        self.deadline = config.get('deadline')
+        self.priority = config.get('priority')
+        self.placeholder = config.get('placeholder', {})
 
         self.figure = None
         self.axes = []
         self.rendered_axes = []
         self.series = []
         self.data = []
+        self.timed_out = []
 
-        self._cache = {}
+        self._cache = {} if cache is None else cache
+        self._owns_cache = cache is None
+        self.output_cache = output_cache
+        self._render_cache = {}
         self._plotted_axes = []
+        self._series_artists = []
+        self._extension_artists = []
+        self._extension_legend = None
+        self._subplot_params = {}
+        self._compiled_series = {}
+        self._plan = None
+        self._resources = None
+        self._deadline_at = None
+        self._timed_out_extensions = set()
         self._validate()
 
     def get_config(self):
@@ -151,19 +189,49 @@ class Chart(object):
                 return None
         return [d for (s, d) in self.data]
 
-    def _validate(self):
-        self.layout.validate()
-
-        for layout in self.layout.data:
+    def _iter_series_params(self):
+        # Series are keyed by their position in the layout, i.e. layout index
+        # and series index, so layouts can share the same series config.
+        for layout_index, layout in enumerate(self.layout.data):
             layout_series = layout.get('series')
             if isinstance(layout_series, list):
-                for params in layout_series:
-                    config = Series(**params)
-                    config.validate()
+                for series_index, params in enumerate(layout_series):
+                    yield (layout_index, series_index), params
             elif isinstance(layout_series, dict):
-                params = layout_series
-                config = Series(**params)
-                config.validate()
+                yield (layout_index, 0), layout_series
+
+    def _validate(self):
+        """
+        Validate chart config in one pass. Validated series instances are
+        kept and reused on every render.
+        """
+        self.layout.validate()
+
+        self._compiled_series = {}
+        for key, params in self._iter_series_params():
+            series = Series(**params)
+            series.validate()
+            self._compiled_series[key] = series
+
+    def _get_series(self, key, params):
+        series = self._compiled_series.get(key)
+        if series is None:
+            series = Series(**params)
+        return series
+
+    @property
+    def plan(self):
+        """
+        Execution plan of chart data pipeline. Plan is compiled on first access
+        and reused on every render.
+
+        :rtype: :class:`komapy.plan.ExecutionPlan`
+        """
+        if self._plan is None:
+            from .plan import compile_plan
+
+            self._plan = compile_plan(self)
+        return self._plan
 
     @property
     def num_subplots(self):
@@ -173,28 +241,114 @@ class Chart(object):
     def _fetch_resource(self, series, **kwargs):
         return series.fetch_resource(**kwargs)
 
-    def _resolve_data(self, series, **kwargs):
+    def _priority_context(self):
         """
-        Resolve series data. Return cached version if use_cache=True.
+        Set request priority of chart data sources if chart ``priority`` is
+        set. Otherwise, priority of the current context is kept.
+        """
+        from .governor import priority
+
+        if self.priority is None:
+            return contextlib.nullcontext()
+        return priority(self.priority)
+
+    def _start_deadline(self):
+        """
+        Start chart deadline and reset timed out sources.
+        """
+        self.timed_out = []
+        self._timed_out_extensions = set()
+        self._deadline_at = None
+        if self.deadline is not None:
+            self._deadline_at = time.monotonic() + self.deadline
+
+    def _has_deadline(self):
+        """
+        Check if the chart or any of its series has a deadline.
+        """
+        if self.deadline is not None:
+            return True
+        return any(
+            self._get_series(key, params).deadline is not None
+            for key, params in self._iter_series_params()
+        )
+
+    def _get_fetch_timeout(self, series=None):
+        """
+        Get fetch timeout in seconds from series deadline and remaining time
+        of chart deadline. Return None if there is no deadline.
+        """
+        timeouts = []
+        if series is not None and series.deadline is not None:
+            timeouts.append(series.deadline)
+        if self._deadline_at is not None:
+            timeouts.append(self._deadline_at - time.monotonic())
+        return min(timeouts) if timeouts else None
+
+    def _fetch_series_resource(self, series, **kwargs):
+        """
+        Fetch series resource. Return cached version if use_cache=True. Raise
+        :class:`komapy.exceptions.FetchTimeoutError` if the source misses its
+        deadline.
         """
         if self.use_cache:
             cache_key = ResolverCache.create_key_from_series(series)
-            if cache_key in self._cache:
-                data = self._cache[cache_key]
-                plot_data = series.resolve_data(resource=data)
-                return plot_data
-
-            data = self._fetch_resource(series, **kwargs)
-            plot_data = series.resolve_data(resource=data)
-            self._cache[cache_key] = data
+            fetch = partial(
+                get_or_create, self._cache, cache_key,
+                partial(self._fetch_resource, series, **kwargs))
         else:
-            data = self._fetch_resource(series, **kwargs)
-            plot_data = series.resolve_data(resource=data)
-        return plot_data
+            fetch = partial(self._fetch_resource, series, **kwargs)
+
+        return call_with_deadline(
+            series.name or series.index or 'Series', fetch,
+            self._get_fetch_timeout(series))
+
+    def _resolve_data(self, series, **kwargs):
+        """
+        Resolve series data. Return cached version if use_cache=True.
+        """
+        data = self._fetch_series_resource(series, **kwargs)
+        return series.resolve_data(resource=data)
+
+    def _fetch_extension_resource(self, source):
+        from . import extensions
+
+        return extensions.fetch_extension_data(source)
+
+    def _resolve_extension_data(self, source):
+        """
+        Resolve extension data. Each unique data source is fetched once per
+        render and shared across all subplot axes. Data is kept in chart cache
+        if use_cache=True.
+        """
+        cache = self._cache if self.use_cache else self._render_cache
+        cache_key = ResolverCache.create_key_from_source(source)
+        return get_or_create(
+            cache, cache_key,
+            partial(self._fetch_extension_resource, source))
+
+    def _resolve_extension_batch(self, sources):
+        """
+        Resolve data of grouped extension sources. Return dictionary of data
+        keyed by cache key of each source. Data is fetched by a single request
+        unless all sources are found in the cache.
+        """
+        from . import extensions
+
+        cache = self._cache if self.use_cache else self._render_cache
+        keys = [ResolverCache.create_key_from_source(source)
+                for source in sources]
+        if all(key in cache for key in keys):
+            return OrderedDict((key, cache[key]) for key in keys)
+
+        data = extensions.fetch_batched_extension_data(
+            sources, fetch=self._fetch_extension_resource)
+        return OrderedDict(zip(keys, data))
 
     def _build_addons(self, axis, addons_entry):
         for addon in addons_entry:
             if isinstance(addon, dict):
+                addon = dict(addon)
                 name = addon.pop('name', None)
                 if isinstance(name, str):
                     if name in addon_registers:
@@ -216,15 +370,30 @@ class Chart(object):
                 callback = addon
                 callback(axis)
 
-    def _build_series(self, axis, params):
-        series = Series(**params)
+    def _build_series(self, axis, params, key=None):
+        from .axis import (build_secondary_axis, build_tertiary_axis,
+                           customize_axis, set_axis_formatter, set_axis_label,
+                           set_axis_legend, set_axis_locator)
+
+        series = self._get_series(key, params)
         self.series.append(series)
 
         if isinstance(series.fields, Callable):
             self.data.append((series, None))
+            self._series_artists.append((series, axis, None))
             return series.fields(axis, **series.field_options)
 
-        plot_data = self._resolve_data(series)
+        prefetch_key = ('series', key)
+        if prefetch_key in self._render_cache:
+            plot_data = self._render_cache.pop(prefetch_key)
+        else:
+            plot_data = self._resolve_data(series)
+
+        if isinstance(plot_data, Placeholder):
+            self.data.append((series, None))
+            self._series_artists.append((series, axis, None))
+            self._build_placeholder(axis, series, plot_data)
+            return axis
         self.data.append((series, plot_data))
 
         if series.axis:
@@ -238,7 +407,9 @@ class Chart(object):
                 gca = axis
 
         plot = getattr(gca, SUPPORTED_TYPES[series.type])
-        partial(plot, *plot_data, **series.plot_params)()
+        artists = partial(plot, *plot_data, **series.plot_params)()
+        self._rasterize_artists(series, artists, plot_data)
+        self._series_artists.append((series, gca, artists))
 
         set_axis_label(gca, params=series.labels)
         locators = set_axis_locator(gca, params=series.locator)
@@ -253,13 +424,49 @@ class Chart(object):
 
         return gca
 
+    def _build_placeholder(self, axis, series, placeholder):
+        """
+        Annotate axis of series whose data source missed its deadline.
+        """
+        options = {
+            'text': 'Data source timed out',
+            'ha': 'center',
+            'va': 'center',
+            'color': 'gray',
+        }
+        options.update(self.placeholder)
+        text = options.pop('text')
+        if text:
+            axis.text(0.5, 0.5, text, transform=axis.transAxes, **options)
+        axis.set_title(series.title)
+
+    def _rasterize_artists(self, series, artists, plot_data):
+        """
+        Mark series artists as rasterized if the series has more points than
+        the rasterization threshold. Axes, text, and light series stay vector
+        in vector outputs like PDF or SVG.
+        """
+        rasterize = series.rasterize
+        if rasterize is None:
+            rasterize = self.rasterize.get('threshold')
+        if rasterize is None:
+            return
+
+        if isinstance(rasterize, bool):
+            rasterized = rasterize
+        else:
+            rasterized = utils.count_points(plot_data) > rasterize
+
+        for artist in utils.iter_artists(artists):
+            artist.set_rasterized(rasterized)
+
     def _build_series_legend(self, axis, handles, labels, params=None):
-        options = params or {}
+        options = dict(params or {})
 
         if options.pop('show', False):
             axis.legend(handles, labels, **options)
 
-    def _build_layout(self, axis, layout):
+    def _build_layout(self, axis, layout, index=None):
         subplot_axes = []
         if not layout.get('series'):
             return subplot_axes
@@ -267,8 +474,9 @@ class Chart(object):
         subplot_handles = []
         subplot_labels = []
         if isinstance(layout['series'], list):
-            for series_data in layout['series']:
-                gca = self._build_series(axis, series_data)
+            for series_index, series_data in enumerate(layout['series']):
+                gca = self._build_series(
+                    axis, series_data, key=(index, series_index))
                 subplot_axes.append(gca)
 
                 handle, label = gca.get_legend_handles_labels()
@@ -280,7 +488,7 @@ class Chart(object):
                         subplot_labels.append(label[index])
                 self._plotted_axes.append(gca)
         elif isinstance(layout['series'], dict):
-            gca = self._build_series(axis, layout['series'])
+            gca = self._build_series(axis, layout['series'], key=(index, 0))
             subplot_axes.append(gca)
 
             handle, label = gca.get_legend_handles_labels()
@@ -293,7 +501,30 @@ class Chart(object):
         return subplot_axes
 
     def _build_figure(self):
-        self.figure = plt.figure(**self.figure_options)
+        if utils.get_matplotlib_version() < (3, 3):
+            from pandas.plotting import register_matplotlib_converters
+            register_matplotlib_converters()
+
+        options = dict(self.figure_options)
+        if self.layout.type != 'grid':
+            options.update(self.layout.get_figure_options())
+
+        if self.interactive:
+            import matplotlib.pyplot as plt
+
+            self.figure = plt.figure(**options)
+            return
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # Figure is not registered to pyplot, so charts can be rendered
+        # concurrently without sharing the pyplot current figure.
+        figure_class = options.pop('FigureClass', Figure)
+        for key in PYPLOT_FIGURE_OPTIONS:
+            options.pop(key, None)
+        self.figure = figure_class(**options)
+        FigureCanvasAgg(self.figure)
 
     def _build_axes_rank(self):
         share = []
@@ -316,32 +547,37 @@ class Chart(object):
         keys = ['sharex', 'sharey']
 
         if self.layout.type == 'grid':
-            layout_size = self.layout.size
+            gridspec = self.figure.add_gridspec(*self.layout.size)
 
             rank = self._build_axes_rank()
             for _, index in rank:
                 grid = self.layout.data[index]['grid']
-                location = grid['location']
-                options = grid.get('options', {})
+                location = tuple(grid['location'])
+                options = dict(grid.get('options', {}))
+                rowspan = options.pop('rowspan', 1)
+                colspan = options.pop('colspan', 1)
 
                 for key in keys:
                     share_index = options.get(key)
                     if share_index:
                         options.update({key: self.axes[share_index]})
-                self.axes[index] = plt.subplot2grid(
-                    layout_size, location, **options)
+                subplotspec = gridspec.new_subplotspec(
+                    location, rowspan=rowspan, colspan=colspan)
+                self.axes[index] = self.figure.add_subplot(
+                    subplotspec, **options)
         else:
             num_columns = 1
-            options = self.layout.options
+            options = self.layout.get_subplots_options()
             if self.num_subplots == 0:
                 num_rows = 1
             else:
                 num_rows = self.num_subplots
 
-            self.figure, self.axes = plt.subplots(
-                num_rows, num_columns, **options)
+            self.axes = self.figure.subplots(num_rows, num_columns, **options)
 
     def _build_extension_series(self, axis, starttime, endtime):
+        from . import extensions
+
         if not starttime:
             raise ChartError(
                 'Parameter starttime is required to build extension series')
@@ -365,17 +601,25 @@ class Chart(object):
             else:
                 if name not in extensions.extension_registers:
                     continue
-                resolver = extensions.extension_registers[name]['resolver']
+                register = extensions.extension_registers[name]
+                resolver = register['resolver']
                 if isinstance(resolver, Callable):
                     method = resolver
                 elif isinstance(resolver, str):
-                    method = getattr(
-                        extensions,
-                        extensions.extension_registers[name]['resolver'])
-
-                labels.append(item.pop(
-                    'label',
-                    extensions.extension_registers[name].get('label', '')))
+                    method = getattr(extensions, resolver)
+
+                labels.append(item.pop('label', register.get('label', '')))
+
+                query = register.get('query')
+                if query is not None:
+                    if isinstance(query, str):
+                        query = getattr(extensions, query)
+                    source = query(starttime, endtime, **item)
+                    cache_key = ResolverCache.create_key_from_source(source)
+                    if cache_key in self._timed_out_extensions:
+                        labels.pop()
+                        continue
+                    item['data'] = self._resolve_extension_data(source)
                 handle = method(axis, starttime, endtime, **item)
 
                 if handle:
@@ -385,44 +629,203 @@ class Chart(object):
 
         return handles, labels
 
-    def _build_extension_plot(self, axis):
-        if self.extensions:
-            starttime = utils.to_pydatetime(
-                self.extensions['starttime'],
-                timezone=self.timezone
-            ) if self.extensions.get('starttime') else None
+    def _get_extension_time_range(self):
+        starttime = utils.to_pydatetime(
+            self.extensions['starttime'],
+            timezone=self.timezone
+        ) if self.extensions.get('starttime') else None
 
-            endtime = utils.to_pydatetime(
-                self.extensions['endtime'],
-                timezone=self.timezone
-            ) if self.extensions.get('endtime') else None
+        endtime = utils.to_pydatetime(
+            self.extensions['endtime'],
+            timezone=self.timezone
+        ) if self.extensions.get('endtime') else None
+        return starttime, endtime
 
+    def _fetch_extension_data(self, source):
+        """
+        Resolve extension data within chart deadline.
+        """
+        return call_with_deadline(
+            source.get('name') or 'Extension',
+            partial(self._resolve_extension_data, source),
+            self._get_fetch_timeout())
+
+    def _fetch_extension_batch(self, sources):
+        """
+        Resolve data of grouped extension sources within chart deadline.
+        """
+        return call_with_deadline(
+            sources[0].get('name') or 'Extension',
+            partial(self._resolve_extension_batch, sources),
+            self._get_fetch_timeout())
+
+    def _get_extension_sources(self):
+        """
+        Get data source configs of registered extension plots.
+        """
+        from . import extensions
+
+        starttime, endtime = self._get_extension_time_range()
+        if not starttime or not endtime:
+            return []
+
+        sources = []
+        for item in self.extensions.get('plot', []):
+            item = dict(item)
+            name = item.pop('name', None)
+            item.pop('label', None)
+            if not isinstance(name, str):
+                continue
+            register = extensions.extension_registers.get(name)
+            if register is None or register.get('query') is None:
+                continue
+
+            query = register['query']
+            if isinstance(query, str):
+                query = getattr(extensions, query)
+            sources.append(query(starttime, endtime, **item))
+        return sources
+
+    def _build_extension_plot(self, axis):
+        if self.extensions:
+            children = set(map(id, axis.get_children()))
+            starttime, endtime = self._get_extension_time_range()
             handles, labels = self._build_extension_series(
                 axis, starttime, endtime)
-            legend = self.extensions.pop('legend', {})
-
-            if legend:
+            self._extension_artists += [
+                artist for artist in axis.get_children()
+                if id(artist) not in children
+            ]
+            # Extension legend is drawn once per figure.
+            legend = dict(self.extensions.get('legend', {}))
+            if legend and self._extension_legend is None:
                 show = legend.pop('show', False)
                 if show:
-                    self.figure.legend(handles, labels, **legend)
+                    self._extension_legend = self.figure.legend(
+                        handles, labels, **legend)
 
-    def _update_rc_params(self):
-        plt.rcParams.update(self.rc_params)
+    def _style_context(self):
+        return style_context(self.theme, self.rc_params)
+
+    def _execute_plan(self, resources=None, max_workers=None, targets=None):
+        """
+        Execute chart execution plan. Return dictionary of plot data keyed by
+        series key. Fetched resources of the whole plan are kept for output
+        cache key.
+        """
+        if resources is None:
+            self._start_deadline()
+        with self._priority_context():
+            results = self.plan.execute(
+                nodes=resources, max_workers=max_workers, targets=targets)
+        fetch_nodes = [
+            node for node in self.plan.get_nodes('fetch')
+            if node.key in results
+        ]
+        if targets is None:
+            self._resources = dict(
+                (node.key, results[node.key]) for node in fetch_nodes)
+
+        # Extension data are looked up by extension plots while the chart is
+        # built.
+        cache = self._cache if self.use_cache else self._render_cache
+        for node in fetch_nodes:
+            data = results[node.key]
+            if isinstance(data, Placeholder):
+                if node.label not in self.timed_out:
+                    self.timed_out.append(node.label)
+                    logger.warning('Data source timed out: %s', data.error)
+                if node.key[0] == 'extension':
+                    self._timed_out_extensions.add(node.key[1])
+                elif node.key[0] == 'extension_batch':
+                    self._timed_out_extensions.update(node.key[1])
+            elif node.key[0] == 'extension' and node.key[1] not in cache:
+                cache[node.key[1]] = data
+            elif node.key[0] == 'extension_batch':
+                for key, item in data.items():
+                    if key not in cache:
+                        cache[key] = item
+        return dict(
+            (node.key[1], results[node.inputs[0].key])
+            for node in self.plan.get_nodes('plot')
+            if node.inputs
+        )
+
+    def resolve(self, max_workers=None):
+        """
+        Resolve data of all series without building the figure.
+
+        Only the data pipeline of series, i.e. fetch, aggregations, and
+        transforms, is executed. Data of extension plots are not fetched.
+        Different data sources are fetched concurrently. Matplotlib
+        pyplot is never imported, so it can be used to serve resolved data,
+        e.g. to a web frontend. Series whose fields are callable or whose
+        source missed its deadline have no data.
+
+        :param max_workers: Number of threads used to fetch data sources.
+                            Default to ``RESOLVE_MAX_WORKERS`` setting.
+        :type max_workers: int
+        :return: List of series and data pair like
+                 :meth:`get_series_and_data`.
+        :rtype: list
+        """
+        if max_workers is None:
+            max_workers = app_settings.RESOLVE_MAX_WORKERS
+
+        resolved = self._execute_plan(
+            max_workers=max_workers, targets=self.plan.get_nodes('plot'))
+        self.series = []
+        self.data = []
+        for key, params in self._iter_series_params():
+            series = self._get_series(key, params)
+            plot_data = resolved.get(key)
+            if isinstance(plot_data, Placeholder):
+                plot_data = None
+            self.series.append(series)
+            self.data.append((series, plot_data))
+        return self.data
+
+    def _prefetch_data(self, resources=None):
+        """
+        Resolve series data before chart style is applied, so slow requests do
+        not block other charts from rendering. Data sources are fetched in the
+        calling thread, unless the chart or one of its series has a deadline.
+        Then different data sources are fetched concurrently, so a slow source
+        does not consume the deadline of the others.
+        """
+        max_workers = None
+        if self._has_deadline():
+            max_workers = app_settings.RESOLVE_MAX_WORKERS
+        resolved = self._execute_plan(resources, max_workers=max_workers)
+        for key, plot_data in resolved.items():
+            self._render_cache[('series', key)] = plot_data
 
     def render(self):
         """
         Render chart object.
 
         It builds figure, layout, series, fetchs resource from data sources,
-        renders matplotlib axes objects, and performs other tasks.
+        renders matplotlib axes objects, and performs other tasks. Chart theme
+        and rc_params are only applied while the chart is rendered.
         """
+        self._render_cache.clear()
+        self._render()
 
-        self._update_rc_params()
-        apply_theme(self.theme)
-
+    def _render(self, resources=None):
         self.axes = [None] * self.num_subplots
         self.rendered_axes = []
+        self.series = []
+        self.data = []
+        self._plotted_axes = []
+        self._series_artists = []
+        self._extension_artists = []
+        self._extension_legend = None
 
+        self._prefetch_data(resources)
+        with self._style_context():
+            self._build_chart()
+
+    def _build_chart(self):
         self._build_figure()
         self._build_axes()
 
@@ -431,7 +834,7 @@ class Chart(object):
 
         index = 0
         for axis, layout in zip(self.axes, self.layout.data):
-            subplot_axes = self._build_layout(axis, layout)
+            subplot_axes = self._build_layout(axis, layout, index=index)
             if index == 0 and len(subplot_axes) > 0:
                 if utils.get_matplotlib_version() >= (3, 3):
                     axis.set_title(self.title)
@@ -440,29 +843,327 @@ class Chart(object):
 
             index += 1
 
-    def save(self, filename):
-        """Export chart object to file."""
+        self._subplot_params = dict(
+            (key, getattr(self.figure.subplotpars, key))
+            for key in ['left', 'bottom', 'right', 'top', 'wspace', 'hspace'])
+
+    @property
+    def is_refreshable(self):
+        """
+        Check if rendered chart data can be swapped in place using
+        :meth:`refresh`. Only line based series, e.g. ``line``, ``step``, or
+        ``semilogy``, with one or two fields are supported.
+        """
+        if self.figure is None or not self._series_artists:
+            return False
+
+        for series, _, artists in self._series_artists:
+            if artists is None or series.type not in SWAPPABLE_TYPES:
+                return False
+            if len(series.fields) not in (1, 2) or len(artists) != 1:
+                return False
+        return True
+
+    def refresh(self):
+        """
+        Refresh rendered chart with new data.
 
+        Figure, axes, and static decorations like labels, locators,
+        formatters, and theme are kept. Series data are resolved again and
+        swapped into the existing artists, extension plots are redrawn, and
+        axes limits are rescaled. The output is identical to a full render.
+
+        Resource cache of the chart is cleared first, so new data are fetched
+        even if ``use_cache`` is set. Shared cache passed to the chart is kept
+        and its entries expire on their own, like on a full render.
+
+        :return: True if chart is refreshed in place. Otherwise, chart is not
+                 refreshable and False is returned.
+        :rtype: bool
+        """
+        if not self.is_refreshable:
+            return False
+
+        self._render_cache.clear()
+        if self._owns_cache:
+            self._cache.clear()
+        resolved = self._execute_plan()
+        # Series whose source missed its deadline keep their previous data.
+        self.data = [
+            (series, previous if isinstance(plot_data, Placeholder)
+             else plot_data)
+            for (series, previous), plot_data in zip(self.data, [
+                resolved[key] for key, _ in self._iter_series_params()
+            ])
+        ]
+
+        with self._style_context():
+            for (series, plot_data), (_, _, artists) in zip(
+                    self.data, self._series_artists):
+                if len(plot_data) == 1:
+                    ydata = plot_data[0]
+                    xdata = range(len(ydata))
+                else:
+                    xdata, ydata = plot_data
+                artists[0].set_data(xdata, ydata)
+                self._rasterize_artists(series, artists, plot_data)
+
+            for artist in self._extension_artists:
+                artist.remove()
+            self._extension_artists = []
+            for axis in self.axes:
+                self._build_extension_plot(axis)
+
+            for axis in self.figure.get_axes():
+                axis.relim()
+                axis.autoscale_view()
+
+            # Restore subplot parameters, so tight layout is computed from the
+            # same initial state as a full render.
+            self.figure.subplots_adjust(**self._subplot_params)
+        return True
+
+    def _get_cumulative_fields(self, series):
+        """
+        Get indexes of fields with cumulative aggregation. Return None if
+        cumulative value cannot be carried forward.
+        """
+        from . import processing
+
+        if series.transforms:
+            return None
+
+        cumulative = {}
+        for item in series.aggregations:
+            func = item.get('func')
+            if isinstance(func, str):
+                func = processing.supported_aggregations.get(func, func)
+
+            field = item.get('field')
+            if field in cumulative:
+                # Other aggregation is applied after cumulative aggregation.
+                return None
+            if func in processing.cumulative_aggregations:
+                cumulative[field] = series.fields.index(field)
+        return list(cumulative.values())
+
+    def _resolve_new_data(self, series, previous):
+        """
+        Resolve series data newer than the last sample of previous data.
+        """
+        last = previous[0].iloc[-1]
+        resource = self._fetch_resource(series, since=last)
+
+        x_field = series.fields[0]
+        if resource is None or x_field not in resource:
+            return None
+
+        timestamp = resource[x_field]
+        if series.xaxis_date:
+            timestamp = utils.resolve_timestamp(timestamp)
+        resource = resource[(timestamp > last).values]
+        if resource.empty:
+            return None
+
+        plot_data = series.resolve_data(resource=resource)
+        for index in self._get_cumulative_fields(series):
+            plot_data[index] = plot_data[index] + previous[index].iloc[-1]
+        return plot_data
+
+    def update(self):
+        """
+        Append new samples to the rendered chart.
+
+        For every line based series of two fields, only data newer than the
+        last plotted timestamp are fetched and appended to the existing
+        artists. Cumulative aggregations like ``cumsum`` are carried forward.
+        Series with data transforms or non carryable aggregations are resolved
+        again in full. Affected axes are rescaled, and the figure is not
+        redrawn. Call :meth:`save` or draw the figure canvas to show the
+        changes.
+
+        :return: List of updated matplotlib artists.
+        :rtype: list
+        """
+        import pandas as pd
+
+        updated = []
+        for index, (series, gca, artists) in enumerate(self._series_artists):
+            if artists is None or series.type not in SWAPPABLE_TYPES:
+                continue
+            if len(series.fields) != 2 or len(artists) != 1:
+                continue
+
+            previous = self.data[index][1]
+            if not isinstance(series.fields[0], str) or previous is None:
+                continue
+
+            if (len(previous[0]) == 0 or
+                    self._get_cumulative_fields(series) is None):
+                plot_data = series.resolve_data(
+                    resource=self._fetch_resource(series))
+            else:
+                new_data = self._resolve_new_data(series, previous)
+                if new_data is None:
+                    continue
+                plot_data = [
+                    pd.concat([old, new], ignore_index=True)
+                    for old, new in zip(previous, new_data)
+                ]
+
+            self.data[index] = (series, plot_data)
+            self._resources = None
+            artists[0].set_data(*plot_data)
+            self._rasterize_artists(series, artists, plot_data)
+            gca.relim()
+            gca.autoscale_view()
+            updated.append(artists[0])
+
+        return updated
+
+    def _prepare_save(self):
         if utils.get_matplotlib_version() < (3, 3):
             if self.num_subplots > 1:
                 self.figure.suptitle(self.title)
             else:
-                plt.title(self.title)
+                self.figure.gca().set_title(self.title)
 
         if self.tight_layout:
-            plt.tight_layout(**self.tight_layout)
-        plt.savefig(filename, **self.save_options)
-        plt.close(plt.gcf())
+            self.figure.tight_layout(**self.tight_layout)
+
+    def save(self, filename, format=None):
+        """
+        Export chart object to file.
+
+        If chart has an output cache and output of the same config and data is
+        cached, cached file is copied to file name instead. Chart that is not
+        rendered yet is only rendered on cache miss, so call this method
+        without :meth:`render` to skip plotting of unchanged charts.
+
+        :param filename: Output file name.
+        :type filename: str
+        :param format: Output format, e.g. ``png``, ``svg``, or ``pdf``.
+        :type format: str
+        """
+        if self.output_cache is None:
+            if self.figure is None:
+                self._render_cache.clear()
+                self._render(self._resources)
+            self.write(filename, format=format)
+            return
+
+        options = dict(self.save_options)
+        if format is not None:
+            options['format'] = format
+        output_format = self._get_output_format(filename, options)
+
+        key = self.get_output_key(output_format)
+        if key is None:
+            # Chart data were updated incrementally, so the output is not
+            # addressable by its resources.
+            self.write(filename, format=format)
+            return
+
+        if self.output_cache.restore(key, output_format, filename):
+            return
+
+        if self.figure is None:
+            self._render(self._resources)
+        self.write(filename, format=format)
+        # Do not cache placeholders of sources that missed their deadline.
+        if not self.timed_out:
+            self.output_cache.store(key, output_format, filename)
+
+    def get_output_key(self, output_format):
+        """
+        Get output cache key of chart config and its data in the output
+        format. Data sources of chart that is not rendered yet are fetched
+        and kept for the next :meth:`save`, so the chart is only plotted if
+        the key has changed.
+
+        :param output_format: Output format, e.g. ``png``.
+        :type output_format: str
+        :return: Output key, or None if chart data were updated incrementally.
+        :rtype: str
+        """
+        from .output import create_output_key
+
+        if self.figure is None and self._resources is None:
+            self._render_cache.clear()
+            self._start_deadline()
+            with self._priority_context():
+                self._resources = self.plan.execute(kinds=('fetch',))
+        if self._resources is None:
+            return None
+
+        return create_output_key(self.config, output_format, [
+            self._resources[node.key] for node in self.plan.get_nodes('fetch')
+        ])
+
+    def write(self, fileobj, format=None):
+        """
+        Export chart object to file name or file-like object, e.g.
+        :class:`io.BytesIO` or HTTP response stream.
+
+        Figure is drawn using reusable Agg canvas from
+        :data:`komapy.canvas.canvas_pool`.
+
+        :param fileobj: File name or file-like object.
+        :param format: Output format, e.g. ``png``, ``svg``, or ``pdf``. If not
+                       set, format is taken from ``save_options`` or inferred
+                       from file name.
+        :type format: str
+        """
+        from .canvas import canvas_pool
+
+        options = dict(self.save_options)
+        if format is not None:
+            options['format'] = format
+
+        with self._style_context():
+            dpi = self.rasterize.get('dpi')
+            if dpi is not None:
+                if self._get_output_format(fileobj, options) in VECTOR_FORMATS:
+                    options['dpi'] = dpi
+
+            self._prepare_save()
+            with canvas_pool.canvas(self.figure):
+                self.figure.savefig(fileobj, **options)
+        if self.interactive:
+            import matplotlib.pyplot as plt
+
+            plt.close(self.figure)
+
+    @staticmethod
+    def _get_output_format(fileobj, options):
+        import matplotlib
+
+        output_format = options.get('format')
+        if output_format is None and isinstance(fileobj, (str, os.PathLike)):
+            output_format = os.path.splitext(fileobj)[1][1:]
+        return (output_format or matplotlib.rcParams['savefig.format']).lower()
+
+    def to_bytes(self, format='png'):
+        """
+        Export chart object to bytes without touching the filesystem.
+
+        :param format: Output format, e.g. ``png``, ``svg``, or ``pdf``.
+        :type format: str
+        :rtype: bytes
+        """
+        buffer = io.BytesIO()
+        self.write(buffer, format=format)
+        return buffer.getvalue()
 
     def clear(self):
-        """Clear all chart axes and figures."""
+        """Clear chart figure."""
 
         if self.figure:
-            plt.close(self.figure)
+            self.figure.clear()
+            if self.interactive:
+                import matplotlib.pyplot as plt
 
-        plt.cla()
-        plt.clf()
-        plt.close('all')
+                plt.close(self.figure)
 
     def cache_clear(self):
         """
@@ -0,0 +1,125 @@
+"""
+KomaPy command line interface.
+
+Usage:
+
+.. code-block:: none
+
+    komapy render -j 4 -o reports/ configs/
+    komapy render --output-cache /var/cache/komapy -o reports/ configs/
+    komapy serve --port 8080 --workers 4
+    komapy serve --socket /run/komapy.sock --settings settings.json
+"""
+
+import argparse
+import logging
+import sys
+
+from .conf import settings
+
+
+def render(args):
+    """Render chart config files in parallel."""
+    from .batch import BatchRenderer
+    from .output import OutputCache
+
+    output_cache = None
+    if args.output_cache:
+        output_cache = OutputCache(args.output_cache)
+
+    renderer = BatchRenderer(args.output_dir, jobs=args.jobs,
+                             output_format=args.format, force=args.force,
+                             output_cache=output_cache)
+    results = renderer.run(args.paths)
+    for path, status in results:
+        print('{}: {}'.format(status, path), file=sys.stderr)
+    if output_cache is not None:
+        print('output cache: {hits} hits, {misses} misses'.format(
+            **output_cache.report()), file=sys.stderr)
+
+    failed = [path for path, status in results if status == 'failed']
+    return 1 if failed else 0
+
+
+def serve(args):
+    """Run render server until interrupted."""
+    from .server import RenderServer
+
+    server = RenderServer(host=args.host, port=args.port,
+                          socket_path=args.socket, workers=args.workers,
+                          cache_ttl=args.cache_ttl)
+    server.warmup()
+    print('Serving on {}'.format(server.address), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def create_parser():
+    """Create command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='komapy',
+        description='Create BPPTKG Monitoring API charts from configs.')
+    parser.add_argument(
+        '--settings', help='Path to JSON settings file, e.g. BMA API key.')
+    parser.add_argument(
+        '-v', '--verbose', action='store_true', help='Show debug logs.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    render_parser = subparsers.add_parser(
+        'render', help='Render chart config files.')
+    render_parser.add_argument(
+        'paths', nargs='+',
+        help='JSON or YAML chart config files or directories of them.')
+    render_parser.add_argument(
+        '-o', '--output-dir', default='.', help='Output directory.')
+    render_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of charts rendered in parallel.')
+    render_parser.add_argument(
+        '-f', '--format', help='Output format, e.g. png, svg, or pdf.')
+    render_parser.add_argument(
+        '--force', action='store_true',
+        help='Render all configs even if their inputs have not changed.')
+    render_parser.add_argument(
+        '--output-cache',
+        help='Directory of rendered outputs keyed by config and data.')
+    render_parser.set_defaults(func=render)
+
+    serve_parser = subparsers.add_parser(
+        'serve', help='Run local render server.')
+    serve_parser.add_argument(
+        '--host', default='127.0.0.1', help='Host to listen on.')
+    serve_parser.add_argument(
+        '--port', type=int, default=8000, help='Port to listen on.')
+    serve_parser.add_argument(
+        '--socket', help='Unix socket path to listen on instead of TCP port.')
+    serve_parser.add_argument(
+        '-w', '--workers', type=int, default=4,
+        help='Number of render workers.')
+    serve_parser.add_argument(
+        '--cache-ttl', type=float, default=60,
+        help='Lifetime of cached resources in seconds. Use 0 to disable.')
+    serve_parser.set_defaults(func=serve)
+
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    if getattr(args, 'func', None) is None:
+        parser.print_help()
+        return 1
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING)
+    if args.settings:
+        settings.from_json_file(args.settings)
+    return args.func(args)
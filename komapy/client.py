@@ -5,11 +5,18 @@ KomaPy data fetcher and reader.
 import json
 import bmaclient
 
+from functools import partial
 from uuid import uuid4
-from six.moves.urllib.parse import urlencode
+from bmaclient.exceptions import APIClientError, APIError
+from bmaclient.request import Request
+from bmaclient.utils import object_from_list
+from six.moves.http_client import responses
+from six.moves.urllib.parse import urlencode, urlparse
 from six.moves.urllib.request import urlopen
 
-from . import exceptions, processing
+from . import exceptions, processing, recorder, transport
+from .governor import acquire_limits
+from .resilience import call_with_resilience
 from .settings import app_settings
 
 
@@ -78,10 +85,102 @@ def set_api_host(name):
     app_settings.BMA_API_HOST = name
 
 
+def _get_bma_request_headers(api):
+    headers = {
+        'User-Agent': '{} Python Client (KomaPy)'.format(api.api_name),
+    }
+    if api.api_key:
+        headers['Authorization'] = 'Api-Key {}'.format(api.api_key)
+    elif api.access_token:
+        headers['Authorization'] = 'Bearer {}'.format(api.access_token)
+    return headers
+
+
+def _prepare_bma_request(api, method, **params):
+    """
+    Prepare BMA API request. Return tuple of API method instance, URL, HTTP
+    method, body, and headers.
+    """
+    instance = method(_return_as_instance=True, **params)
+    url, http_method, body, headers = Request(api).prepare_request(
+        instance.method, instance.path, instance.parameters)
+    headers.update(_get_bma_request_headers(api))
+    return instance, url, http_method, body, headers
+
+
+def _parse_bma_response(api, instance, status, content):
+    """
+    Parse BMA API response the same way as the bmaclient HTTP client,
+    including ``page`` pagination and ``object`` response format.
+    """
+    if status not in (200, 201, 204):
+        raise APIError(str(status), responses.get(status, ''), content)
+
+    content_obj = None
+    if content:
+        try:
+            content_obj = json.loads(content.decode('utf-8'))
+        except ValueError:
+            raise APIClientError(
+                'Unable to parse response, not valid JSON.',
+                status_code=str(status))
+
+    next_url = None
+    previous_url = None
+    if instance.paginates and status == 200 and content_obj:
+        next_url = content_obj['links']['next']
+        previous_url = content_obj['links']['previous']
+        content_obj = content_obj['results']
+
+    if getattr(api, 'format', None) == 'object':
+        content_obj = object_from_list(content_obj)
+    if instance.paginates:
+        return content_obj, next_url, previous_url
+    return content_obj
+
+
+def _fetch_bma_with_timeout(api, method, timeout, **params):
+    """
+    Make a BMA API request using bmaclient HTTP client library with socket
+    timeout, so a hanging request does not keep its thread forever.
+    """
+    import httplib2
+
+    instance, url, http_method, body, headers = _prepare_bma_request(
+        api, method, **params)
+    response, content = httplib2.Http(timeout=timeout).request(
+        url, http_method, body=body, headers=headers)
+    return _parse_bma_response(api, instance, int(response['status']),
+                               content)
+
+
+def _fetch_bma_with_pool(api, method, **params):
+    """
+    Make a BMA API request using pooled keep-alive connection and compressed
+    transfer instead of the bmaclient HTTP client.
+    """
+    instance, url, http_method, _, headers = _prepare_bma_request(
+        api, method, **params)
+    status, _, content = transport.request(
+        url, method=http_method, headers=headers,
+        timeout=app_settings.REQUEST_TIMEOUT)
+    return _parse_bma_response(api, instance, status, content)
+
+
 def fetch_bma_as_dictionary(name, **params):
     """
     Make a request to the BMA API and return data as Python dictionary.
 
+    The request is wrapped with timeout, retries, and hedged requests according
+    to the ``REQUEST_*`` app settings. See :mod:`komapy.resilience`.
+    ``REQUEST_TIMEOUT`` is also set as the socket timeout of the request. Every
+    attempt is rate limited per host and BMA API name before it is sent, so
+    waiting for limits is not counted toward the timeout. See
+    :mod:`komapy.governor`. If ``BMA_HTTP_POOL`` setting is enabled, the
+    request is sent using pooled connection with compressed transfer. See
+    :mod:`komapy.transport`. Responses are recorded or replayed according to
+    the ``RESPONSE_STORE_MODE`` setting. See :mod:`komapy.recorder`.
+
     :param name: BMA API name, e.g. doas, edm, tiltmeter, etc.
     :type name: str
     :param params: BMA field query filtering parameters.
@@ -110,7 +209,18 @@ def fetch_bma_as_dictionary(name, **params):
     method = api.get_fetch_method(name)
     if not method:
         raise exceptions.ChartError('Unknown parameter name {}'.format(name))
-    return method(**params)
+
+    if app_settings.BMA_HTTP_POOL:
+        request = partial(_fetch_bma_with_pool, api, method, **params)
+    elif app_settings.REQUEST_TIMEOUT is not None:
+        request = partial(_fetch_bma_with_timeout, api, method,
+                          app_settings.REQUEST_TIMEOUT, **params)
+    else:
+        request = partial(method, **params)
+    limits = partial(acquire_limits, host=api.host, name=name)
+    return recorder.fetch_with_store(
+        'bma', name, params,
+        partial(call_with_resilience, name, request, limits=limits))
 
 
 def fetch_bma_as_dataframe(name, **params):
@@ -132,6 +242,13 @@ def fetch_url_as_dictionary(url, **params):
     """
     Make a request to the URL and return data as Python dictionary.
 
+    The request is wrapped with timeout, retries, and hedged requests according
+    to the ``REQUEST_*`` app settings. Latency is recorded and rate limited
+    per URL host name.
+    HTTP and HTTPS URLs are requested using pooled connection with compressed
+    transfer. See :mod:`komapy.transport`. Responses are recorded or replayed
+    according to the ``RESPONSE_STORE_MODE`` setting.
+
     :param url: URL that returns JSON data.
     :type url: str
     :param params: URL query filtering parameters.
@@ -145,10 +262,22 @@ def fetch_url_as_dictionary(url, **params):
         query_params=full_query_params
     )
 
-    with urlopen(full_url_with_params) as content:
-        data = json.loads(content.read().decode('utf-8'))
+    def request():
+        timeout = app_settings.REQUEST_TIMEOUT
+
+        if urlparse(url).scheme.lower() in ('http', 'https'):
+            content = transport.get(full_url_with_params, timeout=timeout)
+            return json.loads(content.decode('utf-8'))
+
+        options = {} if timeout is None else {'timeout': timeout}
+        with urlopen(full_url_with_params, **options) as content:
+            return json.loads(content.read().decode('utf-8'))
 
-    return data
+    host = urlparse(url).netloc or url
+    return recorder.fetch_with_store(
+        'url', url, params,
+        partial(call_with_resilience, host, request,
+                limits=partial(acquire_limits, host=host)))
 
 
 def fetch_url_as_dataframe(url, **params):
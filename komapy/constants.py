@@ -69,6 +69,46 @@ SUPPORTED_TYPES = {
     'xcorr': 'xcorr',
 }
 
+# Plot types whose data can be swapped in place using Line2D.set_data().
+SWAPPABLE_TYPES = [
+    'line',
+    'plot',
+    'plot_date',
+    'step',
+    'log',
+    'loglog',
+    'semilogx',
+    'semilogy',
+]
+
+# Output formats whose figure is saved as vector graphics.
+VECTOR_FORMATS = [
+    'eps',
+    'pdf',
+    'pgf',
+    'ps',
+    'svg',
+    'svgz',
+]
+
+# Figure options that are only supported by pyplot figure function.
+PYPLOT_FIGURE_OPTIONS = [
+    'num',
+    'clear',
+]
+
+# Layout options that are passed to the figure subplots method. The rest of
+# layout options are passed to the figure constructor.
+SUBPLOTS_OPTIONS = [
+    'sharex',
+    'sharey',
+    'squeeze',
+    'subplot_kw',
+    'gridspec_kw',
+    'width_ratios',
+    'height_ratios',
+]
+
 SUPPORTED_CUSTOMIZERS = {
     # Appearance
     'showgrid': 'grid',
@@ -146,12 +186,15 @@ SUPPORTED_CUSTOMIZERS = {
 
 
 def get_phase_dates():
+    """
+    Get list of activity phase dates. End date of the current phase is set to
+    the current time. Use :func:`komapy.phases.get_phase_registry` to look up
+    phases in a time range.
+    """
+    from .phases import get_phase_registry
+
+    now = datetime.datetime.now()
     return [
-        [datetime.datetime(2012, 7, 15), datetime.datetime(2018, 5, 11), ''],
-        [datetime.datetime(2018, 5, 11), datetime.datetime(2018, 6, 1), 'II'],
-        [datetime.datetime(2018, 6, 1),  datetime.datetime(2018, 7, 1), 'III'],
-        [datetime.datetime(2018, 7, 1),  datetime.datetime(2018, 8, 12), 'IV'],
-        [datetime.datetime(2018, 8, 12), datetime.datetime(2019, 1, 29), 'V'],
-        [datetime.datetime(2019, 1, 29), datetime.datetime(2019, 9, 22), 'VI'],
-        [datetime.datetime(2019, 9, 22), datetime.datetime.now(), 'VII'],
+        [start, end or now, label]
+        for start, end, label in get_phase_registry().as_list()
     ]
@@ -1,3 +1,13 @@
 class ChartError(Exception):
     """Base chart error exception."""
     pass
+
+
+class FetchError(ChartError):
+    """Raised when a data source cannot be fetched."""
+    pass
+
+
+class FetchTimeoutError(FetchError):
+    """Raised when a data source request exceeds its timeout."""
+    pass
@@ -4,19 +4,24 @@ KomaPy extension plots.
 
 import uuid
 import datetime
+from collections import OrderedDict
 from collections.abc import Callable
 
-from .constants import get_phase_dates
+from bmaclient.exceptions import APIError
+
 from .client import fetch_bma_as_dataframe
 from .decorators import register_as_decorator
 from .exceptions import ChartError
+from .phases import get_phase_registry
 from .processing import dataframe_or_empty
+from .settings import app_settings
 from .utils import generate_random_color, resolve_timestamp
 
 extension_registers = {
     # Legacy names.
     'explosion': {
         'resolver': 'plot_explosion_line',
+        'query': 'explosion_query',
         'label': '',
     },
     'dome': {
@@ -27,6 +32,7 @@ extension_registers = {
     # Register all functions with namespace prefix.
     'komapy.extensions.plot_explosion_line': {
         'resolver': 'plot_explosion_line',
+        'query': 'explosion_query',
         'label': '',
     },
     'komapy.extensions.plot_dome_appearance': {
@@ -43,6 +49,7 @@ extension_registers = {
     },
     'komapy.extensions.plot_event_label': {
         'resolver': 'plot_event_label',
+        'query': 'event_query',
     },
 }
 
@@ -52,6 +59,12 @@ def register_extension(name, resolver, **kwargs):
     """
     Register extension plot function to the supported extensions data.
 
+    Set optional ``query`` keyword to a callable that takes ``starttime``,
+    ``endtime``, and extension options, and returns data source config, e.g.
+    ``{'name': 'bulletin', 'query_params': {...}}``. The chart fetches the data
+    once for every unique source and passes it to the resolver as ``data``
+    keyword argument.
+
     :param name: Name of extension register.
     :type name: str
     :param resolver: Extension callable resolver function.
@@ -72,7 +85,166 @@ def unregister_extension(name):
     return extension_registers.pop(name, None)
 
 
-def plot_explosion_line(axis, starttime, endtime, **options):
+def fetch_extension_data(source):
+    """
+    Fetch extension data from data source config.
+
+    Random ``rv`` query parameter is appended to the request to ignore BMA API
+    server cache.
+
+    :param source: Data source config containing ``name`` and ``query_params``.
+    :type source: dict
+    :return: :class:`pandas.DataFrame` of resolved BMA API data.
+    :rtype: :class:`pandas.DataFrame`
+    """
+    params = dict(source.get('query_params', {}))
+    params.update(rv=uuid.uuid4().hex)
+    return fetch_bma_as_dataframe(source['name'], **params)
+
+
+def bulletin_query(starttime, endtime, eventtype):
+    """
+    Build seismic bulletin data source config of event type in time range.
+    """
+    date_format = r'%Y-%m-%d %H:%M:%S'
+
+    return {
+        'name': 'bulletin',
+        'query_params': {
+            'eventtype': eventtype,
+            'nolimit': True,
+            'eventdate__gte': starttime.strftime(date_format),
+            'eventdate__lt': endtime.strftime(date_format),
+        }
+    }
+
+
+def get_bulletin_group_key(source):
+    """
+    Get key of seismic bulletin data source that can be fetched together with
+    other sources of the same key, i.e. bulletin query in the same time range
+    with different event type. Return None if the source cannot be batched.
+    """
+    params = source.get('query_params', {})
+    if source.get('name') != 'bulletin' or not params.get('eventtype'):
+        return None
+    return tuple(sorted(
+        (key, str(value)) for key, value in params.items()
+        if key != 'eventtype'
+    ))
+
+
+def group_extension_sources(sources):
+    """
+    Group extension data sources. Seismic bulletin sources that only differ in
+    event type are grouped together. Other sources are kept in their own
+    group.
+
+    :param sources: List of extension data source configs.
+    :type sources: list
+    :return: List of source groups in order of their first source.
+    :rtype: list
+    """
+    groups = OrderedDict()
+    for index, source in enumerate(sources):
+        key = get_bulletin_group_key(source)
+        if key is None or not app_settings.BULLETIN_BATCH_QUERY:
+            key = index
+        groups.setdefault(key, []).append(source)
+    return list(groups.values())
+
+
+def bulletin_batch_query(sources):
+    """
+    Build seismic bulletin data source config of all event types in the
+    sources using ``eventtype__in`` filter.
+    """
+    eventtypes = []
+    for source in sources:
+        eventtype = source['query_params']['eventtype']
+        if eventtype not in eventtypes:
+            eventtypes.append(eventtype)
+
+    params = dict(sources[0]['query_params'])
+    del params['eventtype']
+    params['eventtype__in'] = ','.join(eventtypes)
+    return {
+        'name': 'bulletin',
+        'query_params': params,
+    }
+
+
+def split_bulletin_data(data, sources):
+    """
+    Split seismic bulletin data by event type of each source.
+
+    :param data: Bulletin data of all event types.
+    :type data: :class:`pandas.DataFrame`
+    :param sources: List of bulletin data source configs.
+    :type sources: list
+    :return: List of bulletin data in the same order as sources, or None if
+             the data has no ``eventtype`` column.
+    :rtype: list
+    """
+    if data.empty:
+        return [data.copy() for _ in sources]
+    if 'eventtype' not in data.columns:
+        return None
+
+    return [
+        data[data['eventtype'] == source['query_params']['eventtype']]
+        .reset_index(drop=True)
+        for source in sources
+    ]
+
+
+def fetch_batched_extension_data(sources, fetch=fetch_extension_data):
+    """
+    Fetch data of grouped extension sources.
+
+    Seismic bulletin sources of different event types are fetched in a single
+    request using ``eventtype__in`` filter, and the result is split per event
+    type locally. If the server rejects the filter, or the result cannot be
+    split by event type, each source is fetched separately.
+
+    :param sources: List of extension data source configs returned by
+                    :func:`group_extension_sources`.
+    :type sources: list
+    :param fetch: Function to fetch a single data source.
+    :type fetch: :class:`collections.Callable`
+    :return: List of data in the same order as sources.
+    :rtype: list
+    """
+    if len(sources) > 1:
+        try:
+            data = fetch(bulletin_batch_query(sources))
+        except APIError:
+            data = None
+        if data is not None:
+            result = split_bulletin_data(data, sources)
+            if result is not None:
+                return result
+    return [fetch(source) for source in sources]
+
+
+def explosion_query(starttime, endtime, **options):
+    """
+    Build data source config of Merapi explosion events.
+    """
+    return bulletin_query(starttime, endtime, 'EXPLOSION')
+
+
+def event_query(starttime, endtime, **options):
+    """
+    Build data source config of event type in the ``eventtype`` option.
+    """
+    eventtype = options.get('eventtype', '')
+    if not eventtype:
+        raise ChartError("Option 'eventtype' is required to plot event label.")
+    return bulletin_query(starttime, endtime, eventtype)
+
+
+def plot_explosion_line(axis, starttime, endtime, data=None, **options):
     """
     Plot Merapi explosion line on current axis.
 
@@ -80,16 +252,9 @@ def plot_explosion_line(axis, starttime, endtime, **options):
     are treated as local timezone, i.e. Asia/Jakarta.
     """
     handle = None
-    date_format = r'%Y-%m-%d %H:%M:%S'
 
-    params = {
-        'eventtype': 'EXPLOSION',
-        'nolimit': True,
-        'eventdate__gte': starttime.strftime(date_format),
-        'eventdate__lt': endtime.strftime(date_format),
-        'request_id': uuid.uuid4().hex
-    }
-    data = fetch_bma_as_dataframe('bulletin', **params)
+    if data is None:
+        data = fetch_extension_data(explosion_query(starttime, endtime))
 
     eventdate = resolve_timestamp(dataframe_or_empty(data, 'eventdate'))
     if eventdate.empty:
@@ -237,15 +402,13 @@ def plot_activity_phases_vertical_line(axis, starttime, endtime, **options):
     start = starttime.replace(tzinfo=None)
     end = endtime.replace(tzinfo=None)
 
-    PHASE_DATES = get_phase_dates()
-    for item in PHASE_DATES:
-        if item[0] >= start and item[0] <= end:
-            axis.axvline(item[0], **style)
+    for timestamp in get_phase_registry().get_boundaries(start, end):
+        axis.axvline(timestamp, **style)
 
     return handle
 
 
-def plot_event_label(axis, starttime, endtime, **options):
+def plot_event_label(axis, starttime, endtime, data=None, **options):
     """
     Plot event label on current axis.
 
@@ -265,7 +428,6 @@ def plot_event_label(axis, starttime, endtime, **options):
     ``eventtype`` and ``random_color`` are generated automatically on runtime.
     """
     handle = None
-    date_format = date_format = r'%Y-%m-%d %H:%M:%S'
 
     eventtype = options.get('eventtype', '')
     if not eventtype:
@@ -278,14 +440,9 @@ def plot_event_label(axis, starttime, endtime, **options):
     if options.get('style'):
         style = options.get('style')
 
-    params = {
-        'eventtype': eventtype,
-        'nolimit': True,
-        'eventdate__gte': starttime.strftime(date_format),
-        'eventdate__lt': endtime.strftime(date_format),
-        'rv': uuid.uuid4().hex
-    }
-    data = fetch_bma_as_dataframe('bulletin', **params)
+    if data is None:
+        data = fetch_extension_data(
+            event_query(starttime, endtime, eventtype=eventtype))
 
     eventdate = resolve_timestamp(dataframe_or_empty(data, 'eventdate'))
     if eventdate.empty:
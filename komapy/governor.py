@@ -0,0 +1,317 @@
+"""
+KomaPy request governor.
+
+Governor limits request rate and number of requests in flight per host and
+per BMA API name, process-wide. Every BMA API and URL request of KomaPy, e.g.
+series sources, partial sources, extension data, and ``slope_correction``
+transform, passes through it, so parallel renders do not get throttled by the
+BMA server.
+
+Each limiter is a token bucket with ``rate`` requests per second and
+``burst`` tokens, combined with a semaphore of ``max_in_flight`` concurrent
+requests. Limits are configured using ``REQUEST_RATE_LIMITS`` setting keyed by
+host name and ``BMA_RATE_LIMITS`` setting keyed by BMA API name. Key ``*``
+applies to all hosts or names without their own entry.
+
+Waiting requests are served in priority order, so requests of interactive
+renders go ahead of batch jobs. Priority is taken from the current context and
+is propagated to KomaPy worker threads. Limits are acquired in the requesting
+thread before a request attempt is sent, so time spent waiting for limits is
+not counted toward ``REQUEST_TIMEOUT``.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.conf import settings
+    from komapy.governor import priority
+
+    settings.REQUEST_RATE_LIMITS = {
+        'bma.cendana15.com': {'rate': 10, 'burst': 20, 'max_in_flight': 8},
+    }
+    settings.BMA_RATE_LIMITS = {
+        'seismicity': {'max_in_flight': 2},
+    }
+
+    with priority('batch'):
+        chart.render()
+"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from .exceptions import ChartError
+from .settings import app_settings
+
+PRIORITIES = {
+    'interactive': 0,
+    'normal': 1,
+    'batch': 2,
+}
+
+DEFAULT_PRIORITY = 'normal'
+
+_priority = contextvars.ContextVar('komapy_priority', default=None)
+
+limiters = {}
+
+_limiters_lock = threading.Lock()
+
+
+def get_priority():
+    """Get request priority name of the current context."""
+    return _priority.get() or DEFAULT_PRIORITY
+
+
+@contextmanager
+def priority(name):
+    """
+    Set request priority within the context.
+
+    :param name: Priority name, i.e. ``interactive``, ``normal``, or
+                 ``batch``.
+    :type name: str
+    """
+    if name not in PRIORITIES:
+        raise ChartError('Unknown request priority {}'.format(name))
+
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def bind_context(func):
+    """
+    Bind function to a copy of the current context, so request priority is
+    kept when the function is run in another thread.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+class RateLimiter(object):
+    """
+    Token bucket rate limiter with maximum number of requests in flight.
+
+    :param rate: Number of requests per second. If None, rate is unlimited.
+    :type rate: float
+    :param burst: Bucket size, i.e. number of requests that can be sent at
+                  once. Default to ``rate`` or 1, whichever is greater.
+    :type burst: int
+    :param max_in_flight: Maximum number of concurrent requests. If None,
+                          concurrency is unlimited.
+    :type max_in_flight: int
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate or 1)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.num_acquired = 0
+        self.total_wait = 0.0
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        if self.rate:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _get_wait_time(self):
+        # Must be called with the condition lock held. Return 0 if a request
+        # can be sent now, seconds until the next token, or None if the
+        # request waits for a request in flight to finish.
+        if (self.max_in_flight is not None and
+                self.in_flight >= self.max_in_flight):
+            return None
+        if not self.rate or self._tokens >= 1:
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _take(self, start):
+        # Must be called with the condition lock held.
+        if self.rate:
+            self._tokens -= 1
+        self.in_flight += 1
+        self.num_acquired += 1
+        self.total_wait += time.monotonic() - start
+
+    def acquire(self, priority=DEFAULT_PRIORITY, blocking=True):
+        """
+        Wait until a request can be sent. Waiting requests are served in
+        priority order, then in arrival order.
+
+        :param priority: Priority name.
+        :type priority: str
+        :param blocking: If False, do not wait. Request is only sent if no
+                         other request is waiting and limits allow it now.
+        :type blocking: bool
+        :return: True if limiter is acquired. Otherwise, False.
+        :rtype: bool
+        """
+        start = time.monotonic()
+        entry = (PRIORITIES[priority], next(self._counter))
+
+        with self._condition:
+            if not blocking:
+                self._refill(start)
+                if self._waiters or self._get_wait_time() != 0:
+                    return False
+                self._take(start)
+                return True
+
+            heapq.heappush(self._waiters, entry)
+            while True:
+                timeout = None
+                if self._waiters[0] == entry:
+                    self._refill(time.monotonic())
+                    timeout = self._get_wait_time()
+                    if timeout == 0:
+                        heapq.heappop(self._waiters)
+                        self._take(start)
+                        self._condition.notify_all()
+                        return True
+                self._condition.wait(timeout)
+
+    def release(self):
+        """Mark request as finished."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def limit(self, priority=DEFAULT_PRIORITY):
+        """Acquire limiter within the context."""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def as_dict(self):
+        """Export limiter state and statistics as dictionary object."""
+        with self._condition:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.in_flight,
+                'waiting': len(self._waiters),
+                'acquired': self.num_acquired,
+                'total_wait': self.total_wait,
+            }
+
+
+def get_limiter(kind, key):
+    """
+    Get process-wide limiter of host or BMA API name. Limiter is recreated if
+    its settings have changed.
+
+    :param kind: Limiter kind, i.e. ``host`` or ``name``.
+    :type kind: str
+    :param key: Host name or BMA API name.
+    :type key: str
+    :return: Rate limiter, or None if there is no limit.
+    :rtype: :class:`komapy.governor.RateLimiter`
+    """
+    if kind == 'host':
+        settings = app_settings.REQUEST_RATE_LIMITS or {}
+    else:
+        settings = app_settings.BMA_RATE_LIMITS or {}
+
+    options = settings.get(key, settings.get('*'))
+    if not options:
+        return None
+
+    options = (options.get('rate'), options.get('burst'),
+               options.get('max_in_flight'))
+    with _limiters_lock:
+        item = limiters.get((kind, key))
+        if item is None or item[0] != options:
+            item = (options, RateLimiter(*options))
+            limiters[(kind, key)] = item
+        return item[1]
+
+
+def reset_limiters():
+    """Remove all limiters."""
+    with _limiters_lock:
+        limiters.clear()
+
+
+def acquire_limits(host=None, name=None, blocking=True):
+    """
+    Wait until a request can be sent within limits of its host and BMA API
+    name. Limiters are acquired in the calling thread using priority of the
+    current context.
+
+    :param host: Request host name.
+    :type host: str
+    :param name: BMA API name.
+    :type name: str
+    :param blocking: If False, do not wait for limits.
+    :type blocking: bool
+    :return: Callable without arguments that releases acquired limiters, or
+             None if ``blocking`` is False and limits do not allow the request
+             now.
+    :rtype: :class:`collections.Callable`
+    """
+    current = []
+    if name:
+        current.append(get_limiter('name', name))
+    if host:
+        current.append(get_limiter('host', host))
+    current = [limiter for limiter in current if limiter is not None]
+
+    request_priority = get_priority()
+    acquired = []
+
+    def release():
+        for limiter in reversed(acquired):
+            limiter.release()
+        del acquired[:]
+
+    try:
+        for limiter in current:
+            if not limiter.acquire(request_priority, blocking=blocking):
+                release()
+                return None
+            acquired.append(limiter)
+    except BaseException:
+        release()
+        raise
+    return release
+
+
+def call_with_limits(func, host=None, name=None):
+    """
+    Call request function within limits of its host and BMA API name.
+
+    :param func: Callable without arguments that performs the request.
+    :type func: :class:`collections.Callable`
+    :param host: Request host name.
+    :type host: str
+    :param name: BMA API name.
+    :type name: str
+    :return: Return value of the request function.
+    """
+    release = acquire_limits(host=host, name=name)
+    try:
+        return func()
+    finally:
+        release()
@@ -0,0 +1,149 @@
+"""
+KomaPy chart group.
+
+Chart group renders multiple charts over one shared data fetch. Data sources
+of all series and extension plots of all charts are gathered from chart
+execution plans and deduplicated, so a source shared by many charts, e.g. the
+same seismicity query with different styling, is fetched once. Unique sources
+are fetched concurrently before the charts are rendered.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.group import ChartGroup
+
+    group = ChartGroup([seismicity_config, rfap_config, edm_config])
+    group.render()
+    group.save(['seismicity.png', 'rfap.png', 'edm.png'])
+
+    print(group.report())
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .chart import Chart
+from .exceptions import ChartError
+from .governor import bind_context
+from .settings import app_settings
+
+
+class ChartGroup(object):
+    """
+    A chart group object.
+
+    :param configs: List of KomaPy chart configs.
+    :type configs: list
+    :param max_workers: Number of threads used to fetch data sources. Default
+                        to ``RESOLVE_MAX_WORKERS`` setting.
+    :type max_workers: int
+    :param chart_class: Chart class to instantiate.
+    :type chart_class: :class:`komapy.chart.Chart`
+    """
+
+    def __init__(self, configs, max_workers=None, chart_class=Chart):
+        self.max_workers = max_workers
+        self.charts = [chart_class(config) for config in configs]
+        self.resources = None
+        self.num_requested = 0
+        self.num_fetched = 0
+
+    def __len__(self):
+        return len(self.charts)
+
+    def __iter__(self):
+        return iter(self.charts)
+
+    def fetch(self):
+        """
+        Fetch unique data sources of all charts concurrently.
+
+        :return: Dictionary of fetched resources keyed by plan node key.
+        :rtype: dict
+        """
+        nodes = OrderedDict()
+        requested = 0
+        for chart in self.charts:
+            chart._start_deadline()
+            plan = chart.plan
+            fetch_nodes = plan.get_nodes('fetch')
+            # Sources merged within a chart plan are requested by more than
+            # one series or extension plot.
+            requested += len(fetch_nodes) + plan.num_merged
+            for node in fetch_nodes:
+                nodes.setdefault(node.key, node)
+
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = app_settings.RESOLVE_MAX_WORKERS
+
+        nodes = list(nodes.values())
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(bind_context(node.run), {}) for node in nodes
+            ]
+            results = [future.result() for future in futures]
+
+        self.resources = dict(
+            (node.key, result) for node, result in zip(nodes, results))
+        self.num_requested = requested
+        self.num_fetched = len(nodes)
+        return self.resources
+
+    def render(self):
+        """
+        Render all charts. Data sources are fetched first if they are not
+        fetched yet.
+
+        :return: List of rendered charts.
+        :rtype: list
+        """
+        if self.resources is None:
+            self.fetch()
+
+        for chart in self.charts:
+            resources = dict(
+                (node.key, self.resources[node.key])
+                for node in chart.plan.get_nodes('fetch')
+            )
+            chart._render_cache.clear()
+            chart._render(resources)
+        return self.charts
+
+    def save(self, filenames):
+        """
+        Export all charts to files. Charts are rendered first if they are not
+        rendered yet.
+
+        :param filenames: List of file names in the same order as chart
+                          configs.
+        :type filenames: list
+        """
+        if len(filenames) != len(self.charts):
+            raise ChartError(
+                'Number of file names must match number of charts')
+
+        if any(chart.figure is None for chart in self.charts):
+            self.render()
+        for chart, filename in zip(self.charts, filenames):
+            chart.save(filename)
+
+    def report(self):
+        """
+        Report number of requested, fetched, and saved fetches.
+
+        :rtype: dict
+        """
+        return {
+            'charts': len(self.charts),
+            'requested': self.num_requested,
+            'fetched': self.num_fetched,
+            'saved': self.num_requested - self.num_fetched,
+        }
+
+    def clear(self):
+        """Clear figures of all charts and fetched resources."""
+        for chart in self.charts:
+            chart.clear()
+        self.resources = None
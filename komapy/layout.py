@@ -2,8 +2,9 @@
 KomaPy chart layout.
 """
 
+from .constants import SUBPLOTS_OPTIONS
 from .exceptions import ChartError
-from .utils import get_validation_methods
+from .utils import get_validators
 
 
 class Layout(object):
@@ -15,6 +16,16 @@ class Layout(object):
         self.data = kwargs.get('data', [])
         self.options = kwargs.get('options', {})
 
+    def get_subplots_options(self):
+        """Get layout options that are passed to the figure subplots."""
+        return dict((key, value) for key, value in self.options.items()
+                    if key in SUBPLOTS_OPTIONS)
+
+    def get_figure_options(self):
+        """Get layout options that are passed to the figure constructor."""
+        return dict((key, value) for key, value in self.options.items()
+                    if key not in SUBPLOTS_OPTIONS)
+
     def validate_size(self):
         """Validate layout size attribute."""
         if self.type == 'grid':
@@ -46,7 +57,5 @@ class Layout(object):
 
     def validate(self):
         """Validate all config attributes."""
-        validation_methods = get_validation_methods(Layout)
-
-        for method in validation_methods:
-            getattr(self, method)()
+        for validator in get_validators(Layout):
+            validator(self)
@@ -0,0 +1,162 @@
+"""
+KomaPy live monitoring mode.
+
+Live chart draws the chart once, caches static pieces like activity status
+spans, phase lines, grid, and labels as background, and then periodically
+appends new samples using :meth:`komapy.chart.Chart.update`. Only series
+artists are redrawn on top of the cached background using matplotlib
+blitting. Full redraw only happens if axes limits change or the window is
+resized. Set fixed axis limits, e.g. using ``xlimit`` and ``ylimit`` series
+options, to keep every update on the fast blitting path.
+
+Series artists are marked as animated while live mode is running, so call
+:meth:`LiveChart.stop` before saving the chart to file. Set ``interactive``
+chart option to show the chart in a pyplot window.
+
+Example:
+
+.. code-block:: python
+
+    import matplotlib.pyplot as plt
+
+    from komapy import Chart
+    from komapy.live import LiveChart
+
+    chart = Chart(dict(config, interactive=True))
+    live = LiveChart(chart, interval=500)
+    live.start()
+    plt.show()
+"""
+
+from .exceptions import ChartError
+
+
+class LiveChart(object):
+    """
+    A live chart object.
+
+    :param chart: KomaPy chart instance. It is rendered on start if it is not
+                  rendered yet.
+    :type chart: :class:`komapy.chart.Chart`
+    :param interval: Update interval in milliseconds.
+    :type interval: int
+    """
+
+    def __init__(self, chart, interval=1000):
+        self.chart = chart
+        self.interval = interval
+        self.timer = None
+        self.background = None
+        self.num_updates = 0
+        self.num_full_draws = 0
+
+        self._draw_cid = None
+        self._artists = []
+
+    @property
+    def canvas(self):
+        return self.chart.figure.canvas
+
+    def _get_view_limits(self):
+        return [
+            (tuple(axis.get_xlim()), tuple(axis.get_ylim()))
+            for axis in self.chart.figure.get_axes()
+        ]
+
+    def _on_draw(self, event):
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self.background = self.canvas.copy_from_bbox(
+            self.chart.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.chart.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def setup(self):
+        """
+        Render chart if necessary, mark series artists as animated, and cache
+        static background.
+        """
+        if self.chart.figure is None:
+            self.chart.render()
+
+        self._artists = [
+            artist
+            for _, _, artists in self.chart._series_artists
+            if artists is not None
+            for artist in artists
+            if hasattr(artist, 'set_animated')
+        ]
+        if not self._artists:
+            raise ChartError('Live chart requires at least one plotted series')
+
+        for artist in self._artists:
+            artist.set_animated(True)
+
+        if self._draw_cid is None:
+            self._draw_cid = self.canvas.mpl_connect(
+                'draw_event', self._on_draw)
+        self.full_draw()
+
+    def full_draw(self):
+        """Redraw whole figure and cache the new background."""
+        self.num_full_draws += 1
+        self.canvas.draw()
+        if self.background is None:
+            self._on_draw(None)
+
+    def blit(self):
+        """Redraw series artists on top of the cached background."""
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.chart.figure.bbox)
+        self.canvas.flush_events()
+
+    def step(self):
+        """
+        Append new samples and redraw changed artists.
+
+        :return: List of updated artists.
+        :rtype: list
+        """
+        if self.background is None:
+            self.setup()
+
+        limits = self._get_view_limits()
+        updated = self.chart.update()
+        self.num_updates += 1
+        if not updated:
+            return updated
+
+        if self._get_view_limits() != limits:
+            self.full_draw()
+        else:
+            self.blit()
+        return updated
+
+    def start(self):
+        """Start periodic updates using the canvas timer."""
+        if self.background is None:
+            self.setup()
+
+        if self.timer is None:
+            self.timer = self.canvas.new_timer(interval=self.interval)
+            self.timer.add_callback(self.step)
+        self.timer.start()
+
+    def stop(self):
+        """Stop periodic updates and restore artists to normal drawing."""
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+
+        if self._draw_cid is not None:
+            self.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+
+        for artist in self._artists:
+            artist.set_animated(False)
+        self.background = None
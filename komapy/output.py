@@ -0,0 +1,190 @@
+"""
+KomaPy output cache.
+
+Output cache stores rendered chart files keyed by a fingerprint of the chart
+config, output format, and fetched resources. If a chart is saved and neither
+its config nor its data have changed since the output was stored, the cached
+file is copied or hard linked to the target file name and the chart is not
+plotted at all.
+
+Resources are still fetched to compute the key, so output cache saves
+plotting and export time, not request time. Combine it with ``use_cache`` or a
+response store to save both.
+
+Example:
+
+.. code-block:: python
+
+    from komapy import Chart
+    from komapy.output import OutputCache
+
+    output_cache = OutputCache('/var/cache/komapy')
+
+    chart = Chart(config, output_cache=output_cache)
+    chart.save('RB2.png')
+
+    print(output_cache.report())
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from .cache import create_digest
+
+
+def create_config_fingerprint(config):
+    """
+    Create fingerprint of normalized chart config. Dictionary keys are sorted,
+    so configs that only differ in key order have the same fingerprint.
+    Callables are identified by their qualified name, so fingerprint is stable
+    across processes, see :func:`komapy.cache.canonicalize`.
+
+    :param config: KomaPy chart config.
+    :type config: dict
+    :rtype: str
+    """
+    return create_digest(config)
+
+
+def create_resource_fingerprint(resource):
+    """
+    Create fingerprint of fetched resource. Data frame is hashed by its
+    columns, dtypes, index, and values. Dictionary of resources, e.g. result of
+    batched extension fetch, is hashed item by item.
+
+    :param resource: Fetched resource, usually :class:`pandas.DataFrame`.
+    :rtype: str
+    """
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    if isinstance(resource, dict):
+        for key, value in resource.items():
+            digest.update(repr(key).encode('utf-8'))
+            digest.update(create_resource_fingerprint(value).encode('utf-8'))
+    elif isinstance(resource, pd.DataFrame):
+        digest.update(repr(list(resource.columns)).encode('utf-8'))
+        digest.update(repr(list(resource.dtypes)).encode('utf-8'))
+        try:
+            values = pd.util.hash_pandas_object(resource, index=True)
+            digest.update(values.to_numpy().tobytes())
+        except TypeError:
+            # Columns of unhashable objects, e.g. lists.
+            digest.update(resource.to_json(
+                date_format='iso', default_handler=str).encode('utf-8'))
+    else:
+        digest.update(repr(resource).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def create_output_key(config, output_format, resources):
+    """
+    Create output cache key.
+
+    :param config: KomaPy chart config.
+    :type config: dict
+    :param output_format: Output format, e.g. ``png``.
+    :type output_format: str
+    :param resources: List of fetched resources.
+    :type resources: list
+    :rtype: str
+    """
+    import matplotlib
+
+    return create_digest([
+        matplotlib.__version__,
+        output_format,
+        create_config_fingerprint(config),
+        [create_resource_fingerprint(resource) for resource in resources],
+    ])
+
+
+class OutputCache(object):
+    """
+    Content-addressed store of rendered chart files.
+
+    :param directory: Cache directory.
+    :type directory: str
+    :param link: If True, cached files are hard linked to the target file name
+                 instead of copied. Falls back to copy if linking fails, e.g.
+                 across file systems. Linked files share their content with
+                 the cache, so do not modify them in place.
+    :type link: bool
+    """
+
+    def __init__(self, directory, link=False):
+        self.directory = directory
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_path(self, key, output_format):
+        """Get cached file path of output key."""
+        return os.path.join(self.directory, key[:2],
+                            '{}.{}'.format(key, output_format))
+
+    def restore(self, key, output_format, filename):
+        """
+        Copy or link cached file to target file name.
+
+        :return: True if cached file is found. Otherwise, False.
+        :rtype: bool
+        """
+        path = self.get_path(key, output_format)
+        if not os.path.exists(path):
+            with self._lock:
+                self.misses += 1
+            return False
+
+        if os.path.abspath(path) != os.path.abspath(filename):
+            if os.path.lexists(filename):
+                os.remove(filename)
+            linked = False
+            if self.link:
+                try:
+                    os.link(path, filename)
+                    linked = True
+                except OSError:
+                    pass
+            if not linked:
+                shutil.copyfile(path, filename)
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, output_format, filename):
+        """Store rendered file in the cache atomically."""
+        path = self.get_path(key, output_format)
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(filename, temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def clear(self):
+        """Remove all cached files."""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def report(self):
+        """
+        Report number of cache hits and misses.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,221 @@
+"""
+KomaPy activity phases.
+
+Activity phases of Merapi volcano are kept in a phase registry backed by
+sorted arrays of phase start and end dates, so phases and phase boundaries in
+a time range are looked up using binary search without scanning or copying
+the whole phase list. Activity phase add-ons and extension plots share a
+single registry that is loaded once per process.
+
+Registry is loaded from ``ACTIVITY_PHASES`` setting. Set it to a list of
+``[starttime, endtime, label]`` entries, or to a path of JSON file containing
+such list. Date strings are parsed as naive datetimes. Set ``endtime`` of the
+current phase to None to keep it open. If the setting is not set, built-in
+phases are used.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.conf import settings
+    from komapy.phases import get_phase_registry
+
+    settings.ACTIVITY_PHASES = '/etc/komapy/phases.json'
+
+    registry = get_phase_registry()
+    registry.add('2021-01-04', None, 'VIII')
+    print(registry.get_phases(starttime, endtime))
+"""
+
+import bisect
+import datetime
+import json
+import threading
+
+from .exceptions import ChartError
+from .settings import app_settings
+
+DEFAULT_PHASES = [
+    ['2012-07-15', '2018-05-11', ''],
+    ['2018-05-11', '2018-06-01', 'II'],
+    ['2018-06-01', '2018-07-01', 'III'],
+    ['2018-07-01', '2018-08-12', 'IV'],
+    ['2018-08-12', '2019-01-29', 'V'],
+    ['2019-01-29', '2019-09-22', 'VI'],
+    ['2019-09-22', None, 'VII'],
+]
+
+_registry = None
+
+_registry_lock = threading.Lock()
+
+
+def to_phase_date(value):
+    """
+    Convert phase date to naive Python datetime. Return None if value is
+    None.
+    """
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+
+    from dateutil import parser
+
+    return parser.parse(value).replace(tzinfo=None)
+
+
+class PhaseRegistry(object):
+    """
+    Registry of activity phases sorted by start date.
+
+    Phases must not overlap each other. Open phase, i.e. phase whose end date
+    is None, lasts until the end of any time range.
+
+    :param phases: List of ``[starttime, endtime, label]`` entries.
+    :type phases: list
+    """
+
+    def __init__(self, phases=None):
+        self._starts = []
+        self._ends = []
+        self._labels = []
+        self._lock = threading.Lock()
+
+        for item in phases or []:
+            self.add(*item)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(self.as_list())
+
+    def add(self, starttime, endtime, label=''):
+        """
+        Add activity phase to the registry.
+
+        :param starttime: Phase start date.
+        :type starttime: str or :class:`datetime.datetime`
+        :param endtime: Phase end date, or None if the phase is still going on.
+        :type endtime: str or :class:`datetime.datetime`
+        :param label: Phase label.
+        :type label: str
+        """
+        start = to_phase_date(starttime)
+        end = to_phase_date(endtime)
+        if start is None:
+            raise ChartError('Activity phase start date is required')
+        if end is None:
+            end = datetime.datetime.max
+        if end < start:
+            raise ChartError(
+                'Activity phase {} ends before it starts'.format(label))
+
+        with self._lock:
+            index = bisect.bisect_right(self._starts, start)
+            overlaps_previous = index > 0 and self._ends[index - 1] > start
+            overlaps_next = (index < len(self._starts) and
+                             self._starts[index] < end)
+            if overlaps_previous or overlaps_next:
+                raise ChartError(
+                    'Activity phase {} overlaps other phase'.format(label))
+
+            self._starts.insert(index, start)
+            self._ends.insert(index, end)
+            self._labels.insert(index, label)
+
+    def _get_range(self, starttime, endtime):
+        # Indices of phases that overlap the time range. Ends are sorted too,
+        # because phases do not overlap.
+        first = bisect.bisect_right(self._ends, starttime)
+        last = bisect.bisect_left(self._starts, endtime)
+        return first, last
+
+    def get_phases(self, starttime, endtime):
+        """
+        Get activity phases that overlap the time range. Phase dates are
+        clipped to the time range.
+
+        :param starttime: Start time of the range.
+        :type starttime: :class:`datetime.datetime`
+        :param endtime: End time of the range.
+        :type endtime: :class:`datetime.datetime`
+        :return: List of ``[starttime, endtime, label]`` entries.
+        :rtype: list
+        """
+        with self._lock:
+            first, last = self._get_range(starttime, endtime)
+            return [
+                [max(self._starts[index], starttime),
+                 min(self._ends[index], endtime),
+                 self._labels[index]]
+                for index in range(first, last)
+            ]
+
+    def get_boundaries(self, starttime, endtime):
+        """
+        Get start dates of activity phases within the time range, inclusive.
+
+        :param starttime: Start time of the range.
+        :type starttime: :class:`datetime.datetime`
+        :param endtime: End time of the range.
+        :type endtime: :class:`datetime.datetime`
+        :rtype: list
+        """
+        with self._lock:
+            first = bisect.bisect_left(self._starts, starttime)
+            last = bisect.bisect_right(self._starts, endtime)
+            return self._starts[first:last]
+
+    def as_list(self):
+        """
+        Export registry as list of ``[starttime, endtime, label]`` entries.
+        End date of open phase is None.
+        """
+        with self._lock:
+            return [
+                [start, None if end == datetime.datetime.max else end, label]
+                for start, end, label in zip(
+                    self._starts, self._ends, self._labels)
+            ]
+
+
+def load_phases(source):
+    """
+    Load activity phase entries from ``ACTIVITY_PHASES`` setting value.
+
+    :param source: List of phase entries or path to JSON file. If None,
+                   built-in phases are returned.
+    :rtype: list
+    """
+    if source is None:
+        return DEFAULT_PHASES
+    if isinstance(source, str):
+        with open(source) as fd:
+            return json.load(fd)
+    return source
+
+
+def get_phase_registry():
+    """
+    Get process-wide activity phase registry. Registry is loaded on first use
+    and reloaded if ``ACTIVITY_PHASES`` setting has changed.
+
+    :rtype: :class:`komapy.phases.PhaseRegistry`
+    """
+    global _registry
+
+    source = app_settings.ACTIVITY_PHASES
+    with _registry_lock:
+        if _registry is None or _registry[0] is not source:
+            _registry = (source, PhaseRegistry(load_phases(source)))
+        return _registry[1]
+
+
+def reset_phase_registry():
+    """Remove process-wide activity phase registry."""
+    global _registry
+
+    with _registry_lock:
+        _registry = None
@@ -0,0 +1,361 @@
+"""
+KomaPy execution plan.
+
+Chart config is compiled into an execution plan, a directed acyclic graph of
+``fetch``, ``resolve``, ``aggregate``, ``transform``, and ``plot`` nodes.
+Series that read the same data source share a single fetch node, so different
+fields of the same BMA query plotted on different subplots are fetched once
+per render, even if ``use_cache`` is disabled. Data of extension plots are
+fetched by fetch nodes too. Seismic bulletin sources of extension plots that
+only differ in event type share a single batched fetch node.
+
+Plan is compiled once per chart and reused on every render. Nodes are kept in
+topological order, i.e. every node comes after its inputs. Plot nodes have no
+function attached; they are drawn by the chart using data of their input node.
+
+If a fetch node misses its deadline, its result is a :class:`Placeholder`, and
+so are the results of all nodes that depend on it. Other nodes are executed
+normally.
+
+Example:
+
+.. code-block:: python
+
+    from komapy import Chart
+
+    chart = Chart(config)
+    print(chart.plan.describe())
+"""
+
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .cache import ResolverCache
+from .exceptions import ChartError, FetchTimeoutError
+from .governor import bind_context
+
+NODE_KINDS = ('fetch', 'resolve', 'aggregate', 'transform', 'plot')
+
+
+class Placeholder(object):
+    """
+    Result of plan node whose data source missed its deadline.
+
+    :param label: Label of the fetch node that timed out.
+    :type label: str
+    :param error: Timeout error.
+    :type error: :class:`komapy.exceptions.FetchTimeoutError`
+    """
+
+    def __init__(self, label, error=None):
+        self.label = label
+        self.error = error
+
+    def __repr__(self):
+        return '<Placeholder {}>'.format(self.label)
+
+
+class PlanNode(object):
+    """
+    A node of execution plan.
+
+    :param kind: Node kind, e.g. ``fetch`` or ``resolve``.
+    :type kind: str
+    :param key: Unique node key.
+    :type key: tuple
+    :param func: Function called with results of input nodes.
+    :type func: callable
+    :param inputs: List of input nodes.
+    :type inputs: list
+    :param label: Human readable node label.
+    :type label: str
+    """
+
+    def __init__(self, kind, key, func=None, inputs=None, label=None):
+        if kind not in NODE_KINDS:
+            raise ChartError('Unknown plan node kind {}'.format(kind))
+
+        self.kind = kind
+        self.key = key
+        self.func = func
+        self.inputs = list(inputs or [])
+        self.label = label or str(key[-1])
+
+    def __repr__(self):
+        return '<PlanNode {} {}>'.format(self.kind, self.label)
+
+    def run(self, results):
+        """
+        Run node function with results of input nodes.
+
+        :param results: Dictionary of node results keyed by node key.
+        :type results: dict
+        :return: Node result, or :class:`Placeholder` if the node or one of
+                 its inputs missed its deadline.
+        """
+        args = [results[item.key] for item in self.inputs]
+        for arg in args:
+            if isinstance(arg, Placeholder):
+                return arg
+        try:
+            return self.func(*args)
+        except FetchTimeoutError as error:
+            return Placeholder(self.label, error)
+
+
+class ExecutionPlan(object):
+    """
+    An execution plan of chart data pipeline.
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.num_merged = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, kind, key, func=None, inputs=None, label=None):
+        """
+        Add node to the plan. If node with the same key exists, existing node
+        is returned and the nodes are merged.
+
+        :rtype: :class:`komapy.plan.PlanNode`
+        """
+        node = self.nodes.get(key)
+        if node is not None:
+            self.num_merged += 1
+            return node
+
+        node = PlanNode(kind, key, func=func, inputs=inputs, label=label)
+        self.nodes[key] = node
+        return node
+
+    def get_nodes(self, kind=None):
+        """
+        Get list of plan nodes.
+
+        :param kind: If set, only nodes of this kind are returned.
+        :type kind: str
+        :rtype: list
+        """
+        return [
+            node for node in self.nodes.values()
+            if kind is None or node.kind == kind
+        ]
+
+    def get_dependencies(self, targets):
+        """
+        Get keys of target nodes and all nodes they depend on.
+
+        :param targets: List of target nodes.
+        :type targets: list
+        :rtype: set
+        """
+        keys = set()
+        stack = list(targets)
+        while stack:
+            node = stack.pop()
+            if node.key not in keys:
+                keys.add(node.key)
+                stack.extend(node.inputs)
+        return keys
+
+    def get_levels(self, kinds=None, targets=None):
+        """
+        Group executable nodes into levels. Nodes of the same level do not
+        depend on each other, so they can be executed concurrently.
+
+        :param kinds: If set, only nodes of these kinds are included.
+        :type kinds: tuple
+        :param targets: If set, only target nodes and nodes they depend on are
+                        included.
+        :type targets: list
+        :rtype: list
+        """
+        keys = None if targets is None else self.get_dependencies(targets)
+        depths = {}
+        levels = []
+        for key, node in self.nodes.items():
+            depth = max([depths[item.key] + 1 for item in node.inputs] or [0])
+            depths[key] = depth
+            if node.func is None:
+                continue
+            if kinds is not None and node.kind not in kinds:
+                continue
+            if keys is not None and key not in keys:
+                continue
+            while len(levels) <= depth:
+                levels.append([])
+            levels[depth].append(node)
+        return [level for level in levels if level]
+
+    def execute(self, nodes=None, kinds=None, max_workers=None,
+                targets=None):
+        """
+        Execute plan nodes in topological order. Each node is executed once
+        and its result is passed to all dependent nodes.
+
+        :param nodes: Dictionary of precomputed node results keyed by node
+                      key. Those nodes are not executed again.
+        :type nodes: dict
+        :param kinds: If set, only nodes of these kinds are executed, e.g.
+                      ``('fetch',)``.
+        :type kinds: tuple
+        :param max_workers: Number of threads used to execute independent
+                            nodes, e.g. fetches of different sources,
+                            concurrently. Nodes are executed in the calling
+                            thread if it is not set.
+        :type max_workers: int
+        :param targets: If set, only target nodes and nodes they depend on are
+                        executed, e.g. plot nodes to skip extension data.
+        :type targets: list
+        :return: Dictionary of node results keyed by node key.
+        :rtype: dict
+        """
+        results = dict(nodes or {})
+        levels = [
+            [node for node in level if node.key not in results]
+            for level in self.get_levels(kinds=kinds, targets=targets)
+        ]
+        if not max_workers or max_workers < 2:
+            for level in levels:
+                for node in level:
+                    results[node.key] = node.run(results)
+            return results
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for level in levels:
+                futures = [
+                    executor.submit(bind_context(node.run), results)
+                    for node in level
+                ]
+                for node, future in zip(level, futures):
+                    results[node.key] = future.result()
+        return results
+
+    def as_dict(self):
+        """Export plan as dictionary object."""
+        return {
+            'nodes': [
+                {
+                    'kind': node.kind,
+                    'label': node.label,
+                    'inputs': [item.label for item in node.inputs],
+                }
+                for node in self.nodes.values()
+            ],
+            'num_merged': self.num_merged,
+        }
+
+    def describe(self):
+        """
+        Describe plan nodes and their inputs in human readable text.
+
+        :rtype: str
+        """
+        lines = []
+        for node in self.nodes.values():
+            line = '{} {}'.format(node.kind, node.label)
+            if node.inputs:
+                line += ' <- {}'.format(
+                    ', '.join(item.label for item in node.inputs))
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def get_source_config(series):
+    """
+    Get data source config of series. Series with equal source configs read
+    the same resource.
+
+    :param series: KomaPy series config instance.
+    :type series: :class:`komapy.series.Series`
+    :rtype: dict
+    """
+    if series.partial:
+        return {
+            'partial': [
+                ResolverCache.get_resolver_cache_config(config_dict)
+                for config_dict in series.partial
+            ],
+            'merge_options': series.merge_options,
+        }
+    return ResolverCache.get_resolver_cache_config(series)
+
+
+def create_source_label(config):
+    """Create fetch node label from data source config."""
+    if not config:
+        return 'none'
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+def compile_plan(chart):
+    """
+    Compile chart config into execution plan.
+
+    :param chart: KomaPy chart instance.
+    :type chart: :class:`komapy.chart.Chart`
+    :rtype: :class:`komapy.plan.ExecutionPlan`
+    """
+    from . import extensions
+
+    plan = ExecutionPlan()
+    for index, (series_id, params) in enumerate(
+            chart._iter_series_params()):
+        series = chart._get_series(series_id, params)
+        label = 'series[{}]'.format(index)
+
+        if isinstance(series.fields, Callable):
+            plan.add('plot', ('plot', series_id), label=label)
+            continue
+
+        source_label = create_source_label(get_source_config(series))
+        fetch = plan.add('fetch', ('fetch', source_label),
+                         partial(chart._fetch_series_resource, series),
+                         label=source_label)
+        node = plan.add('resolve', ('resolve', series_id),
+                        series.select_fields, [fetch], label=label)
+        if series.aggregations:
+            node = plan.add('aggregate', ('aggregate', series_id),
+                            series.aggregate, [node, fetch], label=label)
+        if series.transforms:
+            node = plan.add('transform', ('transform', series_id),
+                            series.transform, [node], label=label)
+        plan.add('plot', ('plot', series_id), inputs=[node], label=label)
+
+    sources = OrderedDict()
+    for source in chart._get_extension_sources():
+        key = ResolverCache.create_key_from_source(source)
+        if key in sources:
+            plan.num_merged += 1
+        sources.setdefault(key, source)
+
+    for group in extensions.group_extension_sources(list(sources.values())):
+        if len(group) == 1:
+            source = group[0]
+            source_label = create_source_label(
+                ResolverCache.get_resolver_cache_config(source))
+            plan.add('fetch',
+                     ('extension',
+                      ResolverCache.create_key_from_source(source)),
+                     partial(chart._fetch_extension_data, source),
+                     label='extension {}'.format(source_label))
+            continue
+
+        # Bulletin sources of different event types are fetched by a single
+        # request, so they count as merged.
+        source_label = create_source_label(
+            ResolverCache.get_resolver_cache_config(
+                extensions.bulletin_batch_query(group)))
+        keys = tuple(
+            ResolverCache.create_key_from_source(source) for source in group)
+        plan.add('fetch', ('extension_batch', keys),
+                 partial(chart._fetch_extension_batch, group),
+                 label='extension {}'.format(source_label))
+        plan.num_merged += len(group) - 1
+    return plan
@@ -6,7 +6,6 @@ from collections.abc import Callable
 
 import numpy as np
 import pandas as pd
-from matplotlib import cm
 
 from .decorators import register_as_decorator
 from .exceptions import ChartError
@@ -25,6 +24,10 @@ supported_aggregations = {
     'pow': 'power'
 }
 
+# Aggregations whose result depends on all preceding samples. On incremental
+# chart updates, their last value is carried forward instead of recomputed.
+cumulative_aggregations = ['cumsum']
+
 
 @register_as_decorator
 def register_aggregation(name, resolver, **kwargs):
@@ -96,6 +99,8 @@ def get_rgb_color(num_sample, index, colormap='tab10'):
     Get RGB color at current index for number of sample from matplotlib
     color map.
     """
+    from matplotlib import cm
+
     space = np.linspace(0, 1, num_sample)
     cmap = cm.get_cmap(colormap)
     return cmap(space[index])
@@ -0,0 +1,200 @@
+"""
+KomaPy response recorder.
+
+It saves responses of :func:`komapy.client.fetch_bma_as_dictionary` and
+:func:`komapy.client.fetch_url_as_dictionary` into a local store keyed by
+source name and query parameters, and serves them back later. Use it to
+profile renders reproducibly without hitting the live BMA API, or as warm-start
+data source if the API is unreachable.
+
+Recorder is configured using ``RESPONSE_STORE`` and ``RESPONSE_STORE_MODE``
+settings. Supported modes are:
+
+- ``record``: fetch live data and save every response to the store.
+- ``replay``: serve responses from the store only. Missing response raises
+  :class:`komapy.exceptions.FetchError`.
+- ``fallback``: fetch and save live data, and serve response from the store if
+  the live request fails.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.conf import settings
+
+    settings.RESPONSE_STORE = '/var/cache/komapy/responses'
+    settings.RESPONSE_STORE_MODE = 'replay'
+
+    # Replay responses using their original latency.
+    settings.RESPONSE_STORE_REPLAY_LATENCY = True
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .cache import create_digest
+from .exceptions import FetchError
+from .settings import app_settings
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that are only used to bypass server cache.
+VOLATILE_PARAMS = ('rv', 'request_id')
+
+SUPPORTED_MODES = ('record', 'replay', 'fallback')
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+re_unsafe_characters = re.compile(r'[^\w.-]+')
+
+
+class ResponseStore(object):
+    """
+    File-based store of fetcher responses.
+
+    Each response is saved as JSON file under ``<path>/<kind>/<name>/`` whose
+    file name is digest of the source name and query parameters.
+
+    :param path: Store root directory.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def create_key(kind, name, params):
+        """
+        Create store key from source kind, name, and query parameters.
+        Volatile cache bypass parameters are ignored.
+        """
+        entry = {
+            'kind': kind,
+            'name': name,
+            'params': dict(
+                (key, value) for key, value in params.items()
+                if key not in VOLATILE_PARAMS),
+        }
+        return create_digest(entry)
+
+    def get_path(self, kind, name, params):
+        """Get file path of stored response."""
+        dirname = re_unsafe_characters.sub('_', name).strip('_') or '_'
+        filename = '{}.json'.format(self.create_key(kind, name, params))
+        return os.path.join(self.path, kind, dirname, filename)
+
+    def save(self, kind, name, params, response, latency=0.0):
+        """
+        Save response to the store. File is written atomically so concurrent
+        readers never see partial content.
+        """
+        path = self.get_path(kind, name, params)
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+
+        entry = {
+            'kind': kind,
+            'name': name,
+            'params': params,
+            'latency': latency,
+            'recorded_at': time.time(),
+            'response': response,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(entry, fp, default=str)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def load(self, kind, name, params):
+        """
+        Load stored entry. Return dictionary containing ``response`` and
+        ``latency`` keys. It raises KeyError if response is not found.
+        """
+        path = self.get_path(kind, name, params)
+        try:
+            with open(path) as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            raise KeyError(path)
+
+    def contains(self, kind, name, params):
+        """Check if response exists in the store."""
+        return os.path.exists(self.get_path(kind, name, params))
+
+
+def get_response_store(path=None):
+    """
+    Get response store instance of path. Default to ``RESPONSE_STORE``
+    setting. Return None if store path is not set.
+
+    :rtype: :class:`komapy.recorder.ResponseStore`
+    """
+    path = path or app_settings.RESPONSE_STORE
+    if not path:
+        return None
+
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = ResponseStore(path)
+            _stores[path] = store
+        return store
+
+
+def fetch_with_store(kind, name, params, fetch):
+    """
+    Fetch response according to the response store mode.
+
+    :param kind: Source kind, e.g. ``bma`` or ``url``.
+    :type kind: str
+    :param name: BMA API name or URL.
+    :type name: str
+    :param params: Query parameters.
+    :type params: dict
+    :param fetch: Callable without arguments that performs live request.
+    :type fetch: :class:`collections.Callable`
+    :return: Live or stored response.
+    """
+    mode = app_settings.RESPONSE_STORE_MODE
+    store = get_response_store()
+    if not mode or store is None:
+        return fetch()
+
+    if mode not in SUPPORTED_MODES:
+        raise ValueError('Unsupported response store mode {}'.format(mode))
+
+    if mode == 'replay':
+        try:
+            entry = store.load(kind, name, params)
+        except KeyError:
+            raise FetchError(
+                'No recorded response of {} with parameters {}'.format(
+                    name, params))
+        if app_settings.RESPONSE_STORE_REPLAY_LATENCY:
+            time.sleep(entry.get('latency', 0))
+        return entry['response']
+
+    start = time.monotonic()
+    try:
+        response = fetch()
+    except Exception:
+        if mode == 'fallback' and store.contains(kind, name, params):
+            logger.warning(
+                'Request to %s failed. Serving recorded response.', name,
+                exc_info=True)
+            return store.load(kind, name, params)['response']
+        raise
+
+    store.save(kind, name, params, response,
+               latency=time.monotonic() - start)
+    return response
@@ -0,0 +1,354 @@
+"""
+KomaPy request resilience layer.
+
+It wraps data fetcher calls with per-request timeout, exponential backoff
+retries, and optional hedged duplicate requests. Latency of every successful
+request is recorded in a histogram per source name so the settings can be
+tuned from real measurements.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.conf import settings
+    from komapy.resilience import get_latency_histogram
+
+    settings.REQUEST_TIMEOUT = 30
+    settings.REQUEST_MAX_RETRIES = 3
+    settings.REQUEST_HEDGE_PERCENTILE = 95
+
+    # Render some charts, then inspect latency of BMA API name edm.
+    histogram = get_latency_histogram('edm')
+    print(histogram.percentile(95))
+"""
+
+import bisect
+import collections
+import http.client
+import random
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from urllib.error import HTTPError, URLError
+
+from .exceptions import FetchTimeoutError
+from .governor import bind_context
+from .settings import app_settings
+
+DEFAULT_BUCKETS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+    float('inf'),
+)
+
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+latency_histograms = {}
+
+_histograms_lock = threading.Lock()
+
+
+class LatencyHistogram(object):
+    """
+    Latency histogram of a single request source.
+
+    It counts samples in fixed buckets (seconds) for reporting and keeps a
+    bounded window of recent samples to compute percentiles.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=512):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self._samples = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Record a latency sample in seconds."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[min(index, len(self.counts) - 1)] += 1
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        """
+        Get latency percentile of recent samples.
+
+        :param q: Percentile value between 0 and 100.
+        :type q: float
+        :return: Latency in seconds or None if there are no samples.
+        :rtype: float
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = int(round((len(samples) - 1) * q / 100.0))
+        return samples[max(0, min(index, len(samples) - 1))]
+
+    @property
+    def mean(self):
+        """Mean latency of all recorded samples."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def as_dict(self):
+        """Export histogram as dictionary object."""
+        with self._lock:
+            buckets = [
+                ('inf' if bound == float('inf') else bound, count)
+                for bound, count in zip(self.buckets, self.counts)
+            ]
+            count = self.count
+            total = self.total
+        return {
+            'count': count,
+            'total': total,
+            'buckets': buckets,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+def get_latency_histogram(name):
+    """
+    Get latency histogram of request source name. The histogram is created if
+    it does not exist yet.
+
+    :param name: BMA API name or URL host name.
+    :type name: str
+    :rtype: :class:`komapy.resilience.LatencyHistogram`
+    """
+    with _histograms_lock:
+        histogram = latency_histograms.get(name)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            latency_histograms[name] = histogram
+        return histogram
+
+
+def reset_latency_histograms():
+    """Remove all recorded latency histograms."""
+    with _histograms_lock:
+        latency_histograms.clear()
+
+
+def is_retryable_error(error):
+    """
+    Check if error is a transient error that is safe to retry for idempotent
+    GET requests.
+    """
+    if isinstance(error, HTTPError):
+        return error.code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (FetchTimeoutError, URLError, socket.timeout,
+                          ConnectionError, http.client.HTTPException)):
+        return True
+
+    from bmaclient.exceptions import APIError
+
+    # bmaclient APIError stores HTTP status code as string.
+    if isinstance(error, APIError):
+        try:
+            return int(error.status_code) in RETRYABLE_STATUS_CODES
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def compute_backoff(attempt, factor, maximum):
+    """
+    Compute exponential backoff delay with full jitter for retry attempt
+    number starting from 1.
+    """
+    delay = min(maximum, factor * (2 ** (attempt - 1)))
+    return random.uniform(0, delay)
+
+
+def _start(func):
+    """
+    Run function in a new daemon thread and return its future. Attempts that
+    time out are abandoned and left to finish in the background, so a hanging
+    request never holds a worker needed by other requests.
+    """
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func())
+        except BaseException as error:
+            future.set_exception(error)
+
+    thread = threading.Thread(
+        target=bind_context(target), name='komapy-request')
+    thread.daemon = True
+    thread.start()
+    return future
+
+
+def _timed(name, func):
+    def wrapper():
+        start = time.monotonic()
+        result = func()
+        get_latency_histogram(name).record(time.monotonic() - start)
+        return result
+    return wrapper
+
+
+def _acquire(func, limits, blocking=True):
+    # Limits are acquired in the calling thread, so requests waiting for
+    # tokens wait in priority order instead of occupying request threads.
+    if limits is None:
+        return func
+    release = limits(blocking=blocking)
+    if release is None:
+        return None
+
+    def wrapper():
+        try:
+            return func()
+        finally:
+            release()
+    return wrapper
+
+
+def _attempt(name, func, timeout, hedge_delay, limits=None):
+    if timeout is None and hedge_delay is None:
+        return _acquire(_timed(name, func), limits)()
+
+    request = _acquire(_timed(name, func), limits)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = {_start(request)}
+
+    if hedge_delay is not None and (timeout is None or hedge_delay < timeout):
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            # Hedged request is skipped if limits have no free slot, because
+            # waiting for the slot only duplicates the request in flight.
+            request = _acquire(_timed(name, func), limits, blocking=False)
+            if request is not None:
+                pending.add(_start(request))
+
+    error = None
+    while pending:
+        remaining = None
+        if deadline is not None:
+            remaining = max(0, deadline - time.monotonic())
+        done, pending = wait(
+            pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+
+    if error is not None and not pending:
+        raise error
+    raise FetchTimeoutError(
+        'Request to {} timed out after {} seconds'.format(name, timeout))
+
+
+def call_with_deadline(name, func, timeout):
+    """
+    Call function and wait at most ``timeout`` seconds for its result.
+
+    Function runs in a daemon thread, so a hanging request does not block the
+    caller. It is abandoned and left to finish in the background.
+
+    :param name: Source name used in the error message.
+    :type name: str
+    :param func: Callable without arguments that fetches the source.
+    :type func: :class:`collections.Callable`
+    :param timeout: Timeout in seconds. If None, function is called directly.
+    :type timeout: float
+    :return: Return value of the function.
+    """
+    if timeout is None:
+        return func()
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = func()
+        except BaseException as error:
+            outcome['error'] = error
+
+    if timeout > 0:
+        thread = threading.Thread(
+            target=bind_context(target), name='komapy-deadline')
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout)
+
+    if 'error' in outcome:
+        raise outcome['error']
+    if 'result' not in outcome:
+        raise FetchTimeoutError(
+            '{} missed its deadline of {:.3g} seconds'.format(
+                name, max(timeout, 0)))
+    return outcome['result']
+
+
+def call_with_resilience(name, func, limits=None, **kwargs):
+    """
+    Call request function with timeout, retries, and hedged requests.
+
+    Options default to the app settings ``REQUEST_TIMEOUT``,
+    ``REQUEST_MAX_RETRIES``, ``REQUEST_BACKOFF_FACTOR``,
+    ``REQUEST_BACKOFF_MAX``, ``REQUEST_HEDGE_PERCENTILE``, and
+    ``REQUEST_HEDGE_MIN_SAMPLES``. Only use it for idempotent requests.
+
+    If ``limits`` is set, it is called in the calling thread before every
+    attempt is sent. Time spent waiting for limits is not counted toward the
+    request timeout. Hedged request is only sent if limits allow it
+    immediately.
+
+    :param name: Request source name used as latency histogram key.
+    :type name: str
+    :param func: Callable without arguments that performs the request.
+    :type func: :class:`collections.Callable`
+    :param limits: Callable that waits until the request can be sent and
+                   returns a callable that releases the limits, e.g.
+                   :func:`komapy.governor.acquire_limits`. It accepts
+                   ``blocking`` argument and returns None if ``blocking`` is
+                   False and the request cannot be sent now.
+    :type limits: :class:`collections.Callable`
+    :return: Return value of the request function.
+    """
+    def option(key, setting):
+        value = kwargs.get(key)
+        return getattr(app_settings, setting) if value is None else value
+
+    timeout = option('timeout', 'REQUEST_TIMEOUT')
+    max_retries = option('max_retries', 'REQUEST_MAX_RETRIES')
+    backoff_factor = option('backoff_factor', 'REQUEST_BACKOFF_FACTOR')
+    backoff_max = option('backoff_max', 'REQUEST_BACKOFF_MAX')
+    hedge_percentile = option('hedge_percentile', 'REQUEST_HEDGE_PERCENTILE')
+    hedge_min_samples = option(
+        'hedge_min_samples', 'REQUEST_HEDGE_MIN_SAMPLES')
+
+    attempt = 0
+    while True:
+        hedge_delay = None
+        if hedge_percentile:
+            histogram = get_latency_histogram(name)
+            if histogram.count >= hedge_min_samples:
+                hedge_delay = histogram.percentile(hedge_percentile)
+
+        try:
+            return _attempt(name, func, timeout, hedge_delay, limits=limits)
+        except Exception as error:
+            attempt += 1
+            if attempt > max_retries or not is_retryable_error(error):
+                raise
+            time.sleep(compute_backoff(attempt, backoff_factor, backoff_max))
@@ -2,44 +2,97 @@
 KomaPy chart series.
 """
 
+import importlib
 from collections import OrderedDict
 from collections.abc import Callable
 from functools import partial
 
-from . import client, processing, transforms, utils
+from . import utils
 from .addons import addon_registers
 from .constants import SUPPORTED_NAMES, SUPPORTED_TYPES
 from .decorators import register_as_decorator
 from .exceptions import ChartError
-from .utils import get_validation_methods
+from .utils import get_validators
 
+# Data source resolvers are referenced by module and function name, so pandas
+# and bmaclient are only imported when data is fetched.
 DATA_SOURCES = OrderedDict([
     ('csv', {
-        'resolver': processing.read_csv,
+        'resolver': 'processing.read_csv',
         'options': 'csv_params',
     }),
     ('json', {
-        'resolver': processing.read_json,
+        'resolver': 'processing.read_json',
         'options': 'json_params',
     }),
     ('excel', {
-        'resolver': processing.read_excel,
+        'resolver': 'processing.read_excel',
         'options': 'excel_params',
     }),
     ('sql', {
-        'resolver': processing.read_sql,
+        'resolver': 'processing.read_sql',
         'options': 'sql_params',
     }),
     ('url', {
-        'resolver': client.fetch_url_as_dataframe,
+        'resolver': 'client.fetch_url_as_dataframe',
         'options': 'query_params',
     }),
     ('name', {
-        'resolver': client.fetch_bma_as_dataframe,
+        'resolver': 'client.fetch_bma_as_dataframe',
         'options': 'query_params',
     }),
 ])
 
+# Query parameters of the data lower time bound, in order of precedence. They
+# are moved forward to fetch only new data on incremental chart updates.
+INCREMENTAL_PARAMS = [
+    'timestamp__gt',
+    'timestamp__gte',
+    'eventdate__gt',
+    'eventdate__gte',
+    'start_at',
+]
+
+
+def get_incremental_config(config_dict, since):
+    """
+    Get data source config whose query lower time bound is moved to the
+    ``since`` value. Return None if the config has no known lower time bound
+    query parameter.
+
+    :param config_dict: Series or partial data source config.
+    :type config_dict: dict
+    :param since: Timestamp of the latest known sample.
+    :type since: :class:`datetime.datetime`
+    :rtype: dict
+    """
+    date_format = r'%Y-%m-%d %H:%M:%S'
+
+    query_params = config_dict.get('query_params') or {}
+    for key in INCREMENTAL_PARAMS:
+        if key in query_params:
+            if hasattr(since, 'strftime'):
+                value = since.strftime(date_format)
+            else:
+                value = since
+            config = dict(config_dict)
+            config['query_params'] = dict(query_params, **{key: value})
+            return config
+    return None
+
+
+def get_data_source_resolver(name):
+    """
+    Get resolver function of data source name, e.g. ``csv`` or ``name``.
+
+    :param name: Data source name.
+    :type name: str
+    :rtype: :class:`collections.Callable`
+    """
+    module_name, func_name = DATA_SOURCES[name]['resolver'].split('.')
+    module = importlib.import_module('.{}'.format(module_name), __package__)
+    return getattr(module, func_name)
+
 
 @register_as_decorator
 def register_addon(name, resolver, **kwargs):
@@ -110,6 +163,7 @@ class Series(object):
         'axis': None,
         'csv_params': {},
         'csv': None,
+        'deadline': None,
         'excel_params': {},
         'excel': None,
         'field_options': {},
@@ -127,6 +181,7 @@ class Series(object):
         'partial': [],
         'plot_params': {},
         'query_params': {},
+        'rasterize': None,
         'secondary': None,
         'sql_params': {},
         'sql': [],
@@ -169,12 +224,26 @@ class Series(object):
         if not self.fields:
             raise ChartError('Series fields must be set')
 
+    def validate_deadline(self):
+        """Validate deadline attribute."""
+        if self.deadline is not None:
+            if (isinstance(self.deadline, bool) or
+                    not isinstance(self.deadline, (int, float)) or
+                    self.deadline <= 0):
+                raise ChartError(
+                    'Series deadline must be a positive number of seconds')
+
+    def validate_rasterize(self):
+        """Validate rasterize attribute."""
+        if self.rasterize is not None:
+            if not isinstance(self.rasterize, (bool, int)):
+                raise ChartError(
+                    'Series rasterize must be a boolean or number of points')
+
     def validate(self):
         """Validate all config attributes."""
-        validation_methods = get_validation_methods(Series)
-
-        for method in validation_methods:
-            getattr(self, method)()
+        for validator in get_validators(Series):
+            validator(self)
 
     def get_dict_config(self):
         """
@@ -193,15 +262,25 @@ class Series(object):
         BMA API name. If none of the sources found in the chart series
         configuration, it returns None.
 
+        If ``since`` keyword argument is provided, query lower time bound
+        parameter, e.g. ``timestamp__gte`` or ``start_at``, is moved to that
+        value, so only recent data are fetched. Resource may still contain data
+        older than ``since`` value if the source has no such parameter.
+
         :return: :class:`pandas.DataFrame` object if using CSV, JSON URL, or
                  BMA API name. Otherwise, it returns None.
         """
+        since = kwargs.get('since')
 
         def get_resource(config_dict):
+            if since is not None:
+                config_dict = get_incremental_config(
+                    config_dict, since) or config_dict
+
             for name in DATA_SOURCES:
                 source = config_dict.get(name)
                 if source:
-                    resolve_fn = DATA_SOURCES[name]['resolver']
+                    resolve_fn = get_data_source_resolver(name)
                     options = config_dict.get(
                         DATA_SOURCES[name]['options'], {})
 
@@ -221,6 +300,8 @@ class Series(object):
                 'sort': True
             }
             merge_options.update(self.merge_options)
+
+            from . import processing
             return processing.merge_dataframe(data_containers, **merge_options)
 
         return get_resource(self.get_dict_config())
@@ -243,6 +324,21 @@ class Series(object):
         else:
             resource = self.fetch_resource(**kwargs)
 
+        plot_data = self.select_fields(resource)
+        plot_data = self.aggregate(plot_data, resource)
+        return self.transform(plot_data)
+
+    def select_fields(self, resource):
+        """
+        Select series fields from resource. If resource is None, series fields
+        are treated as plain object.
+
+        :param resource: Series resource.
+        :type resource: :class:`pandas.DataFrame`
+        :rtype: list
+        """
+        from . import processing
+
         if resource is not None:
             func = partial(processing.dataframe_or_empty, resource)
             iterator = map(func, self.fields)
@@ -257,54 +353,84 @@ class Series(object):
                 plot_data.append(utils.resolve_timestamp(field))
             else:
                 plot_data.append(field)
+        return plot_data
+
+    def aggregate(self, plot_data, resource=None):
+        """
+        Apply series aggregations to plot data.
+
+        :param plot_data: List of plot data.
+        :type plot_data: list
+        :param resource: Series resource. If it is not None, aggregation field
+                         is looked up by name in series fields. Otherwise,
+                         aggregation field is an index of plot data.
+        :type resource: :class:`pandas.DataFrame`
+        :rtype: list
+        """
+        from . import processing
+
+        if not self.aggregations:
+            return plot_data
+
+        plot_data = list(plot_data)
+        for item in self.aggregations:
+            func = item.get('func')
+            if func is None:
+                raise ChartError(
+                    'Function name or callable must be set '
+                    'if using data aggregations')
+
+            agg_field = item.get('field')
+            if agg_field is None:
+                raise ChartError('Field name must be set '
+                                 'if using data aggregations')
+            if resource is not None:
+                index = self.fields.index(agg_field)
+            else:
+                index = agg_field
+
+            params = item.get('params', {})
+
+            if isinstance(func, str):
+                if func not in processing.supported_aggregations:
+                    continue
+
+                resolver = processing.supported_aggregations[func]
+                if isinstance(resolver, str):
+                    callback = getattr(processing, resolver)
+                elif isinstance(resolver, Callable):
+                    callback = resolver
+                plot_data[index] = callback(plot_data[index], params)
+
+            elif isinstance(func, Callable):
+                plot_data[index] = func(plot_data[index], params)
+        return plot_data
+
+    def transform(self, plot_data):
+        """
+        Apply series transforms to plot data.
+
+        :param plot_data: List of plot data.
+        :type plot_data: list
+        :rtype: list
+        """
+        from . import transforms
+
+        if not self.transforms:
+            return plot_data
+
+        for item in self.transforms:
+            if isinstance(item, str):
+                if item not in transforms.transform_registers:
+                    continue
 
-        if self.aggregations:
-            for item in self.aggregations:
-                func = item.get('func')
-                if func is None:
-                    raise ChartError(
-                        'Function name or callable must be set '
-                        'if using data aggregations')
-
-                agg_field = item.get('field')
-                if agg_field is None:
-                    raise ChartError('Field name must be set '
-                                     'if using data aggregations')
-                if resource is not None:
-                    index = self.fields.index(agg_field)
-                else:
-                    index = agg_field
-
-                params = item.get('params', {})
-
-                if isinstance(func, str):
-                    if func not in processing.supported_aggregations:
-                        continue
-
-                    resolver = processing.supported_aggregations[func]
-                    if isinstance(resolver, str):
-                        callback = getattr(processing, resolver)
-                    elif isinstance(resolver, Callable):
-                        callback = resolver
-                    plot_data[index] = callback(plot_data[index], params)
-
-                elif isinstance(func, Callable):
-                    plot_data[index] = callback(plot_data[index], params)
-
-        if self.transforms:
-            for item in self.transforms:
-                if isinstance(item, str):
-                    if item not in transforms.transform_registers:
-                        continue
-
-                    resolver = transforms.transform_registers[item]
-                    if isinstance(resolver, str):
-                        callback = getattr(transforms, resolver)
-                    elif isinstance(resolver, Callable):
-                        callback = resolver
-                    plot_data = callback(plot_data, self)
-
-                elif isinstance(item, Callable):
-                    plot_data = callback(plot_data, self)
+                resolver = transforms.transform_registers[item]
+                if isinstance(resolver, str):
+                    callback = getattr(transforms, resolver)
+                elif isinstance(resolver, Callable):
+                    callback = resolver
+                plot_data = callback(plot_data, self)
 
+            elif isinstance(item, Callable):
+                plot_data = item(plot_data, self)
         return plot_data
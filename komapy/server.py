@@ -0,0 +1,299 @@
+"""
+KomaPy render server.
+
+Render server is a long-running local HTTP daemon that accepts chart configs
+as JSON and returns rendered image bytes. Matplotlib, pandas, and bmaclient are
+imported once, fetched resources are kept in a shared expiring cache, and
+charts are rendered on a worker pool. Workers render charts of the same style
+concurrently, see :mod:`komapy.style`. Server listens on TCP host and port or
+on a Unix socket.
+
+Endpoints:
+
+- ``POST /render``: render chart config in the request body. Output format is
+  taken from ``format`` query parameter, chart ``save_options``, or default to
+  ``png``.
+- ``GET /metrics``: queue depth, number of active, completed, and failed
+  renders, and latency histograms as JSON.
+- ``GET /health``: server health check.
+
+Run the server using ``komapy serve`` command or programmatically:
+
+.. code-block:: python
+
+    from komapy.server import RenderServer
+
+    server = RenderServer(port=8080, workers=4, cache_ttl=60)
+    server.serve_forever()
+"""
+
+import json
+import logging
+import mimetypes
+import os
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .cache import ExpiringCache
+from .chart import Chart
+from .exceptions import ChartError, FetchError
+from .governor import priority
+from .resilience import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn,
+                              socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket."""
+
+    daemon_threads = True
+
+
+class RenderMetrics(object):
+    """
+    Render server metrics.
+
+    Latency is measured from the time a render job is submitted until it is
+    finished, so it includes time spent waiting in the queue. Render time only
+    measures chart rendering and export.
+    """
+
+    def __init__(self):
+        self.queue_depth = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.latency = LatencyHistogram()
+        self.render_time = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def submitted(self):
+        with self._lock:
+            self.queue_depth += 1
+
+    def started(self):
+        with self._lock:
+            self.queue_depth -= 1
+            self.active += 1
+
+    def finished(self, submitted_at, started_at, failed=False):
+        now = time.monotonic()
+        with self._lock:
+            self.active -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if not failed:
+            self.latency.record(now - submitted_at)
+            self.render_time.record(now - started_at)
+
+    def as_dict(self):
+        """Export metrics as dictionary object."""
+        with self._lock:
+            metrics = {
+                'queue_depth': self.queue_depth,
+                'active': self.active,
+                'completed': self.completed,
+                'failed': self.failed,
+            }
+        metrics.update({
+            'latency': self.latency.as_dict(),
+            'render_time': self.render_time.as_dict(),
+        })
+        return metrics
+
+
+def get_content_type(output_format):
+    """Get HTTP content type of output format."""
+    content_type, _ = mimetypes.guess_type('chart.{}'.format(output_format))
+    return content_type or 'application/octet-stream'
+
+
+class RenderServer(object):
+    """
+    A render server object.
+
+    :param host: TCP host name to listen on.
+    :type host: str
+    :param port: TCP port to listen on. Use 0 to pick a free port.
+    :type port: int
+    :param socket_path: Unix socket path. If set, server listens on the socket
+                        instead of TCP host and port.
+    :type socket_path: str
+    :param workers: Number of render workers.
+    :type workers: int
+    :param cache_ttl: Lifetime of cached resources in seconds. Charts use the
+                      shared cache unless ``use_cache`` is disabled in the
+                      chart config. Set to 0 to disable the shared cache.
+    :type cache_ttl: float
+    :param chart_class: Chart class to instantiate.
+    :type chart_class: :class:`komapy.chart.Chart`
+    """
+
+    def __init__(self, host='127.0.0.1', port=8000, socket_path=None,
+                 workers=4, cache_ttl=60, chart_class=Chart):
+        self.socket_path = socket_path
+        self.workers = workers
+        self.chart_class = chart_class
+        self.cache = ExpiringCache(ttl=cache_ttl) if cache_ttl else None
+        self.metrics = RenderMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        handler = self._handler()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self._server = ThreadingUnixHTTPServer(socket_path, handler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), handler)
+            self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        """Server address, i.e. Unix socket path or TCP host and port."""
+        if self.socket_path:
+            return self.socket_path
+        host, port = self._server.server_address[:2]
+        return '{}:{}'.format(host, port)
+
+    def warmup(self):
+        """Render an empty chart to load fonts and backend caches."""
+        chart = self.chart_class({})
+        chart.render()
+        chart.to_bytes()
+        chart.clear()
+
+    def _render(self, config, output_format, submitted_at):
+        started_at = time.monotonic()
+        self.metrics.started()
+        try:
+            if self.cache is not None:
+                config = dict(config)
+                config.setdefault('use_cache', True)
+
+            chart = self.chart_class(config, cache=self.cache)
+            with priority('interactive'):
+                chart.render()
+            content = chart.to_bytes(format=output_format)
+            chart.clear()
+        except Exception:
+            self.metrics.finished(submitted_at, started_at, failed=True)
+            raise
+        self.metrics.finished(submitted_at, started_at)
+        return content
+
+    def render(self, config, output_format=None):
+        """
+        Render chart config on the worker pool and wait for the result.
+
+        :param config: KomaPy chart config.
+        :type config: dict
+        :param output_format: Output format, e.g. ``png`` or ``svg``.
+        :type output_format: str
+        :return: Tuple of image bytes and output format.
+        :rtype: tuple
+        """
+        if not isinstance(config, dict):
+            raise ChartError('Chart config must be a JSON object')
+
+        output_format = (output_format or
+                         config.get('save_options', {}).get('format') or
+                         'png')
+
+        self.metrics.submitted()
+        future = self.executor.submit(
+            self._render, config, output_format, time.monotonic())
+        return future.result(), output_format
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def send_content(self, status, content, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def send_json(self, status, data):
+                content = json.dumps(data).encode('utf-8')
+                self.send_content(status, content, 'application/json')
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == '/metrics':
+                    self.send_json(200, server.metrics.as_dict())
+                elif path == '/health':
+                    self.send_json(200, {'status': 'ok'})
+                else:
+                    self.send_json(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path != '/render':
+                    self.send_json(404, {'error': 'Not found'})
+                    return
+
+                query = parse_qs(url.query)
+                output_format = query.get('format', [None])[0]
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    config = json.loads(self.rfile.read(length) or b'null')
+                    content, output_format = server.render(
+                        config, output_format=output_format)
+                except FetchError as exc:
+                    self.send_json(502, {'error': str(exc)})
+                except (ChartError, ValueError) as exc:
+                    self.send_json(400, {'error': str(exc)})
+                except Exception as exc:
+                    logger.exception('Failed to render chart')
+                    self.send_json(500, {'error': str(exc)})
+                else:
+                    self.send_content(
+                        200, content, get_content_type(output_format))
+
+            def log_message(self, format, *args):
+                logger.info(format, *args)
+
+        return Handler
+
+    def serve_forever(self):
+        """Serve requests until :meth:`shutdown` is called."""
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """Stop serving requests."""
+        self._server.shutdown()
+
+    def stop(self):
+        """Stop server, close the socket, and shut down the worker pool."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self.executor.shutdown(wait=True)
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -5,12 +5,30 @@ KomaPy app settings.
 from .constants import TIME_ZONE
 
 defaults = {
+    'ACTIVITY_PHASES': None,
     'BMA_ACCESS_TOKEN': '',
     'BMA_API_CLASS': None,
     'BMA_API_HOST': '',
     'BMA_API_KEY': '',
     'BMA_API_PROTOCOL': '',
+    'BMA_HTTP_POOL': False,
+    'BMA_RATE_LIMITS': {},
+    'BULLETIN_BATCH_QUERY': True,
+    'CANVAS_POOL_MAXSIZE': 8,
+    'HTTP_COMPRESSION': True,
+    'HTTP_POOL_MAXSIZE': 4,
     'IGNORE_BMA_REQUEST_CACHE': False,
+    'REQUEST_BACKOFF_FACTOR': 0.5,
+    'REQUEST_BACKOFF_MAX': 30,
+    'REQUEST_HEDGE_MIN_SAMPLES': 20,
+    'REQUEST_HEDGE_PERCENTILE': None,
+    'REQUEST_MAX_RETRIES': 0,
+    'REQUEST_RATE_LIMITS': {},
+    'REQUEST_TIMEOUT': None,
+    'RESOLVE_MAX_WORKERS': 4,
+    'RESPONSE_STORE': '',
+    'RESPONSE_STORE_MODE': '',
+    'RESPONSE_STORE_REPLAY_LATENCY': False,
     'TIME_ZONE': TIME_ZONE,
 }
 
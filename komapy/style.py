@@ -0,0 +1,173 @@
+"""
+KomaPy chart style.
+
+Chart theme and ``rc_params`` are resolved once into a dictionary of
+matplotlib rc settings and cached. The settings are applied only while the
+chart is rendered or saved, and previous rc settings are restored afterwards,
+so chart styles do not leak into other charts in the same process.
+
+Matplotlib reads rc settings from the global ``rcParams``, also while a figure
+is drawn. Style context holds a style gate instead of a plain lock. Any number
+of charts of the same style, e.g. the default style, are built and saved
+concurrently, and a chart of a different style waits until they are done, so
+charts rendered concurrently with different styles never see each other's
+settings. Waiting styles are served in arrival order.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.style import style_context
+
+    with style_context('ggplot', {'font.size': 14}):
+        figure.savefig('figure.png')
+"""
+
+import collections
+import itertools
+import json
+import threading
+from contextlib import contextmanager
+
+styles = {}
+
+_styles_lock = threading.Lock()
+
+
+def create_style_key(theme=None, rc_params=None):
+    """Create style cache key from theme name and rc parameters."""
+    return json.dumps([theme, rc_params or {}], sort_keys=True, default=repr)
+
+
+def resolve_style(theme=None, rc_params=None):
+    """
+    Resolve theme and rc parameters into dictionary of validated matplotlib rc
+    settings. Theme is applied first, then rc parameters. Unknown theme is
+    ignored. Resolved style is cached.
+
+    :param theme: Matplotlib style name, e.g. ``ggplot``.
+    :type theme: str
+    :param rc_params: Matplotlib rc parameters.
+    :type rc_params: dict
+    :rtype: dict
+    """
+    import matplotlib
+    from matplotlib import style as mpl_style
+
+    key = create_style_key(theme, rc_params)
+    with _styles_lock:
+        style = styles.get(key)
+    if style is not None:
+        return style
+
+    settings = {}
+    if theme in mpl_style.library:
+        settings.update(mpl_style.library[theme])
+    settings.update(rc_params or {})
+    style = dict(matplotlib.RcParams(settings))
+
+    with _styles_lock:
+        return styles.setdefault(key, style)
+
+
+def clear_styles():
+    """Clear resolved style cache."""
+    with _styles_lock:
+        styles.clear()
+
+
+class StyleGate(object):
+    """
+    Gate that keeps one style applied to the global rcParams while it is
+    held. Threads of the same style share the gate. Thread of a different
+    style waits until all holders leave and previous rc settings are restored.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.holders = 0
+        self._saved = None
+        self._queue = collections.deque()
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    def _apply(self, style):
+        import matplotlib
+
+        saved = dict(matplotlib.rcParams.copy())
+        saved.pop('backend', None)
+        self._saved = saved
+        matplotlib.rcParams.update(style)
+
+    def _restore(self):
+        import matplotlib
+
+        dict.update(matplotlib.rcParams, self._saved)
+        self._saved = None
+
+    def acquire(self, key, style):
+        """Wait until style of key is applied and hold the gate."""
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        with self._condition:
+            # Nested context of the same style must not wait for itself.
+            if self._local.depth > 1 or (
+                    not self._queue and
+                    (self.holders == 0 or self.key == key)):
+                self._enter(key, style)
+                return
+
+            ticket = next(self._counter)
+            self._queue.append(ticket)
+            while not (self._queue[0] == ticket and
+                       (self.holders == 0 or self.key == key)):
+                self._condition.wait()
+            self._queue.popleft()
+            self._enter(key, style)
+            self._condition.notify_all()
+
+    def _enter(self, key, style):
+        # Must be called with the condition lock held.
+        if self.holders == 0:
+            self.key = key
+            self._apply(style)
+        self.holders += 1
+
+    def release(self):
+        """Leave the gate. Last holder restores previous rc settings."""
+        self._local.depth -= 1
+        with self._condition:
+            self.holders -= 1
+            if self.holders == 0:
+                self._restore()
+                self.key = None
+                self._condition.notify_all()
+
+
+style_gate = StyleGate()
+
+
+@contextmanager
+def style_context(theme=None, rc_params=None):
+    """
+    Apply chart style within the context.
+
+    :param theme: Matplotlib style name, e.g. ``ggplot``.
+    :type theme: str
+    :param rc_params: Matplotlib rc parameters.
+    :type rc_params: dict
+    """
+    import matplotlib
+
+    style = resolve_style(theme, rc_params)
+    key = create_style_key(theme, rc_params)
+    style_gate.acquire(key, style)
+    try:
+        if style_gate.key == key:
+            yield
+        else:
+            # Different style nested in the same thread.
+            with matplotlib.rc_context(style):
+                yield
+    finally:
+        style_gate.release()
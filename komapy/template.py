@@ -0,0 +1,111 @@
+"""
+KomaPy figure template.
+
+Figure template builds the chart figure, axes, and static decorations once.
+On later renders, only series data are fetched again and swapped into the
+existing artists. It is useful for wall displays that re-render the same chart
+layouts periodically.
+
+Example:
+
+.. code-block:: python
+
+    from komapy.template import get_template
+
+    while True:
+        for name, config in layouts.items():
+            template = get_template(name, config)
+            template.render()
+            template.save('{}.png'.format(name))
+        time.sleep(300)
+"""
+
+import threading
+
+from .chart import Chart
+
+templates = {}
+
+_templates_lock = threading.Lock()
+
+
+class FigureTemplate(object):
+    """
+    A figure template object.
+
+    It wraps a chart instance. The first render builds the chart normally.
+    Subsequent renders refresh the chart data in place if the chart is
+    refreshable. Otherwise, the chart is rebuilt from scratch.
+
+    :param config: KomaPy chart config.
+    :type config: dict
+    :param chart_class: Chart class to instantiate.
+    :type chart_class: :class:`komapy.chart.Chart`
+    """
+
+    def __init__(self, config, chart_class=Chart):
+        self.config = config
+        self.chart_class = chart_class
+        self.chart = None
+        self.num_builds = 0
+        self.num_refreshes = 0
+
+    def build(self):
+        """Build chart from scratch."""
+        if self.chart is not None:
+            self.chart.clear()
+
+        self.chart = self.chart_class(self.config)
+        self.chart.render()
+        self.num_builds += 1
+        return self.chart
+
+    def render(self):
+        """
+        Render chart. Reuse existing figure if possible.
+
+        :return: Rendered chart instance.
+        :rtype: :class:`komapy.chart.Chart`
+        """
+        if self.chart is not None and self.chart.refresh():
+            self.num_refreshes += 1
+            return self.chart
+        return self.build()
+
+    def save(self, filename):
+        """Export rendered chart to file."""
+        if self.chart is None:
+            self.render()
+        self.chart.save(filename)
+
+    def clear(self):
+        """Clear chart figure. Next render builds the chart from scratch."""
+        if self.chart is not None:
+            self.chart.clear()
+        self.chart = None
+
+
+def get_template(name, config, chart_class=Chart):
+    """
+    Get figure template registered by name, or create a new one.
+
+    :param name: Template name, e.g. chart layout name.
+    :type name: str
+    :param config: KomaPy chart config.
+    :type config: dict
+    :rtype: :class:`komapy.template.FigureTemplate`
+    """
+    with _templates_lock:
+        template = templates.get(name)
+        if template is None:
+            template = FigureTemplate(config, chart_class=chart_class)
+            templates[name] = template
+        return template
+
+
+def clear_templates():
+    """Clear and remove all registered figure templates."""
+    with _templates_lock:
+        for template in templates.values():
+            template.clear()
+        templates.clear()
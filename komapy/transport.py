@@ -0,0 +1,423 @@
+"""
+KomaPy HTTP transport.
+
+It provides pooled keep-alive HTTP connections with compressed transfer
+negotiation. Response body is decompressed while it is streamed from the
+socket. Supported encodings are gzip and deflate, and also brotli or zstd if
+``brotli`` or ``zstandard`` package is installed.
+
+Redirects are followed up to ``MAX_REDIRECTS`` hops, and proxies are taken
+from ``http_proxy``, ``https_proxy``, and ``no_proxy`` environment variables
+like :func:`urllib.request.urlopen` does.
+
+Transfer counters can be inspected to see how many bytes went over the wire
+and how long decompression took:
+
+.. code-block:: python
+
+    from komapy.transport import get_transfer_stats
+
+    print(get_transfer_stats())
+"""
+
+import base64
+import http.client
+import threading
+import time
+import zlib
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from .settings import app_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+
+MAX_REDIRECTS = 5
+
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class TransferStats(object):
+    """
+    Counters of HTTP transfer.
+    """
+
+    fields = [
+        'requests',
+        'bytes_on_wire',
+        'bytes_decoded',
+        'decode_time',
+        'connections_opened',
+        'connections_reused',
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            for field in self.fields:
+                setattr(self, field, 0)
+
+    def add(self, **values):
+        """Increase counters by values."""
+        with self._lock:
+            for key, value in values.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self):
+        """Export counters as dictionary object."""
+        with self._lock:
+            return dict((field, getattr(self, field)) for field in self.fields)
+
+
+transfer_stats = TransferStats()
+
+
+def get_transfer_stats():
+    """
+    Get HTTP transfer counters as dictionary, i.e. number of requests, bytes
+    on wire, decoded bytes, decode time in seconds, and number of opened and
+    reused connections.
+    """
+    return transfer_stats.as_dict()
+
+
+def reset_transfer_stats():
+    """Reset HTTP transfer counters."""
+    transfer_stats.reset()
+
+
+def get_accepted_encodings():
+    """
+    Get list of supported content encodings in order of preference.
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings += ['gzip', 'deflate']
+    return encodings
+
+
+class _DeflateDecoder(object):
+    """
+    Deflate decoder that accepts both zlib wrapped and raw deflate stream.
+    """
+
+    def __init__(self):
+        self._first = True
+        self._decoder = zlib.decompressobj()
+
+    def decompress(self, data):
+        if self._first and data:
+            self._first = False
+            try:
+                return self._decoder.decompress(data)
+            except zlib.error:
+                self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decoder.decompress(data)
+
+    def flush(self):
+        return self._decoder.flush()
+
+
+class _BrotliDecoder(object):
+
+    def __init__(self):
+        self._decoder = brotli.Decompressor()
+
+    def decompress(self, data):
+        return self._decoder.process(data)
+
+    def flush(self):
+        return b''
+
+
+class _ZstdDecoder(object):
+
+    def __init__(self):
+        self._decoder = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data):
+        return self._decoder.decompress(data)
+
+    def flush(self):
+        return b''
+
+
+class _IdentityDecoder(object):
+
+    def decompress(self, data):
+        return data
+
+    def flush(self):
+        return b''
+
+
+def get_decoder(encoding):
+    """
+    Get streaming decoder of content encoding. Decoder object has
+    ``decompress(data)`` and ``flush()`` methods.
+
+    :param encoding: Content-Encoding header value.
+    :type encoding: str
+    """
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return _DeflateDecoder()
+    if encoding == 'br' and brotli is not None:
+        return _BrotliDecoder()
+    if encoding == 'zstd' and zstandard is not None:
+        return _ZstdDecoder()
+    if encoding == 'identity':
+        return _IdentityDecoder()
+    raise ValueError('Unsupported content encoding {}'.format(encoding))
+
+
+def read_response(response):
+    """
+    Read HTTP response body in chunks and decompress it on the fly.
+
+    :param response: HTTP response object.
+    :type response: :class:`http.client.HTTPResponse`
+    :return: Decoded response body.
+    :rtype: bytes
+    """
+    decoder = get_decoder(response.getheader('Content-Encoding'))
+    chunks = []
+    on_wire = 0
+    decode_time = 0.0
+
+    while True:
+        chunk = response.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        on_wire += len(chunk)
+        start = time.perf_counter()
+        chunks.append(decoder.decompress(chunk))
+        decode_time += time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks.append(decoder.flush())
+    decode_time += time.perf_counter() - start
+
+    content = b''.join(chunks)
+    transfer_stats.add(bytes_on_wire=on_wire, bytes_decoded=len(content),
+                       decode_time=decode_time)
+    return content
+
+
+def get_proxy(scheme, host):
+    """
+    Get proxy URL of scheme and host from environment variables. Return None
+    if the host is not proxied.
+    """
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return None
+    if '://' not in proxy:
+        proxy = 'http://{}'.format(proxy)
+    return proxy
+
+
+def _get_proxy_headers(proxy):
+    parts = urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    credentials = '{}:{}'.format(
+        unquote(parts.username), unquote(parts.password or ''))
+    token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+    return {'Proxy-Authorization': 'Basic {}'.format(token)}
+
+
+class ConnectionPool(object):
+    """
+    Pool of keep-alive HTTP connections per scheme, host, port, and proxy.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key, timeout):
+        scheme, host, port, proxy = key
+        transfer_stats.add(connections_opened=1)
+        if proxy is not None:
+            parts = urlsplit(proxy)
+            if scheme == 'https':
+                # HTTPS requests are tunneled through the proxy.
+                connection = http.client.HTTPSConnection(
+                    parts.hostname, parts.port or 80, timeout=timeout)
+                connection.set_tunnel(
+                    host, port, headers=_get_proxy_headers(proxy))
+                return connection
+            return http.client.HTTPConnection(
+                parts.hostname, parts.port or 80, timeout=timeout)
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=timeout)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def acquire(self, key, timeout=None):
+        """
+        Get idle connection from the pool or open a new connection. Return a
+        tuple of connection object and flag whether it is reused.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                transfer_stats.add(connections_reused=1)
+                return connection, True
+        return self._new_connection(key, timeout), False
+
+    def release(self, key, connection):
+        """Return connection to the pool."""
+        maxsize = self.maxsize
+        if maxsize is None:
+            maxsize = app_settings.HTTP_POOL_MAXSIZE
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < maxsize:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+            self._idle.clear()
+
+
+pool = ConnectionPool()
+
+
+def _send(url, method, headers, timeout):
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    default_port = 443 if scheme == 'https' else 80
+    proxy = get_proxy(scheme, parts.hostname)
+    key = (scheme, parts.hostname, parts.port or default_port, proxy)
+
+    path = parts.path or '/'
+    if parts.query:
+        path = '{}?{}'.format(path, parts.query)
+    if proxy is not None and scheme == 'http':
+        # Plain HTTP proxy expects absolute URL in the request line.
+        path = '{}://{}{}'.format(scheme, parts.netloc, path)
+        headers = dict(headers, **_get_proxy_headers(proxy))
+
+    while True:
+        connection, reused = pool.acquire(key, timeout=timeout)
+        try:
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+            content = read_response(response)
+        except _STALE_CONNECTION_ERRORS:
+            connection.close()
+            if reused:
+                # Server closed idle keep-alive connection. Try again using
+                # new connection.
+                continue
+            raise
+        except Exception:
+            connection.close()
+            raise
+        break
+
+    transfer_stats.add(requests=1)
+    if response.will_close:
+        connection.close()
+    else:
+        pool.release(key, connection)
+    return response.status, response.headers, content
+
+
+def request(url, method='GET', headers=None, timeout=None):
+    """
+    Make HTTP request using pooled connection and compressed transfer.
+    Redirects are followed up to ``MAX_REDIRECTS`` hops. Authorization header
+    is not sent to other hosts.
+
+    :param url: Full URL including query string.
+    :type url: str
+    :param method: HTTP method.
+    :type method: str
+    :param headers: Additional request headers.
+    :type headers: dict
+    :param timeout: Socket timeout in seconds.
+    :type timeout: float
+    :return: Tuple of response status code, response headers, and decoded
+             response body of the final response.
+    :rtype: tuple
+    """
+    request_headers = {}
+    if app_settings.HTTP_COMPRESSION:
+        request_headers['Accept-Encoding'] = ', '.join(
+            get_accepted_encodings())
+    request_headers.update(headers or {})
+
+    for _ in range(MAX_REDIRECTS + 1):
+        status, response_headers, content = _send(
+            url, method, request_headers, timeout)
+        location = response_headers.get('Location')
+        if status not in REDIRECT_STATUS_CODES or not location:
+            return status, response_headers, content
+
+        target = urljoin(url, location)
+        if urlsplit(target).netloc != urlsplit(url).netloc:
+            request_headers = dict(
+                (key, value) for key, value in request_headers.items()
+                if key.lower() != 'authorization')
+        if status == 303 or (status in (301, 302) and method == 'POST'):
+            method = 'GET'
+        url = target
+
+    raise HTTPError(url, status, 'Too many redirects', response_headers,
+                    None)
+
+
+def get(url, headers=None, timeout=None):
+    """
+    Make HTTP GET request and return decoded response body. It raises
+    :class:`urllib.error.HTTPError` if response status code is 4xx or 5xx.
+
+    :rtype: bytes
+    """
+    status, response_headers, content = request(
+        url, headers=headers, timeout=timeout)
+    if status >= 400:
+        raise HTTPError(url, status, http.client.responses.get(status, ''),
+                        response_headers, None)
+    return content
@@ -3,20 +3,20 @@ KomaPy utility module.
 """
 
 import base64
+import functools
 import re
 import uuid
 import random
 
 import pytz
-from dateutil import parser
-
-import pandas as pd
 
 
 def resolve_timestamp(data):
     """
     Resolve data timestamp.
     """
+    import pandas as pd
+
     if data.empty:
         return data
 
@@ -31,6 +31,8 @@ def to_pydatetime(*args, **kwargs):
     info, it will return datetime aware. If timezone argument is provided, it
     will convert current timezone from date string to timezone in the argument.
     """
+    from dateutil import parser
+
     timezone = kwargs.pop('timezone', None)
     date_obj = parser.parse(*args, **kwargs)
     if timezone:
@@ -92,7 +94,15 @@ def time_to_offset(starttime, endtime, middletime):
 
 
 def get_validation_methods(root_class):
-    """Get all validation metods in the root class."""
+    """
+    Get all validation metods in the root class. Methods are discovered once
+    per class.
+    """
+    return list(_find_validation_methods(root_class))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_validation_methods(root_class):
     re_validate_template = re.compile(r'validate_(?P<name>\w+)')
 
     validation_methods = []
@@ -103,7 +113,17 @@ def get_validation_methods(root_class):
             method_name = 'validate_{}'.format(name)
             validation_methods.append(method_name)
 
-    return validation_methods
+    return tuple(validation_methods)
+
+
+@functools.lru_cache(maxsize=None)
+def get_validators(root_class):
+    """
+    Get all validation functions in the root class. Each function takes the
+    class instance as the only argument. Result is cached per class.
+    """
+    return tuple(root_class.__dict__[name]
+                 for name in _find_validation_methods(root_class))
 
 
 def generate_random_color():
@@ -120,3 +140,27 @@ def get_matplotlib_version():
     import matplotlib
     version = matplotlib.__version__.split('.')
     return (int(version[0]), int(version[1]), int(version[0]))
+
+
+def count_points(data):
+    """
+    Count number of points of resolved plot data. It returns the longest
+    length of the plot data entries.
+    """
+    lengths = [len(item) for item in data if hasattr(item, '__len__')]
+    return max(lengths) if lengths else 0
+
+
+def iter_artists(artists):
+    """
+    Iterate over matplotlib artists in nested list or container returned by
+    the plot functions.
+    """
+    from matplotlib.artist import Artist
+
+    if isinstance(artists, Artist):
+        yield artists
+    elif isinstance(artists, (list, tuple)):
+        for item in artists:
+            for artist in iter_artists(item):
+                yield artist
@@ -6,6 +6,15 @@ from setuptools import setup, find_packages
 
 __version__ = '0.7.4'
 
+extras_require = {
+    'arrow': ['pyarrow'],
+    'yaml': ['PyYAML'],
+    'brotli': ['brotli'],
+    'zstd': ['zstandard'],
+}
+extras_require['all'] = sorted(set(
+    package for packages in extras_require.values() for package in packages))
+
 
 def read(filename):
     """Read file contents."""
@@ -19,24 +28,29 @@ setup(
     long_description=read('README.md'),
     long_description_content_type='text/markdown',
     license='MIT',
+    python_requires='>=3.7',
     install_requires=[
         'matplotlib>=3.0.0',
         'pandas>=0.24',
         'bmaclient>=0.11.1',
     ],
+    extras_require=extras_require,
     author='BPPTKG',
     author_email='bpptkg@esdm.go.id',
     url='https://github.com/bpptkg/komapy',
     zip_safe=False,
     packages=find_packages(exclude=['docs', 'examples', 'tests']),
+    entry_points={
+        'console_scripts': [
+            'komapy=komapy.cli:main',
+        ],
+    },
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Environment :: Console',
         'Operating System :: POSIX :: Linux',
         'Intended Audience :: Science/Research',
         'Natural Language :: English',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ]
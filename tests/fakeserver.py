@@ -0,0 +1,122 @@
+"""
+Local fake HTTP server that serves JSON responses with injected latency and
+errors. It is used to test data fetchers without hitting the real BMA API.
+"""
+
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeResponse(object):
+
+    def __init__(self, body=None, status=200, delay=0, headers=None):
+        self.body = [] if body is None else body
+        self.status = status
+        self.delay = delay
+        self.headers = headers or {}
+
+
+class FakeServer(object):
+    """
+    Fake JSON server running in a background thread.
+
+    Queued responses are served first in order, then the default response is
+    served for every request.
+    """
+
+    def __init__(self, default=None, compress=None):
+        self.default = default or FakeResponse()
+        self.compress = compress
+        self.queue = []
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def host(self):
+        return '127.0.0.1:{}'.format(self._server.server_address[1])
+
+    @property
+    def url(self):
+        return 'http://{}/'.format(self.host)
+
+    def enqueue(self, *responses):
+        with self._lock:
+            self.queue.extend(responses)
+
+    def next_response(self, handler):
+        with self._lock:
+            self.requests.append({
+                'path': handler.path,
+                'headers': dict(handler.headers),
+                'client_address': handler.client_address,
+            })
+            if self.queue:
+                return self.queue.pop(0)
+        return self.default
+
+    def render_body(self, response):
+        return json.dumps(response.body).encode('utf-8')
+
+    def encode_body(self, body, accept_encoding):
+        accepted = [item.strip() for item in accept_encoding.split(',')]
+        if self.compress not in accepted:
+            return body, None
+        if self.compress == 'gzip':
+            return gzip.compress(body), 'gzip'
+        if self.compress == 'deflate':
+            return zlib.compress(body), 'deflate'
+        return body, None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                response = server.next_response(self)
+                if response.delay:
+                    time.sleep(response.delay)
+                body, encoding = server.encode_body(
+                    server.render_body(response),
+                    self.headers.get('Accept-Encoding', ''))
+                self.send_response(response.status)
+                self.send_header('Content-Type', 'application/json')
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                for key, value in response.headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,109 @@
+"""
+Mock chart and chart config builders shared by tests.
+
+Mock chart resolves data sources from generated data sets instead of fetching
+them, so tests do not depend on the BMA API.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from komapy.chart import Chart
+
+FIGURE_OPTIONS = {'figsize': (4, 3), 'dpi': 50}
+
+
+def create_dataset(size=24, offset=0):
+    """
+    Create hourly samples starting at 2019-10-01. Field ``x`` counts up from
+    offset, ``y`` counts down from offset, and ``count`` counts up from 0.
+    """
+    index = np.arange(size)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2019-10-01', periods=size, freq='h'),
+        'x': offset + index.astype(float),
+        'y': offset - index * 0.25,
+        'count': index,
+    })
+
+
+def create_events():
+    """Create bulletin events of extension plots."""
+    return pd.DataFrame([
+        {'eventdate': '2019-10-01 12:00:00', 'eventtype': 'EXPLOSION'},
+    ])
+
+
+class MockChart(Chart):
+    """
+    Chart whose data sources return data set of :func:`create_dataset`.
+
+    Series query parameters ``size`` and ``offset`` are passed to
+    :func:`create_dataset`. Data source with ``hang`` query parameter waits
+    until ``released`` event is set. Fetched series and their fetch options
+    are recorded in ``requests``, and extension sources in
+    ``extension_requests``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.requests = []
+        self.extension_requests = []
+        self.released = threading.Event()
+        self._requests_lock = threading.Lock()
+        super(MockChart, self).__init__(*args, **kwargs)
+
+    def get_dataset(self, series):
+        params = series.query_params
+        return create_dataset(params.get('size', 24), params.get('offset', 0))
+
+    def _fetch_resource(self, series, **kwargs):
+        with self._requests_lock:
+            self.requests.append((series, kwargs))
+        if series.query_params.get('hang'):
+            self.released.wait(5)
+
+        data = self.get_dataset(series)
+        since = kwargs.get('since')
+        if since is not None:
+            # Mock lower bound filter, i.e. timestamp__gte.
+            data = data[data['timestamp'] >= since]
+        return data.copy()
+
+    def _fetch_extension_resource(self, source):
+        with self._requests_lock:
+            self.extension_requests.append(source)
+        return create_events()
+
+
+def create_series(name='tiltmeter', fields=('timestamp', 'x'), **params):
+    """
+    Create series config of mock data source. Timestamp field is plotted as
+    date.
+    """
+    series = {
+        'name': name,
+        'query_params': {},
+        'fields': list(fields),
+        'xaxis_date': fields[0] == 'timestamp',
+    }
+    series.update(params)
+    return series
+
+
+def create_config(*layouts, **options):
+    """
+    Create chart config of one subplot per layout. Layout is a series config,
+    list of series configs, or layout config with ``series`` key. Options are
+    added to the chart config.
+    """
+    data = []
+    for layout in layouts:
+        if not isinstance(layout, dict) or 'series' not in layout:
+            layout = {'series': layout}
+        data.append(layout)
+
+    config = {'layout': {'data': data}}
+    config.update(options)
+    return config
@@ -0,0 +1,83 @@
+import unittest
+
+from komapy.arrow import get_field_names
+from komapy.exceptions import ChartError
+
+from mockchart import MockChart, create_config, create_series
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+if pyarrow is not None:
+    from komapy.arrow import read_ipc_stream, to_ipc_stream, to_record_batches
+
+
+def create_chart():
+    return MockChart(create_config(*[
+        create_series(index='tilt-x', query_params={'size': size})
+        for size in [24, 48]
+    ] + [
+        {'fields': lambda axis: None},
+    ]))
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class ArrowExportTest(unittest.TestCase):
+
+    def test_record_batches(self):
+        data = create_chart().resolve()
+        batches = to_record_batches(data)
+        self.assertEqual([batch.num_rows for batch in batches], [24, 48])
+
+        batch = batches[0]
+        self.assertEqual(batch.schema.names, ['timestamp', 'x'])
+        self.assertTrue(pyarrow.types.is_timestamp(batch.schema.field(0).type))
+        self.assertTrue(pyarrow.types.is_float64(batch.schema.field(1).type))
+
+        metadata = batch.schema.metadata
+        self.assertEqual(metadata[b'komapy.index'], b'"tilt-x"')
+        self.assertEqual(metadata[b'komapy.fields'], b'["timestamp", "x"]')
+
+    def test_buffers_are_not_copied(self):
+        data = create_chart().resolve()
+        batch = to_record_batches(data)[0]
+        values = data[0][1][1].to_numpy()
+        self.assertEqual(batch.column(1).buffers()[1].address,
+                         values.ctypes.data)
+
+    def test_ipc_stream_round_trip(self):
+        data = create_chart().resolve()
+        batches = read_ipc_stream(to_ipc_stream(data))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[1].num_rows, 48)
+        self.assertEqual(batches[1].column(1).to_pylist(),
+                         [float(i) for i in range(48)])
+
+
+class FieldNamesTest(unittest.TestCase):
+
+    def test_names_follow_transformed_data(self):
+        def swap_and_count(plot_data, series):
+            return [plot_data[1], plot_data[0], plot_data[1].to_numpy() * 2]
+
+        chart = MockChart(create_config(
+            create_series(transforms=[swap_and_count])))
+        series, plot_data = chart.resolve()[0]
+        self.assertEqual(get_field_names(series, plot_data),
+                         ['x', 'timestamp', 'field_2'])
+
+
+@unittest.skipIf(pyarrow is not None, 'pyarrow is installed')
+class ArrowMissingTest(unittest.TestCase):
+
+    def test_missing_pyarrow(self):
+        from komapy.arrow import to_record_batches
+
+        with self.assertRaises(ChartError):
+            to_record_batches(create_chart().resolve())
+
+
+if __name__ == '__main__':
+    unittest.main()
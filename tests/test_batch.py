@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from komapy.batch import BatchRenderer, get_local_inputs, load_config
+from komapy.cli import main
+from komapy.exceptions import ChartError
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+from mockchart import create_config, create_series
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(BASE_DIR, 'fixtures')
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+def create_batch_config(**series):
+    # Batch configs are serialized, so figure size is a list.
+    return create_config(create_series(**series),
+                         figure_options={'figsize': [4, 3], 'dpi': 50})
+
+
+class BatchRendererTest(unittest.TestCase):
+
+    setting_names = ['BMA_API_HOST', 'BMA_API_PROTOCOL']
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        body = [
+            {'timestamp': '2019-10-01 {:02d}:00:00'.format(i), 'x': i * 0.5}
+            for i in range(24)
+        ]
+        self.bma = FakeServer(FakeResponse(body)).start()
+        app_settings.BMA_API_HOST = self.bma.host
+        app_settings.BMA_API_PROTOCOL = 'http'
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config_dir = os.path.join(self.tempdir.name, 'configs')
+        self.output_dir = os.path.join(self.tempdir.name, 'outputs')
+        os.makedirs(self.config_dir)
+
+        self.csv_path = os.path.join(self.tempdir.name, 'tiltmeter.csv')
+        shutil.copy(os.path.join(FIXTURE_DIR, 'tiltmeter_selokopo.csv'),
+                    self.csv_path)
+
+        self.write_config('local.json', create_batch_config(
+            name=None, csv=self.csv_path))
+        for name in ['remote1.json', 'remote2.json']:
+            self.write_config(name, create_batch_config(
+                query_params={'station': 'selokopo'}))
+
+    def tearDown(self):
+        self.bma.stop()
+        self.tempdir.cleanup()
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+
+    def write_config(self, name, config):
+        with open(os.path.join(self.config_dir, name), 'w') as fp:
+            json.dump(config, fp)
+
+    def get_statuses(self, results):
+        return dict((os.path.basename(path), status)
+                    for path, status in results)
+
+    def test_render_and_skip_unchanged(self):
+        renderer = BatchRenderer(self.output_dir, jobs=3)
+        results = renderer.run([self.config_dir])
+        self.assertEqual(self.get_statuses(results), {
+            'local.json': 'rendered',
+            'remote1.json': 'rendered',
+            'remote2.json': 'rendered',
+        })
+        for name in ['local.png', 'remote1.png', 'remote2.png']:
+            self.assertTrue(
+                os.path.exists(os.path.join(self.output_dir, name)))
+        # Remote resource is fetched once and shared between charts.
+        self.assertEqual(len(self.bma.requests), 1)
+
+        results = BatchRenderer(self.output_dir).run([self.config_dir])
+        self.assertEqual(self.get_statuses(results), {
+            'local.json': 'skipped',
+            'remote1.json': 'skipped',
+            'remote2.json': 'skipped',
+        })
+        self.assertEqual(len(self.bma.requests), 2)
+
+        self.bma.default = FakeResponse([
+            {'timestamp': '2019-10-02 00:00:00', 'x': 1.5}])
+        results = BatchRenderer(self.output_dir).run([self.config_dir])
+        self.assertEqual(self.get_statuses(results), {
+            'local.json': 'skipped',
+            'remote1.json': 'rendered',
+            'remote2.json': 'rendered',
+        })
+
+        with open(self.csv_path, 'a') as fp:
+            fp.write('1,2016-01-02T00:00:00+07:00,83.7,-41.9,17.5\n')
+        results = BatchRenderer(self.output_dir).run([self.config_dir])
+        self.assertEqual(self.get_statuses(results)['local.json'], 'rendered')
+
+        results = BatchRenderer(self.output_dir, force=True).run(
+            [os.path.join(self.config_dir, 'local.json')])
+        self.assertEqual(self.get_statuses(results)['local.json'], 'rendered')
+
+    def test_output_name_collision(self):
+        other_dir = os.path.join(self.tempdir.name, 'other')
+        os.makedirs(other_dir)
+        shutil.copy(os.path.join(self.config_dir, 'local.json'),
+                    os.path.join(other_dir, 'remote1.json'))
+
+        results = BatchRenderer(self.output_dir).run(
+            [self.config_dir, other_dir])
+        self.assertEqual([status for _, status in results],
+                         ['rendered', 'failed', 'rendered', 'failed'])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, 'remote1.png')))
+
+    def test_get_local_inputs(self):
+        config = load_config(os.path.join(self.config_dir, 'local.json'))
+        self.assertEqual(get_local_inputs(config), [self.csv_path])
+
+        config = load_config(os.path.join(self.config_dir, 'remote1.json'))
+        self.assertIsNone(get_local_inputs(config))
+
+    def test_render_command(self):
+        self.write_config('invalid.json', ['not', 'a', 'mapping'])
+        with self.assertRaises(ChartError):
+            load_config(os.path.join(self.config_dir, 'invalid.json'))
+
+        status = main(['render', '-j', '2', '-f', 'svg',
+                       '-o', self.output_dir, self.config_dir])
+        self.assertEqual(status, 1)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, 'local.svg')))
+
+    @unittest.skipIf(yaml is None, 'PyYAML is not installed')
+    def test_yaml_config(self):
+        path = os.path.join(self.config_dir, 'local.yaml')
+        with open(path, 'w') as fp:
+            yaml.safe_dump(create_batch_config(
+                name=None, csv=self.csv_path), fp)
+        self.assertEqual(load_config(path)['layout']['data'][0]['series'][
+            'csv'], self.csv_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
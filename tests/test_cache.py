@@ -1,12 +1,17 @@
+import datetime
 import os
 import json
+import subprocess
+import sys
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
 from komapy.chart import Chart
-from komapy.cache import ResolverCache
+from komapy.cache import ExpiringCache, ResolverCache
 from komapy.decorators import counter
 from komapy.series import Series
 
@@ -269,5 +274,103 @@ class ResolverCacheInstanceCreationTest(unittest.TestCase):
         self.assertEqual(key, hash(instance))
 
 
+class ResolverCacheDigestTest(unittest.TestCase):
+
+    def test_digest_distinguishes_types(self):
+        self.assertNotEqual(ResolverCache({'name': 'edm', 'limit': 1}),
+                            ResolverCache({'name': 'edm', 'limit': '1'}))
+        self.assertNotEqual(
+            hash(ResolverCache({'name': 'edm', 'limit': 1})),
+            hash(ResolverCache({'name': 'edm', 'limit': '1'})))
+        self.assertNotEqual(
+            hash(ResolverCache({'name': 'edm', 'ci': True})),
+            hash(ResolverCache({'name': 'edm', 'ci': 'True'})))
+
+    def test_digest_of_nested_config(self):
+        config = {
+            'sql': ['SELECT * FROM edm', 'sqlite:///edm.db'],
+            'params': {'b': [1, 2], 'a': {'y': 1, 'x': 2}},
+        }
+        another_config = {
+            'params': {'a': {'x': 2, 'y': 1}, 'b': [1, 2]},
+            'sql': ['SELECT * FROM edm', 'sqlite:///edm.db'],
+        }
+        self.assertEqual(ResolverCache(config).digest(),
+                         ResolverCache(another_config).digest())
+
+        another_config['params']['b'] = [2, 1]
+        self.assertNotEqual(ResolverCache(config).digest(),
+                            ResolverCache(another_config).digest())
+
+    def test_digest_normalizes_dates(self):
+        wib = datetime.timezone(datetime.timedelta(hours=7))
+        config = {
+            'name': 'edm',
+            'start_at': datetime.datetime(2019, 10, 1, 7, tzinfo=wib),
+        }
+        another_config = {
+            'name': 'edm',
+            'start_at': pd.Timestamp('2019-10-01 00:00:00', tz='UTC'),
+        }
+        self.assertEqual(ResolverCache(config).digest(),
+                         ResolverCache(another_config).digest())
+
+    def test_digest_is_stable_across_processes(self):
+        config = {'name': 'edm', 'benchmark': 'BAB0', 'ci': True}
+        code = ('from komapy.cache import ResolverCache; '
+                'print(ResolverCache({!r}).digest(), '
+                'hash(ResolverCache({!r})))'.format(config, config))
+
+        outputs = set()
+        for seed in ['1', '2']:
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            result = subprocess.run(
+                [sys.executable, '-c', code], cwd=BASE_DIR, env=env,
+                stdout=subprocess.PIPE, universal_newlines=True, check=True)
+            outputs.add(result.stdout.strip())
+
+        cache = ResolverCache(config)
+        expected = '{} {}'.format(cache.digest(), hash(cache))
+        self.assertEqual(outputs, {expected})
+
+
+class ExpiringCacheTest(unittest.TestCase):
+
+    def test_expiring_cache(self):
+        cache = ExpiringCache(ttl=0.05)
+        cache['key'] = 'value'
+        self.assertIn('key', cache)
+        self.assertEqual(cache['key'], 'value')
+
+        time.sleep(0.1)
+        self.assertNotIn('key', cache)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_expiring_cache_get_or_create(self):
+        cache = ExpiringCache()
+        calls = []
+
+        def create():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: cache.get_or_create('key', create), range(4)))
+        self.assertEqual(results, ['value'] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_expiring_cache_maxsize(self):
+        cache = ExpiringCache(maxsize=2)
+        for key in range(3):
+            cache[key] = key
+        self.assertNotIn(0, cache)
+        self.assertIn(1, cache)
+        self.assertIn(2, cache)
+
+
 if __name__ == '__main__':
     unittest.main()
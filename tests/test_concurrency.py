@@ -0,0 +1,70 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+
+from mockchart import FIGURE_OPTIONS, MockChart, create_config, create_series
+
+
+def create_chart(offset):
+    return MockChart(create_config(
+        create_series(query_params={'offset': offset, 'size': 48}),
+        title='Chart {}'.format(offset),
+        tight_layout={'pad': 1},
+        figure_options=FIGURE_OPTIONS,
+    ))
+
+
+def render(offset):
+    chart = create_chart(offset)
+    chart.render()
+    return chart.to_bytes()
+
+
+class ConcurrentRenderTest(unittest.TestCase):
+
+    def test_render_without_pyplot(self):
+        plt.close('all')
+        chart = create_chart(0)
+        chart.render()
+        self.assertEqual(plt.get_fignums(), [])
+        self.assertIs(chart.figure.canvas.figure, chart.figure)
+
+    def test_concurrent_render(self):
+        offsets = list(range(8))
+        expected = [render(offset) for offset in offsets]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(render, offsets * 2))
+
+        self.assertEqual(results, expected * 2)
+        self.assertEqual(len(set(expected)), len(offsets))
+
+    def test_grid_layout(self):
+        config = create_config(
+            {
+                'grid': {
+                    'location': [0, 0],
+                    'options': {'colspan': 2},
+                },
+                'series': create_series(query_params={'offset': 0}),
+            },
+            {
+                'grid': {
+                    'location': [1, 1],
+                },
+                'series': create_series(query_params={'offset': 1}),
+            },
+        )
+        config['layout'].update(type='grid', size=[2, 2])
+        chart = MockChart(config)
+        chart.render()
+
+        first, second = chart.axes
+        self.assertEqual(first.get_subplotspec().colspan, range(0, 2))
+        self.assertEqual(second.get_subplotspec().rowspan, range(1, 2))
+        self.assertEqual(plt.get_fignums(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import sqlite3
+import time
+import unittest
+
+from komapy.chart import Chart
+from komapy.exceptions import ChartError, FetchTimeoutError
+from komapy.resilience import call_with_deadline
+from komapy.series import Series
+
+from mockchart import (FIGURE_OPTIONS, MockChart, create_config,
+                       create_dataset, create_series)
+
+EXPECTED_Y = list(create_dataset(10)['y'])
+
+
+def create_station_series(station, hang=False, **kwargs):
+    return create_series(
+        fields=['x', 'y'],
+        query_params={'station': station, 'hang': hang, 'size': 10},
+        **kwargs)
+
+
+def create_chart(*layouts, **options):
+    return MockChart(
+        create_config(*layouts, figure_options=FIGURE_OPTIONS, **options))
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def render(self, chart):
+        start = time.monotonic()
+        try:
+            chart.render()
+        finally:
+            chart.released.set()
+        return time.monotonic() - start
+
+    def test_series_deadline(self):
+        chart = create_chart(
+            create_station_series('selokopo'),
+            create_station_series('babadan', hang=True, deadline=0.1),
+        )
+        self.assertLess(self.render(chart), 2)
+        self.assertEqual(len(chart.timed_out), 1)
+        self.assertIn('babadan', chart.timed_out[0])
+
+        self.assertEqual(list(chart.get_data(0)[1]), EXPECTED_Y)
+        self.assertIsNone(chart.get_data(1))
+        texts = [text.get_text() for text in chart.axes[1].texts]
+        self.assertEqual(texts, ['Data source timed out'])
+        self.assertTrue(chart.to_bytes())
+        chart.clear()
+
+    def test_chart_deadline(self):
+        chart = create_chart(
+            create_station_series('selokopo', hang=True),
+            create_station_series('babadan', hang=True),
+            create_station_series('jurangjero'),
+            deadline=0.2,
+            placeholder={'text': 'No data'},
+        )
+        self.assertLess(self.render(chart), 2)
+        self.assertEqual(len(chart.timed_out), 2)
+        self.assertEqual(
+            [text.get_text() for text in chart.axes[0].texts], ['No data'])
+        self.assertEqual(list(chart.get_data(2)[1]), EXPECTED_Y)
+        chart.clear()
+
+    def test_resolve_with_deadline(self):
+        chart = create_chart(
+            create_station_series('selokopo', hang=True, deadline=0.1),
+            create_station_series('babadan'),
+        )
+        try:
+            data = chart.resolve(max_workers=2)
+        finally:
+            chart.released.set()
+        self.assertIsNone(data[0][1])
+        self.assertEqual(list(data[1][1][1]), EXPECTED_Y)
+
+    def test_render_without_deadline_in_calling_thread(self):
+        # SQLite connection can only be used in the thread that created it.
+        connection = sqlite3.connect(':memory:')
+        self.addCleanup(connection.close)
+        connection.execute('CREATE TABLE tilt (x INTEGER, y INTEGER)')
+        connection.executemany(
+            'INSERT INTO tilt VALUES (?, ?)', [(i, i * 2) for i in range(5)])
+
+        chart = Chart({
+            'figure_options': FIGURE_OPTIONS,
+            'layout': {
+                'data': [
+                    {
+                        'series': {
+                            'sql': ['SELECT x, y FROM tilt', connection],
+                            'fields': ['x', 'y'],
+                        }
+                    },
+                    {
+                        'series': {
+                            'sql': ['SELECT y, x FROM tilt', connection],
+                            'fields': ['y', 'x'],
+                        }
+                    },
+                ]
+            }
+        })
+        chart.render()
+        self.assertEqual(list(chart.axes[0].lines[0].get_ydata()),
+                         [0, 2, 4, 6, 8])
+        self.assertEqual(len(chart.axes[1].lines[0].get_xdata()), 5)
+        chart.clear()
+
+    def test_validate_series_deadline(self):
+        for deadline in [0, -1, 'soon', True]:
+            with self.assertRaises(ChartError):
+                Series(fields=['x'], deadline=deadline).validate()
+        Series(fields=['x'], deadline=2.5).validate()
+
+    def test_call_with_deadline(self):
+        self.assertEqual(call_with_deadline('edm', lambda: 1, 1), 1)
+        self.assertEqual(call_with_deadline('edm', lambda: 1, None), 1)
+
+        with self.assertRaises(ZeroDivisionError):
+            call_with_deadline('edm', lambda: 1 / 0, 1)
+        with self.assertRaises(FetchTimeoutError):
+            call_with_deadline('edm', lambda: time.sleep(1), 0.05)
+        with self.assertRaises(FetchTimeoutError):
+            call_with_deadline('edm', lambda: 1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
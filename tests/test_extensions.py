@@ -1,7 +1,30 @@
 import unittest
 
+import pandas as pd
+from bmaclient.exceptions import APIError
+
 from komapy import exceptions
 from komapy import extensions
+from komapy.chart import Chart
+from komapy.decorators import counter
+from komapy.settings import app_settings
+
+
+@counter
+def bulletin_fetch_resource(source):
+    """
+    Mock bulletin extension resolver.
+    """
+    return pd.DataFrame([
+        {'eventdate': '2019-10-05 12:00:00', 'eventtype': 'EXPLOSION'},
+        {'eventdate': '2019-10-09 08:30:00', 'eventtype': 'EXPLOSION'},
+    ])
+
+
+class BulletinChart(Chart):
+
+    def _fetch_extension_resource(self, source):
+        return bulletin_fetch_resource(source)
 
 
 class RegisterExtensionsTest(unittest.TestCase):
@@ -41,5 +64,191 @@ class RegisterExtensionsTest(unittest.TestCase):
         self.assertFalse(name in extensions.extension_registers)
 
 
+class ExtensionDataTest(unittest.TestCase):
+
+    def create_config(self, use_cache=False):
+        return {
+            'use_cache': use_cache,
+            'layout': {
+                'data': [
+                    {
+                        'series': {
+                            'fields': [[1, 2, 3], [1, 2, 3]],
+                        }
+                    } for _ in range(6)
+                ]
+            },
+            'extensions': {
+                'starttime': '2019-10-01',
+                'endtime': '2019-11-01',
+                'plot': [
+                    {
+                        'name': 'explosion',
+                        'color': 'red',
+                    },
+                    {
+                        'name': 'komapy.extensions.plot_explosion_line',
+                        'color': 'k',
+                    },
+                ]
+            }
+        }
+
+    def test_extension_data_fetched_once_per_chart(self):
+        bulletin_fetch_resource.count = 0
+
+        chart = BulletinChart(self.create_config())
+        chart.render()
+        self.assertEqual(bulletin_fetch_resource.count, 1)
+        self.assertEqual(len(chart.axes[5].lines), 5)
+
+        chart.clear()
+        chart.render()
+        self.assertEqual(bulletin_fetch_resource.count, 2)
+        chart.clear()
+
+    def test_extension_data_with_chart_cache(self):
+        bulletin_fetch_resource.count = 0
+
+        chart = BulletinChart(self.create_config(use_cache=True))
+        chart.render()
+        chart.clear()
+        chart.render()
+        chart.clear()
+        self.assertEqual(bulletin_fetch_resource.count, 1)
+
+    def test_event_query_requires_eventtype(self):
+        with self.assertRaises(exceptions.ChartError):
+            extensions.event_query(None, None)
+
+
+BULLETIN_EVENTS = pd.DataFrame([
+    {'eventdate': '2019-10-02 01:00:00', 'eventtype': 'VTA'},
+    {'eventdate': '2019-10-03 02:00:00', 'eventtype': 'MP'},
+    {'eventdate': '2019-10-04 03:00:00', 'eventtype': 'MP'},
+    {'eventdate': '2019-10-05 12:00:00', 'eventtype': 'EXPLOSION'},
+    {'eventdate': '2019-10-06 04:00:00', 'eventtype': 'ROCKFALL'},
+])
+
+
+class BatchedBulletinChart(Chart):
+
+    def __init__(self, *args, **kwargs):
+        self.sources = []
+        self.filter_supported = kwargs.pop('filter_supported', True)
+        super(BatchedBulletinChart, self).__init__(*args, **kwargs)
+
+    def _fetch_extension_resource(self, source):
+        self.sources.append(source)
+        params = source['query_params']
+        if 'eventtype__in' in params:
+            if not self.filter_supported:
+                raise APIError(400, 'Bad Request', 'Unknown filter')
+            eventtypes = params['eventtype__in'].split(',')
+        else:
+            eventtypes = [params['eventtype']]
+        return BULLETIN_EVENTS[
+            BULLETIN_EVENTS['eventtype'].isin(eventtypes)]
+
+
+class BatchedBulletinTest(unittest.TestCase):
+
+    def create_config(self):
+        return {
+            'layout': {
+                'data': [
+                    {
+                        'series': {
+                            'fields': [[1, 2, 3], [1, 2, 3]],
+                        }
+                    }
+                ]
+            },
+            'extensions': {
+                'starttime': '2019-10-01',
+                'endtime': '2019-11-01',
+                'plot': [
+                    {
+                        'name': 'komapy.extensions.plot_event_label',
+                        'eventtype': eventtype,
+                    } for eventtype in ['VTA', 'VTB', 'MP', 'ROCKFALL']
+                ] + [
+                    {
+                        'name': 'explosion',
+                    },
+                ]
+            }
+        }
+
+    def tearDown(self):
+        app_settings.BULLETIN_BATCH_QUERY = True
+
+    def test_single_bulletin_query(self):
+        chart = BatchedBulletinChart(self.create_config())
+        chart.render()
+
+        self.assertEqual(len(chart.sources), 1)
+        params = chart.sources[0]['query_params']
+        self.assertNotIn('eventtype', params)
+        self.assertEqual(
+            params['eventtype__in'], 'VTA,VTB,MP,ROCKFALL,EXPLOSION')
+        self.assertEqual(len(chart.axes[0].lines), 6)
+        self.assertEqual(
+            [node.key[0] for node in chart.plan.get_nodes('fetch')],
+            ['fetch', 'extension_batch'])
+        self.assertEqual(chart.plan.num_merged, 4)
+        chart.clear()
+
+    def test_batched_data_with_chart_cache(self):
+        config = self.create_config()
+        config['use_cache'] = True
+
+        chart = BatchedBulletinChart(config)
+        chart.render()
+        chart.clear()
+        chart.render()
+        self.assertEqual(len(chart.sources), 1)
+        self.assertEqual(len(chart.axes[0].lines), 6)
+        chart.clear()
+
+    def test_split_bulletin_data(self):
+        sources = [
+            {'name': 'bulletin', 'query_params': {'eventtype': eventtype}}
+            for eventtype in ['MP', 'VTB']
+        ]
+        mp, vtb = extensions.split_bulletin_data(BULLETIN_EVENTS, sources)
+        self.assertEqual(list(mp['eventdate']), [
+            '2019-10-03 02:00:00', '2019-10-04 03:00:00'])
+        self.assertTrue(vtb.empty)
+
+        self.assertIsNone(extensions.split_bulletin_data(
+            pd.DataFrame({'eventdate': ['2019-10-03 02:00:00']}), sources))
+
+    def test_fallback_to_separate_queries(self):
+        chart = BatchedBulletinChart(
+            self.create_config(), filter_supported=False)
+        chart.render()
+
+        self.assertEqual(len(chart.sources), 6)
+        self.assertEqual(
+            [source['query_params']['eventtype']
+             for source in chart.sources[1:]],
+            ['VTA', 'VTB', 'MP', 'ROCKFALL', 'EXPLOSION'])
+        self.assertEqual(len(chart.axes[0].lines), 6)
+        chart.clear()
+
+    def test_batch_query_disabled(self):
+        app_settings.BULLETIN_BATCH_QUERY = False
+
+        chart = BatchedBulletinChart(self.create_config())
+        chart.render()
+        self.assertEqual(len(chart.sources), 5)
+        self.assertEqual(
+            [node.key[0] for node in chart.plan.get_nodes('fetch')],
+            ['fetch'] + ['extension'] * 5)
+        self.assertEqual(len(chart.axes[0].lines), 6)
+        chart.clear()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,229 @@
+import threading
+import time
+import unittest
+from functools import partial
+
+import pandas as pd
+
+from komapy.chart import Chart
+from komapy.client import fetch_bma_as_dictionary, fetch_url_as_dictionary
+from komapy.exceptions import ChartError
+from komapy.governor import (RateLimiter, acquire_limits, call_with_limits,
+                             get_limiter, get_priority, priority,
+                             reset_limiters)
+from komapy.resilience import call_with_resilience
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+
+
+class PriorityChart(Chart):
+
+    def __init__(self, *args, **kwargs):
+        self.priorities = []
+        super(PriorityChart, self).__init__(*args, **kwargs)
+
+    def _fetch_resource(self, series, **kwargs):
+        self.priorities.append(get_priority())
+        return pd.DataFrame({'x': range(10)})
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def request():
+            with limiter.limit():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(limiter.as_dict()['acquired'], 6)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            with limiter.limit():
+                pass
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_non_blocking_acquire(self):
+        limiter = RateLimiter(max_in_flight=1)
+        self.assertTrue(limiter.acquire(blocking=False))
+        self.assertFalse(limiter.acquire(blocking=False))
+        limiter.release()
+        self.assertEqual(limiter.num_acquired, 1)
+
+    def test_priority_order(self):
+        limiter = RateLimiter(max_in_flight=1)
+        limiter.acquire()
+        order = []
+
+        def request(name):
+            with limiter.limit(name):
+                order.append(name)
+
+        threads = []
+        for name in ['batch', 'normal', 'interactive']:
+            thread = threading.Thread(target=request, args=(name,))
+            thread.start()
+            threads.append(thread)
+            while len(limiter._waiters) < len(threads):
+                time.sleep(0.001)
+
+        limiter.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ['interactive', 'normal', 'batch'])
+
+
+class GovernorTest(unittest.TestCase):
+
+    setting_names = ['BMA_API_HOST', 'BMA_API_PROTOCOL', 'BMA_RATE_LIMITS',
+                     'REQUEST_RATE_LIMITS']
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        reset_limiters()
+
+    def tearDown(self):
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+        reset_limiters()
+
+    def test_get_limiter(self):
+        self.assertIsNone(get_limiter('name', 'edm'))
+
+        app_settings.BMA_RATE_LIMITS = {
+            'edm': {'rate': 5},
+            '*': {'max_in_flight': 2},
+        }
+        limiter = get_limiter('name', 'edm')
+        self.assertEqual(limiter.rate, 5)
+        self.assertIs(get_limiter('name', 'edm'), limiter)
+        self.assertEqual(get_limiter('name', 'tiltmeter').max_in_flight, 2)
+        self.assertIsNone(get_limiter('host', 'bma.cendana15.com'))
+
+        app_settings.BMA_RATE_LIMITS = {'edm': {'rate': 10}}
+        self.assertEqual(get_limiter('name', 'edm').rate, 10)
+
+    def test_call_with_limits(self):
+        app_settings.REQUEST_RATE_LIMITS = {'example.com': {'rate': 100}}
+        app_settings.BMA_RATE_LIMITS = {'edm': {'max_in_flight': 1}}
+
+        def request():
+            self.assertEqual(get_limiter('name', 'edm').in_flight, 1)
+            self.assertEqual(get_limiter('host', 'example.com').in_flight, 1)
+            return 'ok'
+
+        self.assertEqual(
+            call_with_limits(request, host='example.com', name='edm'), 'ok')
+        self.assertEqual(get_limiter('name', 'edm').in_flight, 0)
+        self.assertEqual(get_limiter('host', 'example.com').num_acquired, 1)
+
+    def test_limit_wait_is_not_counted_toward_timeout(self):
+        app_settings.BMA_RATE_LIMITS = {'edm': {'rate': 5, 'burst': 1}}
+
+        def request():
+            return 'ok'
+
+        for _ in range(2):
+            self.assertEqual(call_with_resilience(
+                'edm', request, limits=partial(acquire_limits, name='edm'),
+                timeout=0.1, max_retries=0), 'ok')
+        self.assertEqual(get_limiter('name', 'edm').in_flight, 0)
+
+    def test_priority_order_with_timeout(self):
+        app_settings.BMA_RATE_LIMITS = {'edm': {'max_in_flight': 1}}
+        limiter = get_limiter('name', 'edm')
+        limiter.acquire()
+        order = []
+
+        def request(name):
+            with priority(name):
+                call_with_resilience(
+                    'edm', partial(order.append, name),
+                    limits=partial(acquire_limits, name='edm'),
+                    timeout=5, max_retries=0)
+
+        threads = []
+        for name in ['batch', 'normal', 'interactive']:
+            thread = threading.Thread(target=request, args=(name,))
+            thread.start()
+            threads.append(thread)
+            while len(limiter._waiters) < len(threads):
+                time.sleep(0.001)
+
+        limiter.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ['interactive', 'normal', 'batch'])
+
+    def test_fetch_paths_are_limited(self):
+        body = [{'timestamp': '2019-10-01 00:00:00', 'x': 1}]
+        with FakeServer(FakeResponse(body)) as server:
+            app_settings.BMA_API_HOST = server.host
+            app_settings.BMA_API_PROTOCOL = 'http'
+            app_settings.REQUEST_RATE_LIMITS = {'*': {'rate': 100}}
+            app_settings.BMA_RATE_LIMITS = {'tiltmeter': {'rate': 100}}
+
+            fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+            fetch_url_as_dictionary(server.url)
+
+        self.assertEqual(get_limiter('name', 'tiltmeter').num_acquired, 1)
+        self.assertEqual(get_limiter('host', server.host).num_acquired, 2)
+
+    def test_priority_context(self):
+        self.assertEqual(get_priority(), 'normal')
+        with priority('batch'):
+            self.assertEqual(get_priority(), 'batch')
+        self.assertEqual(get_priority(), 'normal')
+
+        with self.assertRaises(ChartError):
+            with priority('urgent'):
+                pass
+
+    def test_chart_priority_in_worker_threads(self):
+        config = {
+            'priority': 'interactive',
+            'layout': {
+                'data': [
+                    {
+                        'series': {
+                            'name': 'tiltmeter',
+                            'query_params': {'station': station},
+                            'fields': ['x'],
+                        }
+                    }
+                    for station in ['selokopo', 'babadan']
+                ]
+            }
+        }
+        chart = PriorityChart(config)
+        chart.resolve(max_workers=2)
+        self.assertEqual(chart.priorities, ['interactive', 'interactive'])
+
+        chart = PriorityChart(dict(config, priority=None))
+        with priority('batch'):
+            chart.resolve(max_workers=2)
+        self.assertEqual(chart.priorities, ['batch', 'batch'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from komapy.exceptions import ChartError
+from komapy.group import ChartGroup
+
+from mockchart import FIGURE_OPTIONS, MockChart, create_config, create_series
+
+
+def create_chart_config(name, color, extensions=False):
+    config = create_config(
+        create_series(name, ['timestamp', 'count'],
+                      query_params={'eventdate__gte': '2019-10-01'},
+                      plot_params={'color': color}),
+        figure_options=FIGURE_OPTIONS,
+    )
+    if extensions:
+        config['extensions'] = {
+            'starttime': '2019-10-01',
+            'endtime': '2019-10-02',
+            'plot': [{'name': 'explosion'}],
+        }
+    return config
+
+
+def get_requests(group):
+    requests = []
+    for chart in group:
+        requests += [series.name for series, _ in chart.requests]
+        requests += ['explosion' for _ in chart.extension_requests]
+    return requests
+
+
+def create_group():
+    return ChartGroup([
+        create_chart_config('seismicity', 'k', extensions=True),
+        create_chart_config('seismicity', 'r', extensions=True),
+        create_chart_config('seismicity', 'b'),
+        create_chart_config('edm', 'k'),
+    ], chart_class=MockChart)
+
+
+class ChartGroupTest(unittest.TestCase):
+
+    def test_shared_fetch(self):
+        group = create_group()
+        group.render()
+        self.assertEqual(sorted(get_requests(group)),
+                         ['edm', 'explosion', 'seismicity'])
+        self.assertEqual(group.report(), {
+            'charts': 4,
+            'requested': 6,
+            'fetched': 3,
+            'saved': 3,
+        })
+
+        for chart in group:
+            self.assertIsNotNone(chart.figure)
+            self.assertEqual(list(chart.get_data(0)[1]), list(range(24)))
+        group.clear()
+
+    def test_save(self):
+        group = create_group()
+        with tempfile.TemporaryDirectory() as tempdir:
+            filenames = [os.path.join(tempdir, '{}.png'.format(i))
+                         for i in range(len(group))]
+            group.save(filenames)
+            for filename in filenames:
+                self.assertTrue(os.path.getsize(filename) > 0)
+        self.assertEqual(len(get_requests(group)), 3)
+
+        with self.assertRaises(ChartError):
+            group.save(filenames[:1])
+        group.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['bmaclient', 'matplotlib', 'matplotlib.pyplot', 'pandas']
+
+
+def run_python(code, *options):
+    result = subprocess.run(
+        [sys.executable] + list(options) + ['-c', code],
+        cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    return result.stdout, result.stderr
+
+
+def get_loaded_modules(code):
+    stdout, _ = run_python(code + '\n'.join([
+        '',
+        'import json, sys',
+        'print(json.dumps(sorted(name for name in {!r} '
+        'if name in sys.modules)))'.format(HEAVY_MODULES),
+    ]))
+    return json.loads(stdout)
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_import_komapy(self):
+        self.assertEqual(get_loaded_modules('import komapy'), [])
+
+    def test_validate_config(self):
+        code = '\n'.join([
+            'from komapy import Chart',
+            "Chart({'layout': {'data': [{'series': {",
+            "    'name': 'tiltmeter', 'fields': ['timestamp', 'x']}}]}})",
+        ])
+        self.assertEqual(get_loaded_modules(code), [])
+
+    def test_fetch_without_matplotlib(self):
+        loaded = get_loaded_modules('import komapy.client')
+        self.assertIn('bmaclient', loaded)
+        self.assertNotIn('matplotlib', loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import time
+import unittest
+
+import pandas as pd
+
+from komapy.chart import Chart
+from komapy.exceptions import ChartError
+from komapy.live import LiveChart
+
+from mockchart import MockChart, create_config, create_series
+
+samples = pd.DataFrame({
+    'timestamp': pd.date_range('2019-10-01', periods=2000, freq='min'),
+    'rsam': [float(i % 50) for i in range(2000)],
+})
+
+
+class StreamChart(MockChart):
+
+    received = 100
+
+    def get_dataset(self, series):
+        return samples.iloc[:self.received]
+
+
+class LiveChartTest(unittest.TestCase):
+
+    def create_chart(self, fixed_limits=True):
+        series = create_series(
+            'rsam_seismic', ['timestamp', 'rsam'],
+            query_params={'timestamp__gte': '2019-10-01'})
+        if fixed_limits:
+            series.update({
+                'xlimit': [samples['timestamp'].iloc[0],
+                           samples['timestamp'].iloc[-1]],
+                'ylimit': [0, 50],
+            })
+
+        StreamChart.received = 100
+        return StreamChart(create_config(series, extensions={
+            'starttime': '2019-10-01',
+            'endtime': '2019-10-03',
+            'plot': [
+                {
+                    'name': 'komapy.extensions.plot_dome_appearance',
+                }
+            ]
+        }))
+
+    def test_live_updates_use_blitting(self):
+        chart = self.create_chart()
+        live = LiveChart(chart)
+        live.setup()
+        self.assertEqual(live.num_full_draws, 1)
+        self.assertIsNotNone(live.background)
+
+        start = time.monotonic()
+        for _ in range(10):
+            StreamChart.received += 100
+            updated = live.step()
+            self.assertEqual(len(updated), 1)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(live.num_full_draws, 1)
+        self.assertEqual(live.num_updates, 10)
+        self.assertEqual(len(chart.get_data(0)[0]), 1100)
+        # Several updates per second on CPU.
+        self.assertLess(elapsed, 5)
+
+        live.stop()
+        self.assertFalse(chart.axes[0].lines[0].get_animated())
+        chart.clear()
+
+    def test_live_full_draw_on_rescale(self):
+        chart = self.create_chart(fixed_limits=False)
+        live = LiveChart(chart)
+        live.setup()
+
+        StreamChart.received += 100
+        live.step()
+        self.assertEqual(live.num_full_draws, 2)
+
+        live.step()
+        self.assertEqual(live.num_full_draws, 2)
+        live.stop()
+        chart.clear()
+
+    def test_live_chart_without_series(self):
+        chart = Chart({})
+        with self.assertRaises(ChartError):
+            LiveChart(chart).setup()
+        chart.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from komapy.canvas import CanvasPool, canvas_pool
+from komapy.output import (OutputCache, create_config_fingerprint,
+                           create_resource_fingerprint)
+
+from mockchart import FIGURE_OPTIONS, MockChart, create_config, create_series
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def create_chart():
+    chart = MockChart(create_config(
+        create_series(query_params={'station': 'selokopo'}),
+        title='Tiltmeter Selokopo',
+        figure_options=FIGURE_OPTIONS,
+    ))
+    chart.render()
+    return chart
+
+
+class OutputTest(unittest.TestCase):
+
+    def test_to_bytes(self):
+        content = create_chart().to_bytes()
+        self.assertTrue(content.startswith(PNG_SIGNATURE))
+
+        content = create_chart().to_bytes(format='svg')
+        self.assertIn(b'<svg', content)
+
+    def test_write_matches_save(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'chart.png')
+            create_chart().save(filename)
+            with open(filename, 'rb') as fp:
+                saved = fp.read()
+
+        buffer = io.BytesIO()
+        create_chart().write(buffer, format='png')
+        self.assertEqual(buffer.getvalue(), saved)
+
+    def test_canvas_pool_reuse(self):
+        canvas_pool.clear()
+        create_chart().to_bytes()
+        self.assertEqual(canvas_pool.size, 1)
+
+        hits = canvas_pool.hits
+        create_chart().to_bytes()
+        self.assertEqual(canvas_pool.hits, hits + 1)
+        self.assertEqual(canvas_pool.size, 1)
+
+    def test_canvas_pool_maxsize(self):
+        pool = CanvasPool(maxsize=1)
+        first = pool.acquire((10, 10, 72))
+        second = pool.acquire((10, 10, 72))
+        self.assertEqual(pool.misses, 2)
+
+        pool.release((10, 10, 72), first)
+        pool.release((10, 10, 72), second)
+        self.assertEqual(pool.size, 1)
+        self.assertIs(pool.acquire((10, 10, 72)), first)
+        self.assertEqual(pool.hits, 1)
+
+    def test_canvas_restored(self):
+        figure = create_chart().figure
+        original = figure.canvas
+        with canvas_pool.canvas(figure) as canvas:
+            self.assertIs(figure.canvas, canvas)
+            figure.savefig(io.BytesIO(), format='png')
+        self.assertIs(figure.canvas, original)
+        self.assertIsNone(canvas.renderer)
+
+    def test_pooled_renderer_cleared(self):
+        figure = create_chart().figure
+        with CanvasPool().canvas(figure) as canvas:
+            figure.savefig(io.BytesIO(), format='png')
+            renderer = canvas.get_renderer()
+            self.assertTrue(np.asarray(renderer.buffer_rgba())[..., 3].any())
+
+            self.assertIs(canvas.get_renderer(cleared=True), renderer)
+            self.assertFalse(np.asarray(renderer.buffer_rgba())[..., 3].any())
+
+
+class CountingChart(MockChart):
+
+    offset = 0
+
+    def __init__(self, *args, **kwargs):
+        self.num_builds = 0
+        super(CountingChart, self).__init__(*args, **kwargs)
+
+    def get_dataset(self, series):
+        data = super(CountingChart, self).get_dataset(series)
+        data['x'] += self.offset
+        return data
+
+    def _build_chart(self):
+        self.num_builds += 1
+        super(CountingChart, self)._build_chart()
+
+
+class OutputCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.output_cache = OutputCache(
+            os.path.join(self.tempdir.name, 'cache'))
+        self.config = create_chart().config
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def save(self, name, offset=0, config=None, output_cache=None):
+        chart = CountingChart(config or self.config,
+                              output_cache=output_cache or self.output_cache)
+        chart.offset = offset
+        filename = os.path.join(self.tempdir.name, name)
+        chart.save(filename)
+        with open(filename, 'rb') as fp:
+            return chart, fp.read()
+
+    def test_unchanged_chart_is_not_plotted(self):
+        chart, first = self.save('first.png')
+        self.assertEqual(chart.num_builds, 1)
+        self.assertEqual(self.output_cache.report(),
+                         {'hits': 0, 'misses': 1})
+
+        chart, second = self.save('second.png')
+        self.assertEqual(chart.num_builds, 0)
+        self.assertIsNone(chart.figure)
+        self.assertEqual(second, first)
+        self.assertEqual(self.output_cache.report(),
+                         {'hits': 1, 'misses': 1})
+
+    def test_changed_data_is_plotted(self):
+        self.save('first.png')
+        chart, _ = self.save('second.png', offset=1)
+        self.assertEqual(chart.num_builds, 1)
+        self.assertEqual(self.output_cache.misses, 2)
+
+    def test_rendered_chart_uses_fetched_resources(self):
+        self.save('first.png')
+
+        chart = CountingChart(self.config, output_cache=self.output_cache)
+        chart.render()
+        chart.save(os.path.join(self.tempdir.name, 'second.png'))
+        self.assertEqual(self.output_cache.hits, 1)
+
+    def test_link_cached_file(self):
+        output_cache = OutputCache(self.output_cache.directory, link=True)
+        self.save('first.png', output_cache=output_cache)
+        self.save('second.png', output_cache=output_cache)
+        self.assertEqual(output_cache.hits, 1)
+
+        stat = os.stat(os.path.join(self.tempdir.name, 'second.png'))
+        self.assertEqual(stat.st_nlink, 2)
+
+    def test_config_fingerprint_is_normalized(self):
+        self.assertEqual(
+            create_config_fingerprint({'a': 1, 'b': {'c': 2, 'd': 3}}),
+            create_config_fingerprint({'b': {'d': 3, 'c': 2}, 'a': 1}))
+        self.assertNotEqual(
+            create_config_fingerprint({'a': 1}),
+            create_config_fingerprint({'a': '1'}))
+
+    def test_config_fingerprint_is_stable_across_processes(self):
+        code = '\n'.join([
+            'import functools',
+            'from komapy.output import create_config_fingerprint',
+            'from komapy.processing import empty_dataframe',
+            'print(create_config_fingerprint({',
+            '    "fields": [empty_dataframe, functools.partial(round)],',
+            '}))',
+        ])
+        fingerprints = set()
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, '-c', code], cwd=BASE_DIR,
+                stdout=subprocess.PIPE, universal_newlines=True, check=True)
+            fingerprints.add(result.stdout.strip())
+        self.assertEqual(len(fingerprints), 1)
+
+    def test_resource_fingerprint(self):
+        data = pd.DataFrame({'x': range(10)})
+        self.assertEqual(create_resource_fingerprint(data),
+                         create_resource_fingerprint(data.copy()))
+        self.assertNotEqual(create_resource_fingerprint(data),
+                            create_resource_fingerprint(data + 1))
+        self.assertNotEqual(create_resource_fingerprint(data),
+                            create_resource_fingerprint(data.astype(float)))
+
+
+if __name__ == '__main__':
+    unittest.main()
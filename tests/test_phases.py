@@ -0,0 +1,133 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from matplotlib.figure import Figure
+
+from komapy.addons import plot_activity_phases
+from komapy.constants import get_phase_dates
+from komapy.exceptions import ChartError
+from komapy.extensions import plot_activity_phases_vertical_line
+from komapy.phases import (PhaseRegistry, get_phase_registry,
+                           reset_phase_registry)
+from komapy.settings import app_settings
+
+
+def date(*args):
+    return datetime.datetime(*args)
+
+
+class PhaseRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = PhaseRegistry([
+            ['2019-01-01', '2019-02-01', 'A'],
+            ['2019-03-01', None, 'C'],
+            ['2019-02-01', '2019-03-01', 'B'],
+        ])
+
+    def test_sorted_phases(self):
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(self.registry.as_list(), [
+            [date(2019, 1, 1), date(2019, 2, 1), 'A'],
+            [date(2019, 2, 1), date(2019, 3, 1), 'B'],
+            [date(2019, 3, 1), None, 'C'],
+        ])
+
+    def test_get_phases(self):
+        self.assertEqual(
+            self.registry.get_phases(date(2019, 1, 15), date(2019, 4, 1)), [
+                [date(2019, 1, 15), date(2019, 2, 1), 'A'],
+                [date(2019, 2, 1), date(2019, 3, 1), 'B'],
+                [date(2019, 3, 1), date(2019, 4, 1), 'C'],
+            ])
+
+        # Time range within a single phase.
+        self.assertEqual(
+            self.registry.get_phases(date(2019, 2, 5), date(2019, 2, 10)),
+            [[date(2019, 2, 5), date(2019, 2, 10), 'B']])
+
+        self.assertEqual(
+            self.registry.get_phases(date(2018, 1, 1), date(2018, 6, 1)), [])
+
+    def test_get_boundaries(self):
+        self.assertEqual(
+            self.registry.get_boundaries(date(2019, 1, 1), date(2019, 3, 1)),
+            [date(2019, 1, 1), date(2019, 2, 1), date(2019, 3, 1)])
+        self.assertEqual(
+            self.registry.get_boundaries(date(2019, 1, 2), date(2019, 2, 28)),
+            [date(2019, 2, 1)])
+
+    def test_overlapping_phase(self):
+        with self.assertRaises(ChartError):
+            self.registry.add('2019-01-15', '2019-01-20', 'X')
+        with self.assertRaises(ChartError):
+            self.registry.add('2018-12-01', '2019-01-02', 'X')
+        with self.assertRaises(ChartError):
+            self.registry.add('2019-06-01', '2019-07-01', 'X')
+
+        self.registry.add('2018-12-01', '2019-01-01', 'X')
+        self.assertEqual(len(self.registry), 4)
+
+
+class PhaseSettingsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_phases = app_settings.ACTIVITY_PHASES
+        reset_phase_registry()
+
+    def tearDown(self):
+        app_settings.ACTIVITY_PHASES = self.saved_phases
+        reset_phase_registry()
+
+    def test_default_phases(self):
+        registry = get_phase_registry()
+        self.assertIs(get_phase_registry(), registry)
+        self.assertEqual(len(registry), 7)
+        self.assertEqual(
+            registry.get_boundaries(date(2018, 5, 1), date(2018, 7, 1)),
+            [date(2018, 5, 11), date(2018, 6, 1), date(2018, 7, 1)])
+
+        phase_dates = get_phase_dates()
+        self.assertEqual(phase_dates[0][0], date(2012, 7, 15))
+        self.assertEqual(phase_dates[-1][2], 'VII')
+        self.assertLessEqual(phase_dates[-1][1], datetime.datetime.now())
+
+    def test_phases_from_settings(self):
+        app_settings.ACTIVITY_PHASES = [['2020-01-01', None, 'I']]
+        self.assertEqual(get_phase_registry().as_list(),
+                         [[date(2020, 1, 1), None, 'I']])
+
+    def test_phases_from_file(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            json.dump([['2020-01-01', '2020-06-01', 'I'],
+                       ['2020-06-01', None, 'II']], f)
+
+        app_settings.ACTIVITY_PHASES = path
+        self.assertEqual(
+            [item[2] for item in get_phase_registry()], ['I', 'II'])
+
+
+class PhasePlotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.axis = Figure().subplots()
+
+    def test_plot_activity_phases(self):
+        plot_activity_phases(self.axis, starttime='2018-05-01',
+                             endtime='2018-06-15', labels=['I'])
+        self.assertEqual([text.get_text() for text in self.axis.texts],
+                         ['I', 'II', 'III'])
+
+    def test_plot_activity_phases_vertical_line(self):
+        plot_activity_phases_vertical_line(
+            self.axis, date(2018, 5, 1), date(2018, 8, 12))
+        self.assertEqual(len(self.axis.lines), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from mockchart import MockChart, create_config, create_dataset, create_series
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(BASE_DIR, 'fixtures')
+
+
+def create_station_series(station, field, **kwargs):
+    return create_series(
+        fields=['timestamp', field],
+        query_params={'station': station, 'timestamp__gte': '2019-10-01',
+                      'size': 10},
+        **kwargs)
+
+
+def get_stations(chart):
+    return sorted(series.query_params['station']
+                  for series, _ in chart.requests)
+
+
+def create_plan_config():
+    return create_config(
+        create_station_series('selokopo', 'x'),
+        [
+            create_station_series('selokopo', 'y', aggregations=[
+                {'func': 'cumsum', 'field': 'y'},
+            ]),
+            create_station_series('babadan', 'x'),
+        ],
+    )
+
+
+class ExecutionPlanTest(unittest.TestCase):
+
+    def test_identical_sources_are_merged(self):
+        chart = MockChart(create_plan_config())
+        plan = chart.plan
+
+        self.assertEqual(len(plan.get_nodes('fetch')), 2)
+        self.assertEqual(len(plan.get_nodes('resolve')), 3)
+        self.assertEqual(len(plan.get_nodes('aggregate')), 1)
+        self.assertEqual(len(plan.get_nodes('plot')), 3)
+        self.assertEqual(plan.num_merged, 1)
+
+        aggregate = plan.get_nodes('aggregate')[0]
+        self.assertEqual(
+            [node.kind for node in aggregate.inputs], ['resolve', 'fetch'])
+
+    def test_render_fetches_each_source_once(self):
+        chart = MockChart(create_plan_config())
+        chart.render()
+        self.assertEqual(get_stations(chart), ['babadan', 'selokopo'])
+
+        dataset = create_dataset(10)
+        x = chart.get_data(0)[1]
+        y = chart.get_data(1)[1]
+        self.assertEqual(list(x), list(dataset['x']))
+        self.assertEqual(list(y), list(dataset['y'].cumsum()))
+        chart.clear()
+
+    def test_plan_is_reused_across_renders(self):
+        chart = MockChart(create_plan_config())
+        plan = chart.plan
+        chart.render()
+        chart.render()
+        self.assertIs(chart.plan, plan)
+        self.assertEqual(len(chart.requests), 4)
+        chart.clear()
+
+    def test_execute_plan(self):
+        chart = MockChart(create_plan_config())
+        results = chart.plan.execute()
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(chart.requests), 2)
+
+    def test_describe_plan(self):
+        chart = MockChart(create_plan_config())
+        description = chart.plan.describe()
+        self.assertIn('aggregate series[1] <- series[1], ', description)
+        self.assertIn('plot series[2] <- series[2]', description)
+
+        data = chart.plan.as_dict()
+        self.assertEqual(len(data['nodes']), 9)
+        self.assertEqual(data['num_merged'], 1)
+
+    def test_callable_fields_have_no_inputs(self):
+        chart = MockChart({
+            'layout': {
+                'data': [
+                    {'series': {'fields': lambda axis: None}},
+                ]
+            }
+        })
+        nodes = chart.plan.get_nodes()
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(nodes[0].kind, 'plot')
+        self.assertEqual(nodes[0].inputs, [])
+
+
+class SlowChart(MockChart):
+
+    def __init__(self, *args, **kwargs):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        super(SlowChart, self).__init__(*args, **kwargs)
+
+    def _fetch_resource(self, series, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return super(SlowChart, self)._fetch_resource(series, **kwargs)
+
+
+class ChartResolveTest(unittest.TestCase):
+
+    def test_resolve_matches_render(self):
+        chart = MockChart(create_plan_config())
+        resolved = chart.resolve()
+        self.assertIs(chart.get_series_and_data(), resolved)
+        self.assertIsNone(chart.figure)
+
+        rendered = MockChart(create_plan_config())
+        rendered.render()
+        self.assertEqual(len(resolved), len(rendered.data))
+        for (_, data), (_, expected) in zip(resolved, rendered.data):
+            for item, expected_item in zip(data, expected):
+                self.assertEqual(list(item), list(expected_item))
+        rendered.clear()
+
+    def test_resolve_skips_extension_data(self):
+        config = create_plan_config()
+        config['extensions'] = {
+            'starttime': '2019-10-01',
+            'endtime': '2019-11-01',
+            'plot': [{'name': 'explosion'}],
+        }
+        chart = MockChart(config)
+        resolved = chart.resolve()
+        self.assertEqual(chart.extension_requests, [])
+        self.assertEqual(len(resolved), 3)
+        self.assertEqual(get_stations(chart), ['babadan', 'selokopo'])
+
+        chart.render()
+        self.assertEqual(len(chart.extension_requests), 1)
+        chart.clear()
+
+    def test_resolve_sources_concurrently(self):
+        config = create_config(*[
+            create_station_series(station, 'x')
+            for station in ['selokopo', 'babadan', 'jurangjero']
+        ])
+        chart = SlowChart(config)
+        chart.resolve(max_workers=3)
+        self.assertEqual(chart.max_active, 3)
+        self.assertEqual(len(chart.requests), 3)
+
+        chart = SlowChart(config)
+        chart.resolve(max_workers=1)
+        self.assertEqual(chart.max_active, 1)
+
+    def test_resolve_does_not_import_pyplot(self):
+        config = {
+            'layout': {
+                'data': [
+                    {
+                        'series': {
+                            'csv': os.path.join(
+                                FIXTURE_DIR, 'tiltmeter_selokopo.csv'),
+                            'fields': ['timestamp', 'x'],
+                            'xaxis_date': True,
+                            'aggregations': [{'func': 'cumsum',
+                                              'field': 'x'}],
+                        }
+                    }
+                ]
+            }
+        }
+        code = '\n'.join([
+            'import json, sys',
+            'from komapy.chart import Chart',
+            'data = Chart(json.loads(sys.argv[1])).resolve()',
+            'print(len(data[0][1][1]), "matplotlib.pyplot" in sys.modules)',
+        ])
+        result = subprocess.run(
+            [sys.executable, '-c', code, json.dumps(config)], cwd=BASE_DIR,
+            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+        size, imported = result.stdout.split()
+        self.assertGreater(int(size), 0)
+        self.assertEqual(imported, 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import time
+import unittest
+
+from komapy.exceptions import ChartError
+from komapy.series import Series
+
+from mockchart import MockChart, create_config, create_series
+
+NUM_DENSE_POINTS = 20000
+
+
+def create_chart(rasterize=None, series_rasterize=None):
+    config = create_config([
+        create_series('rsam_seismic', ['x', 'y'], type='scatter',
+                      query_params={'size': NUM_DENSE_POINTS},
+                      rasterize=series_rasterize),
+        create_series('rsam_seismic', ['x', 'y'],
+                      query_params={'size': 100}),
+    ])
+    if rasterize is not None:
+        config['rasterize'] = rasterize
+    chart = MockChart(config)
+    chart.render()
+    return chart
+
+
+def get_rasterized(chart):
+    return [
+        artists[0].get_rasterized() if isinstance(artists, list)
+        else artists.get_rasterized()
+        for _, _, artists in chart._series_artists
+    ]
+
+
+def save_svg(chart):
+    start = time.monotonic()
+    content = chart.to_bytes(format='svg')
+    return content, time.monotonic() - start
+
+
+class RasterizeTest(unittest.TestCase):
+
+    def test_no_policy(self):
+        chart = create_chart()
+        self.assertEqual(get_rasterized(chart), [False, False])
+
+    def test_threshold(self):
+        chart = create_chart(rasterize={'threshold': 10000})
+        self.assertEqual(get_rasterized(chart), [True, False])
+
+    def test_series_policy(self):
+        chart = create_chart(rasterize={'threshold': 10000},
+                             series_rasterize=False)
+        self.assertEqual(get_rasterized(chart), [False, False])
+
+        chart = create_chart(series_rasterize=100)
+        self.assertEqual(get_rasterized(chart), [True, False])
+
+    def test_vector_output_size(self):
+        vector, _ = save_svg(create_chart())
+        mixed, _ = save_svg(
+            create_chart(rasterize={'threshold': 10000, 'dpi': 72}))
+
+        self.assertIn(b'<image', mixed)
+        self.assertNotIn(b'<image', vector)
+        self.assertLess(len(mixed) * 10, len(vector))
+
+    def test_validate_rasterize(self):
+        with self.assertRaises(ChartError):
+            Series(fields=['x', 'y'], rasterize='yes').validate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import tempfile
+import time
+import unittest
+
+from komapy import recorder
+from komapy.client import fetch_bma_as_dictionary, fetch_url_as_dictionary
+from komapy.exceptions import FetchError
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+
+
+class RecorderTestCase(unittest.TestCase):
+
+    setting_names = [
+        'BMA_API_HOST',
+        'BMA_API_PROTOCOL',
+        'IGNORE_BMA_REQUEST_CACHE',
+        'RESPONSE_STORE',
+        'RESPONSE_STORE_MODE',
+        'RESPONSE_STORE_REPLAY_LATENCY',
+    ]
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        self.tempdir = tempfile.TemporaryDirectory()
+        app_settings.RESPONSE_STORE = self.tempdir.name
+
+        self.body = [{'timestamp': '2019-10-01', 'x': 1.5}]
+        self.server = FakeServer(FakeResponse(self.body)).start()
+        app_settings.BMA_API_HOST = self.server.host
+        app_settings.BMA_API_PROTOCOL = 'http'
+
+    def tearDown(self):
+        self.server.stop()
+        self.tempdir.cleanup()
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+
+
+class RecordReplayTest(RecorderTestCase):
+
+    def test_record_and_replay_bma(self):
+        app_settings.IGNORE_BMA_REQUEST_CACHE = True
+        app_settings.RESPONSE_STORE_MODE = 'record'
+        data = fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+        self.assertEqual(data, self.body)
+        self.assertEqual(len(self.server.requests), 1)
+
+        app_settings.RESPONSE_STORE_MODE = 'replay'
+        data = fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+        self.assertEqual(data, self.body)
+        self.assertEqual(len(self.server.requests), 1)
+
+        with self.assertRaises(FetchError):
+            fetch_bma_as_dictionary('tiltmeter', station='pasarbubar')
+
+    def test_record_and_replay_url(self):
+        app_settings.RESPONSE_STORE_MODE = 'record'
+        fetch_url_as_dictionary(self.server.url, page=1)
+
+        app_settings.RESPONSE_STORE_MODE = 'replay'
+        self.assertEqual(
+            fetch_url_as_dictionary(self.server.url, page=1), self.body)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_replay_with_original_latency(self):
+        store = recorder.get_response_store()
+        store.save('bma', 'edm', {'benchmark': 'BAB0'}, self.body,
+                   latency=0.3)
+
+        app_settings.RESPONSE_STORE_MODE = 'replay'
+        start = time.monotonic()
+        fetch_bma_as_dictionary('edm', benchmark='BAB0')
+        self.assertLess(time.monotonic() - start, 0.3)
+
+        app_settings.RESPONSE_STORE_REPLAY_LATENCY = True
+        start = time.monotonic()
+        fetch_bma_as_dictionary('edm', benchmark='BAB0')
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_fallback_to_stored_response(self):
+        app_settings.RESPONSE_STORE_MODE = 'fallback'
+        fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+
+        self.server.default = FakeResponse(status=404)
+        data = fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+        self.assertEqual(data, self.body)
+        self.assertEqual(len(self.server.requests), 2)
+
+        with self.assertRaises(Exception):
+            fetch_bma_as_dictionary('tiltmeter', station='pasarbubar')
+
+
+class ResponseStoreTest(unittest.TestCase):
+
+    def test_volatile_params_ignored(self):
+        key = recorder.ResponseStore.create_key(
+            'bma', 'bulletin', {'eventtype': 'VTA', 'rv': 'abc'})
+        other_key = recorder.ResponseStore.create_key(
+            'bma', 'bulletin', {'eventtype': 'VTA', 'rv': 'def'})
+        self.assertEqual(key, other_key)
+
+        other_key = recorder.ResponseStore.create_key(
+            'bma', 'bulletin', {'eventtype': 'VTB'})
+        self.assertNotEqual(key, other_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
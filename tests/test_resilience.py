@@ -0,0 +1,208 @@
+import threading
+import time
+import unittest
+from urllib.error import HTTPError
+
+from komapy import resilience
+from komapy.client import fetch_bma_as_dictionary, fetch_url_as_dictionary
+from komapy.exceptions import FetchTimeoutError
+from komapy.governor import reset_limiters
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+
+
+class ResilienceTestCase(unittest.TestCase):
+
+    setting_names = [
+        'BMA_API_HOST',
+        'BMA_API_PROTOCOL',
+        'REQUEST_BACKOFF_FACTOR',
+        'REQUEST_HEDGE_MIN_SAMPLES',
+        'REQUEST_HEDGE_PERCENTILE',
+        'REQUEST_MAX_RETRIES',
+        'REQUEST_RATE_LIMITS',
+        'REQUEST_TIMEOUT',
+    ]
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        app_settings.REQUEST_BACKOFF_FACTOR = 0.01
+        resilience.reset_latency_histograms()
+        reset_limiters()
+
+        self.server = FakeServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+
+
+class RetryTest(ResilienceTestCase):
+
+    def test_retry_url_on_server_error(self):
+        app_settings.REQUEST_MAX_RETRIES = 2
+        self.server.enqueue(FakeResponse(status=503), FakeResponse(status=500))
+        self.server.default = FakeResponse([{'value': 1}])
+
+        data = fetch_url_as_dictionary(self.server.url, page=1)
+        self.assertEqual(data, [{'value': 1}])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retry_limit_exceeded(self):
+        app_settings.REQUEST_MAX_RETRIES = 1
+        self.server.default = FakeResponse(status=502)
+
+        with self.assertRaises(HTTPError):
+            fetch_url_as_dictionary(self.server.url)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_no_retry_on_client_error(self):
+        app_settings.REQUEST_MAX_RETRIES = 3
+        self.server.default = FakeResponse(status=404)
+
+        with self.assertRaises(HTTPError):
+            fetch_url_as_dictionary(self.server.url)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retry_bma_on_server_error(self):
+        app_settings.BMA_API_HOST = self.server.host
+        app_settings.BMA_API_PROTOCOL = 'http'
+        app_settings.REQUEST_MAX_RETRIES = 1
+        self.server.enqueue(FakeResponse(status=500))
+        self.server.default = FakeResponse([{'eventtype': 'VTA'}])
+
+        data = fetch_bma_as_dictionary('bulletin', eventtype='VTA')
+        self.assertEqual(data, [{'eventtype': 'VTA'}])
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertTrue(
+            self.server.requests[0]['path'].startswith('/api/v1/bulletin/'))
+        self.assertEqual(
+            resilience.get_latency_histogram('bulletin').count, 1)
+
+
+class TimeoutTest(ResilienceTestCase):
+
+    def test_request_timeout(self):
+        start = time.monotonic()
+        with self.assertRaises(FetchTimeoutError):
+            resilience.call_with_resilience(
+                'slow', lambda: time.sleep(1), timeout=0.2)
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_retry_after_timeout(self):
+        app_settings.REQUEST_TIMEOUT = 0.3
+        app_settings.REQUEST_MAX_RETRIES = 1
+        self.server.enqueue(FakeResponse(delay=0.5))
+        self.server.default = FakeResponse({'ok': True})
+
+        data = fetch_url_as_dictionary(self.server.url)
+        self.assertEqual(data, {'ok': True})
+
+        # Let the timed out request finish in the background.
+        time.sleep(0.5)
+
+    def test_hanging_requests_do_not_block_other_requests(self):
+        hung = threading.Event()
+        healthy = []
+
+        def hang():
+            hung.wait(5)
+
+        def succeed():
+            healthy.append(True)
+            return 'ok'
+
+        # More hanging requests than any bounded worker pool would hold.
+        for _ in range(10):
+            with self.assertRaises(FetchTimeoutError):
+                resilience.call_with_resilience('hang', hang, timeout=0.05)
+
+        start = time.monotonic()
+        result = resilience.call_with_resilience(
+            'healthy', succeed, timeout=1.0)
+        self.assertEqual(result, 'ok')
+        self.assertEqual(healthy, [True])
+        self.assertLess(time.monotonic() - start, 0.5)
+        hung.set()
+
+    def test_bma_request_socket_timeout(self):
+        app_settings.REQUEST_TIMEOUT = 0.2
+        app_settings.BMA_API_HOST = self.server.host
+        app_settings.BMA_API_PROTOCOL = 'http'
+        self.server.default = FakeResponse([], delay=2)
+
+        start = time.monotonic()
+        with self.assertRaises(FetchTimeoutError):
+            fetch_bma_as_dictionary('tiltmeter', station='selokopo')
+
+        # Abandoned attempt is closed by the socket timeout instead of
+        # waiting for the server.
+        while any(thread.name == 'komapy-request'
+                  for thread in threading.enumerate()):
+            self.assertLess(time.monotonic() - start, 1.5)
+            time.sleep(0.02)
+
+
+class HedgedRequestTest(ResilienceTestCase):
+
+    def test_hedged_request_wins(self):
+        histogram = resilience.get_latency_histogram(self.server.host)
+        for _ in range(20):
+            histogram.record(0.05)
+
+        app_settings.REQUEST_HEDGE_PERCENTILE = 95
+        app_settings.REQUEST_HEDGE_MIN_SAMPLES = 20
+        self.server.enqueue(FakeResponse({'slow': True}, delay=1))
+        self.server.default = FakeResponse({'slow': False})
+
+        start = time.monotonic()
+        data = fetch_url_as_dictionary(self.server.url)
+        elapsed = time.monotonic() - start
+        self.assertEqual(data, {'slow': False})
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(len(self.server.requests), 2)
+
+        # Let the slow request finish in the background.
+        time.sleep(1.2 - elapsed)
+
+    def test_hedge_skipped_without_free_slot(self):
+        histogram = resilience.get_latency_histogram(self.server.host)
+        for _ in range(20):
+            histogram.record(0.05)
+
+        app_settings.REQUEST_HEDGE_PERCENTILE = 95
+        app_settings.REQUEST_HEDGE_MIN_SAMPLES = 20
+        app_settings.REQUEST_RATE_LIMITS = {
+            self.server.host: {'max_in_flight': 1}}
+        self.server.enqueue(FakeResponse({'slow': True}, delay=0.3))
+        self.server.default = FakeResponse({'slow': False})
+
+        data = fetch_url_as_dictionary(self.server.url)
+        self.assertEqual(data, {'slow': True})
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_percentile(self):
+        histogram = resilience.LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+
+        for value in [0.1, 0.2, 0.3, 0.4, 5.0]:
+            histogram.record(value)
+
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.percentile(50), 0.3)
+        self.assertEqual(histogram.percentile(100), 5.0)
+        self.assertAlmostEqual(histogram.mean, 1.2)
+
+        buckets = dict(histogram.as_dict()['buckets'])
+        self.assertEqual(buckets[0.1], 1)
+        self.assertEqual(buckets[5.0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from komapy.cli import create_parser
+from komapy.server import RenderServer
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+CONFIG = {
+    'title': 'Tiltmeter Selokopo',
+    'figure_options': {'figsize': (4, 3), 'dpi': 50},
+    'layout': {
+        'data': [
+            {
+                'series': {
+                    'name': 'tiltmeter',
+                    'query_params': {'station': 'selokopo'},
+                    'fields': ['timestamp', 'x'],
+                    'xaxis_date': True,
+                }
+            }
+        ]
+    }
+}
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, path):
+        super(UnixHTTPConnection, self).__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+class RenderServerTest(unittest.TestCase):
+
+    setting_names = ['BMA_API_HOST', 'BMA_API_PROTOCOL']
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        body = [
+            {'timestamp': '2019-10-01 {:02d}:00:00'.format(i), 'x': i * 0.5}
+            for i in range(24)
+        ]
+        self.bma = FakeServer(FakeResponse(body)).start()
+        app_settings.BMA_API_HOST = self.bma.host
+        app_settings.BMA_API_PROTOCOL = 'http'
+
+    def tearDown(self):
+        self.bma.stop()
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+
+    def request(self, connection, method, path, body=None):
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, response.getheader('Content-Type'), \
+            response.read()
+
+    def test_render_with_warm_cache(self):
+        with RenderServer(port=0, workers=2) as server:
+            connection = http.client.HTTPConnection(server.address)
+            body = json.dumps(CONFIG)
+
+            status, content_type, content = self.request(
+                connection, 'POST', '/render', body)
+            self.assertEqual(status, 200)
+            self.assertEqual(content_type, 'image/png')
+            self.assertTrue(content.startswith(PNG_SIGNATURE))
+            self.assertEqual(len(self.bma.requests), 1)
+
+            status, content_type, content = self.request(
+                connection, 'POST', '/render?format=svg', body)
+            self.assertEqual(status, 200)
+            self.assertEqual(content_type, 'image/svg+xml')
+            self.assertIn(b'<svg', content)
+            # Resource is served from the shared cache.
+            self.assertEqual(len(self.bma.requests), 1)
+
+            status, _, content = self.request(connection, 'GET', '/metrics')
+            metrics = json.loads(content.decode('utf-8'))
+            self.assertEqual(status, 200)
+            self.assertEqual(metrics['queue_depth'], 0)
+            self.assertEqual(metrics['active'], 0)
+            self.assertEqual(metrics['completed'], 2)
+            self.assertEqual(metrics['latency']['count'], 2)
+            connection.close()
+
+    def test_render_errors(self):
+        with RenderServer(port=0, workers=1) as server:
+            connection = http.client.HTTPConnection(server.address)
+
+            status, _, _ = self.request(
+                connection, 'POST', '/render', b'not json')
+            self.assertEqual(status, 400)
+
+            config = dict(CONFIG, layout={'type': 'grid', 'data': [{}]})
+            status, _, _ = self.request(
+                connection, 'POST', '/render', json.dumps(config))
+            self.assertEqual(status, 400)
+
+            status, _, _ = self.request(connection, 'GET', '/unknown')
+            self.assertEqual(status, 404)
+            connection.close()
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, 'komapy.sock')
+            with RenderServer(socket_path=path, cache_ttl=0) as server:
+                connection = UnixHTTPConnection(server.address)
+                status, _, content = self.request(
+                    connection, 'POST', '/render', json.dumps(CONFIG))
+                self.assertEqual(status, 200)
+                self.assertTrue(content.startswith(PNG_SIGNATURE))
+
+                status, _, content = self.request(
+                    connection, 'GET', '/health')
+                self.assertEqual(status, 200)
+                connection.close()
+            self.assertFalse(os.path.exists(path))
+
+    def test_serve_command(self):
+        args = create_parser().parse_args(
+            ['serve', '--port', '0', '-w', '2', '--cache-ttl', '30'])
+        self.assertEqual(args.port, 0)
+        self.assertEqual(args.workers, 2)
+        self.assertEqual(args.cache_ttl, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
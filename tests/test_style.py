@@ -0,0 +1,97 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+
+from komapy.style import (clear_styles, resolve_style, style_context,
+                          style_gate, styles)
+
+from mockchart import MockChart, create_config, create_series
+
+
+def create_chart(theme=None, rc_params=None):
+    return MockChart(create_config(
+        create_series(query_params={'station': 'selokopo'},
+                      xaxis_date=False),
+        theme=theme,
+        rc_params=rc_params or {},
+    ))
+
+
+def render_linewidth(linewidth):
+    chart = create_chart(rc_params={'lines.linewidth': linewidth})
+    chart.render()
+    chart.to_bytes()
+    return chart.axes[0].get_lines()[0].get_linewidth()
+
+
+class StyleTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_styles()
+
+    def test_rc_params_do_not_leak(self):
+        linewidth = matplotlib.rcParams['lines.linewidth']
+        self.assertEqual(render_linewidth(5), 5)
+        self.assertEqual(matplotlib.rcParams['lines.linewidth'], linewidth)
+
+    def test_theme_does_not_leak(self):
+        facecolor = matplotlib.rcParams['axes.facecolor']
+        chart = create_chart(theme='ggplot')
+        chart.render()
+        self.assertEqual(
+            matplotlib.colors.to_hex(chart.axes[0].get_facecolor()),
+            '#e5e5e5')
+        self.assertEqual(matplotlib.rcParams['axes.facecolor'], facecolor)
+
+    def test_rc_params_override_theme(self):
+        style = resolve_style('ggplot', {'axes.facecolor': 'white'})
+        self.assertEqual(style['axes.facecolor'], 'white')
+        self.assertEqual(style['axes.edgecolor'], 'white')
+
+    def test_unknown_theme(self):
+        self.assertEqual(resolve_style('unknown-theme'), {})
+
+    def test_resolved_style_is_cached(self):
+        style = resolve_style('ggplot', {'font.size': 14})
+        self.assertIs(resolve_style('ggplot', {'font.size': 14}), style)
+        self.assertEqual(len(styles), 1)
+
+    def test_concurrent_styles(self):
+        linewidths = [1, 2, 3, 4] * 4
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(render_linewidth, linewidths))
+        self.assertEqual(results, linewidths)
+
+    def test_same_style_is_not_serialized(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def enter(linewidth):
+            with style_context(rc_params={'lines.linewidth': linewidth}):
+                barrier.wait()
+                return matplotlib.rcParams['lines.linewidth']
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(enter, [7, 7]))
+        self.assertEqual(results, [7, 7])
+        self.assertEqual(style_gate.holders, 0)
+
+    def test_different_style_waits(self):
+        entered = threading.Event()
+
+        def enter():
+            with style_context(rc_params={'lines.linewidth': 8}):
+                entered.set()
+
+        with style_context(rc_params={'lines.linewidth': 7}):
+            thread = threading.Thread(target=enter)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+            self.assertEqual(matplotlib.rcParams['lines.linewidth'], 7)
+        thread.join()
+        self.assertTrue(entered.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from komapy.template import FigureTemplate
+
+from mockchart import MockChart, create_config, create_dataset, create_series
+
+datasets = []
+
+
+class TemplateChart(MockChart):
+
+    def get_dataset(self, series):
+        return datasets[-1]
+
+
+class FigureTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        series = create_series(query_params={'station': 'selokopo'})
+        self.config = create_config(
+            {
+                'series': [
+                    dict(series, plot_params={'label': 'X'},
+                         labels={'y': {'text': 'X (µrad)'}}),
+                    dict(series, fields=['timestamp', 'y'], secondary='x',
+                         type='step'),
+                ],
+                'legend': {'show': True},
+            },
+            dict(series, fields=['timestamp', 'y']),
+            title='Tiltmeter Selokopo',
+            tight_layout={'pad': 1},
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+        del datasets[:]
+
+    def read_file(self, filename):
+        with open(filename, 'rb') as fp:
+            return fp.read()
+
+    def render_full(self, name):
+        path = os.path.join(self.tempdir.name, name)
+        chart = TemplateChart(self.config)
+        chart.render()
+        chart.save(path)
+        chart.clear()
+        return self.read_file(path)
+
+    def test_template_output_identical_to_full_render(self):
+        template = FigureTemplate(self.config, chart_class=TemplateChart)
+
+        for index, offset in enumerate([0, 100, -50]):
+            datasets.append(create_dataset(48, offset))
+            path = os.path.join(self.tempdir.name, 'template.png')
+            template.render()
+            template.save(path)
+
+            expected = self.render_full('full-{}.png'.format(index))
+            self.assertEqual(self.read_file(path), expected)
+
+        self.assertEqual(template.num_builds, 1)
+        self.assertEqual(template.num_refreshes, 2)
+        template.clear()
+
+    def test_template_refreshes_cached_chart(self):
+        self.config['use_cache'] = True
+        template = FigureTemplate(self.config, chart_class=TemplateChart)
+
+        datasets.append(create_dataset(48).iloc[:10])
+        template.render()
+        datasets.append(create_dataset(48).iloc[:20])
+        template.render()
+        self.assertEqual(template.num_refreshes, 1)
+
+        line = template.chart.axes[1].lines[0]
+        self.assertEqual(len(line.get_xdata()), 20)
+        template.clear()
+
+    def test_template_rebuilds_unrefreshable_chart(self):
+        self.config['layout']['data'][1]['series']['type'] = 'bar'
+        datasets.append(create_dataset(48))
+
+        template = FigureTemplate(self.config, chart_class=TemplateChart)
+        template.render()
+        self.assertFalse(template.chart.is_refreshable)
+        template.render()
+        self.assertEqual(template.num_builds, 2)
+        template.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
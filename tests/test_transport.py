@@ -0,0 +1,174 @@
+import os
+import unittest
+from unittest import mock
+from urllib.error import HTTPError
+
+from komapy import transport
+from komapy.client import fetch_bma_as_dictionary, fetch_url_as_dictionary
+from komapy.settings import app_settings
+
+from fakeserver import FakeResponse, FakeServer
+
+
+class TransportTestCase(unittest.TestCase):
+
+    setting_names = [
+        'BMA_API_HOST',
+        'BMA_API_PROTOCOL',
+        'BMA_HTTP_POOL',
+        'HTTP_COMPRESSION',
+    ]
+
+    def setUp(self):
+        self.saved_settings = dict(
+            (name, getattr(app_settings, name)) for name in self.setting_names)
+        self.body = [{'timestamp': '2019-10-01', 'x': i} for i in range(500)]
+        transport.pool.clear()
+        transport.reset_transfer_stats()
+
+    def tearDown(self):
+        transport.pool.clear()
+        for name, value in self.saved_settings.items():
+            setattr(app_settings, name, value)
+
+
+class CompressedTransferTest(TransportTestCase):
+
+    def test_url_gzip_transfer(self):
+        with FakeServer(FakeResponse(self.body), compress='gzip') as server:
+            data = fetch_url_as_dictionary(server.url, station='selokopo')
+
+            self.assertEqual(data, self.body)
+            accept_encoding = server.requests[0]['headers']['Accept-Encoding']
+            self.assertIn('gzip', accept_encoding)
+            self.assertIn('deflate', accept_encoding)
+
+        stats = transport.get_transfer_stats()
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['bytes_decoded'], stats['bytes_on_wire'])
+
+    def test_url_deflate_transfer(self):
+        with FakeServer(FakeResponse(self.body), compress='deflate') as server:
+            self.assertEqual(fetch_url_as_dictionary(server.url), self.body)
+
+    def test_compression_disabled(self):
+        app_settings.HTTP_COMPRESSION = False
+        with FakeServer(FakeResponse(self.body), compress='gzip') as server:
+            self.assertEqual(fetch_url_as_dictionary(server.url), self.body)
+            self.assertEqual(
+                server.requests[0]['headers']['Accept-Encoding'], 'identity')
+
+        stats = transport.get_transfer_stats()
+        self.assertEqual(stats['bytes_decoded'], stats['bytes_on_wire'])
+
+    def test_raw_deflate_decoder(self):
+        compressor = __import__('zlib').compressobj(wbits=-15)
+        data = compressor.compress(b'komapy' * 100) + compressor.flush()
+        decoder = transport.get_decoder('deflate')
+        decoded = decoder.decompress(data) + decoder.flush()
+        self.assertEqual(decoded, b'komapy' * 100)
+
+
+class ConnectionPoolTest(TransportTestCase):
+
+    def test_url_connection_reused(self):
+        with FakeServer(FakeResponse(self.body), compress='gzip') as server:
+            for _ in range(3):
+                fetch_url_as_dictionary(server.url)
+
+            ports = set(item['client_address'][1] for item in server.requests)
+            self.assertEqual(len(ports), 1)
+
+        stats = transport.get_transfer_stats()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connections_reused'], 2)
+
+    def test_bma_pooled_request(self):
+        with FakeServer(FakeResponse(self.body), compress='gzip') as server:
+            app_settings.BMA_API_HOST = server.host
+            app_settings.BMA_API_PROTOCOL = 'http'
+            app_settings.BMA_HTTP_POOL = True
+
+            for _ in range(2):
+                data = fetch_bma_as_dictionary(
+                    'tiltmeter', station='selokopo', nolimit=True)
+                self.assertEqual(data, self.body)
+
+            request = server.requests[0]
+            self.assertTrue(request['path'].startswith('/api/v1/tiltmeter/'))
+            self.assertIn('/selokopo/?nolimit=true', request['path'])
+            self.assertIn('gzip', request['headers']['Accept-Encoding'])
+
+        stats = transport.get_transfer_stats()
+        self.assertEqual(stats['connections_opened'], 1)
+
+    def test_bma_pooled_request_with_pagination(self):
+        body = {
+            'results': self.body[:2],
+            'links': {'next': 'http://example.com/?page=2', 'previous': None},
+        }
+        with FakeServer(FakeResponse(body)) as server:
+            app_settings.BMA_API_HOST = server.host
+            app_settings.BMA_API_PROTOCOL = 'http'
+
+            app_settings.BMA_HTTP_POOL = False
+            expected = fetch_bma_as_dictionary(
+                'tiltmeter', station='selokopo', page=1)
+            app_settings.BMA_HTTP_POOL = True
+            data = fetch_bma_as_dictionary(
+                'tiltmeter', station='selokopo', page=1)
+
+        self.assertEqual(
+            expected, (self.body[:2], 'http://example.com/?page=2', None))
+        self.assertEqual(data, expected)
+
+
+class RedirectTest(TransportTestCase):
+
+    def test_url_redirect(self):
+        with FakeServer(FakeResponse(self.body)) as server:
+            server.enqueue(
+                FakeResponse(status=301, headers={'Location': '/new'}))
+            data = fetch_url_as_dictionary(server.url + 'old', page=1)
+            self.assertEqual(data, self.body)
+            self.assertEqual([item['path'] for item in server.requests],
+                             ['/old?page=1', '/new'])
+
+    def test_too_many_redirects(self):
+        with FakeServer(FakeResponse(
+                status=302, headers={'Location': '/loop'})) as server:
+            with self.assertRaises(HTTPError):
+                transport.get(server.url)
+            self.assertEqual(
+                len(server.requests), transport.MAX_REDIRECTS + 1)
+
+
+class ProxyTest(TransportTestCase):
+
+    def test_http_proxy(self):
+        with FakeServer(FakeResponse(self.body)) as proxy:
+            environ = {
+                'http_proxy': 'http://user:secret@{}'.format(proxy.host),
+                'no_proxy': '',
+            }
+            with mock.patch.dict(os.environ, environ):
+                data = fetch_url_as_dictionary(
+                    'http://bma.example.com/api/data', page=1)
+
+            self.assertEqual(data, self.body)
+            request = proxy.requests[0]
+            self.assertEqual(
+                request['path'], 'http://bma.example.com/api/data?page=1')
+            self.assertTrue(
+                request['headers']['Proxy-Authorization'].startswith('Basic'))
+
+    def test_no_proxy(self):
+        with mock.patch.dict(os.environ, {'http_proxy': 'proxy:3128',
+                                          'no_proxy': 'localhost'}):
+            self.assertEqual(transport.get_proxy('http', 'example.com'),
+                             'http://proxy:3128')
+            self.assertIsNone(transport.get_proxy('http', 'localhost'))
+
+
+if __name__ == '__main__':
+    unittest.main()
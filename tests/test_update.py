@@ -0,0 +1,110 @@
+import unittest
+
+import pandas as pd
+
+from mockchart import MockChart, create_config, create_series
+
+samples = pd.DataFrame({
+    'timestamp': pd.date_range('2019-10-01', periods=30, freq='h'),
+    'energy': [float(i % 7) for i in range(30)],
+})
+
+
+class StreamChart(MockChart):
+    """
+    Chart whose data source returns samples received so far.
+    """
+
+    received = 10
+
+    def get_dataset(self, series):
+        return samples.iloc[:self.received]
+
+
+def get_since(chart):
+    return [kwargs.get('since') for _, kwargs in chart.requests]
+
+
+class ChartUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+        StreamChart.received = 10
+        series = create_series(
+            'energy', ['timestamp', 'energy'],
+            query_params={'timestamp__gte': '2019-10-01'})
+        self.config = create_config(
+            series,
+            dict(series, aggregations=[{'func': 'cumsum', 'field': 'energy'}]),
+        )
+
+    def test_update_appends_new_samples(self):
+        chart = StreamChart(self.config)
+        chart.render()
+
+        StreamChart.received = 25
+        updated = chart.update()
+        self.assertEqual(len(updated), 2)
+
+        last = samples['timestamp'].iloc[9]
+        self.assertEqual(get_since(chart)[-2:], [last, last])
+
+        x, y = chart.get_data(0)
+        self.assertEqual(len(x), 25)
+        self.assertListEqual(y.tolist(), samples['energy'][:25].tolist())
+
+        x, y = chart.get_data(1)
+        self.assertListEqual(
+            y.tolist(), samples['energy'][:25].cumsum().tolist())
+
+        line = chart.axes[1].lines[0]
+        self.assertEqual(len(line.get_xdata()), 25)
+        self.assertEqual(chart.axes[1].dataLim.y1,
+                         samples['energy'][:25].sum())
+        chart.clear()
+
+    def test_update_without_new_samples(self):
+        chart = StreamChart(self.config)
+        chart.render()
+        self.assertListEqual(chart.update(), [])
+        self.assertEqual(len(chart.get_data(0)[0]), 10)
+        chart.clear()
+
+    def test_update_with_non_carryable_aggregation(self):
+        self.config['layout']['data'][1]['series']['aggregations'].append({
+            'func': 'multiply',
+            'field': 'energy',
+            'params': {'by': 2},
+        })
+        chart = StreamChart(self.config)
+        chart.render()
+
+        StreamChart.received = 20
+        chart.update()
+        self.assertIsNone(get_since(chart)[-1])
+
+        x, y = chart.get_data(1)
+        self.assertListEqual(
+            y.tolist(), (samples['energy'][:20].cumsum() * 2).tolist())
+        chart.clear()
+
+    def test_render_twice_with_series_axis(self):
+        series = create_series(
+            'energy', ['timestamp', 'energy'],
+            query_params={'timestamp__gte': '2019-10-01'})
+        chart = StreamChart(create_config([
+            series,
+            dict(series, secondary='x'),
+            dict(series, axis=1),
+        ]))
+        chart.render()
+        chart.render()
+
+        axes = chart.figure.get_axes()
+        for _, axis, _ in chart._series_artists:
+            self.assertIn(axis, axes)
+        self.assertEqual(len(chart._plotted_axes), 3)
+        chart.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from komapy.exceptions import ChartError
+from komapy.layout import Layout
+from komapy.series import Series
+from komapy.utils import get_validation_methods, get_validators
+
+from mockchart import MockChart, create_config, create_series
+
+
+def create_validation_config(num_series):
+    return create_config([
+        create_series(fields=['x', 'y'], query_params={'index': index})
+        for index in range(num_series)
+    ])
+
+
+class CompiledValidationTest(unittest.TestCase):
+
+    def test_validators_are_cached(self):
+        validators = get_validators(Series)
+        self.assertIs(get_validators(Series), validators)
+        self.assertEqual(
+            [func.__name__ for func in validators],
+            get_validation_methods(Series))
+        self.assertIn(Layout.validate_size, get_validators(Layout))
+
+    def test_validated_series_are_reused(self):
+        chart = MockChart(create_validation_config(50))
+        compiled = [chart._compiled_series[key]
+                    for key, _ in chart._iter_series_params()]
+        self.assertEqual(len(compiled), 50)
+
+        chart.render()
+        self.assertEqual(len(chart.series), 50)
+        for series, expected in zip(chart.series, compiled):
+            self.assertIs(series, expected)
+
+        chart.render()
+        self.assertIs(chart.series[0], compiled[0])
+
+    def test_shared_series_config(self):
+
+        params = create_series(fields=['x', 'y'])
+        chart = MockChart(create_config(params, params))
+        chart.render()
+        self.assertEqual(len(chart.requests), 1)
+        self.assertIsNot(chart.series[0], chart.series[1])
+        self.assertEqual(len(chart.axes[1].lines), 1)
+
+    def test_invalid_series(self):
+        config = create_validation_config(3)
+        config['layout']['data'][0]['series'][2]['type'] = 'unknown'
+        with self.assertRaises(ChartError):
+            MockChart(config)
+
+
+if __name__ == '__main__':
+    unittest.main()